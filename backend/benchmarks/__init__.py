@@ -0,0 +1,4 @@
+"""
+Benchmark scripts for AI-CA backend hot paths.
+Run from the backend directory, e.g.: python -m benchmarks.bench_vector_index
+"""
@@ -0,0 +1,133 @@
+"""
+Parity check + throughput: BatchTaxEngine vs the scalar tax path
+Generates random taxpayers (incomes from below the rebate limit to above the
+top surcharge threshold, all three age bands, claims above and below every cap)
+and compares every figure of BatchTaxEngine.compute() with
+calculate_old_regime_tax / calculate_new_regime_tax / recommend_regime.
+Exact equality is expected; any difference fails the run (exit code 1).
+
+Rules come from benchmarks/fixtures/tax_rules_2024_25.json (the admin template
+for FY 2024-25), so no database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.batch_tax_parity --taxpayers 20000
+    python -m benchmarks.batch_tax_parity --rules path/to/rules.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import print_table
+from utils.batch_tax_engine import BatchTaxEngine, TaxpayerBatch, REGIME_FIELDS, result_row
+from utils.rules_service import RulesService
+from utils.tax_calculator import calculate_old_regime_tax, calculate_new_regime_tax, recommend_regime
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "tax_rules_2024_25.json")
+
+# Upper bound of each random claim (roughly 2x the usual cap, so both sides of it are hit)
+CLAIM_RANGES = {
+    "80C": 200000, "80CCC": 50000, "80CCD_1": 50000, "80CCD_1B": 100000, "80CCD_2": 300000,
+    "80D": 150000, "80E": 200000, "80G": 50000, "80GG": 100000, "80TTA": 20000, "80TTB": 100000,
+    "80U": 200000, "80DD": 200000, "80DDB": 150000, "80EE": 80000, "80EEA": 250000,
+    "24b_home_loan_interest": 400000, "Standard Deduction": 100000, "Professional Tax": 5000,
+}
+INCOME_BANDS = (300000, 700000, 1500000, 5000000, 10000000, 20000000, 50000000, 80000000)
+
+
+def random_records(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    bands = rng.choice(INCOME_BANDS, size=count)
+    incomes = np.round(rng.uniform(0.6, 1.4, size=count) * bands)
+    ages = rng.choice([25, 45, 59, 60, 70, 79, 80, 90], size=count)
+    records = []
+    for i in range(count):
+        claims = {}
+        for key, upper in CLAIM_RANGES.items():
+            if rng.random() < 0.5:
+                claims[key] = float(rng.integers(0, upper))
+        records.append({"gross_income": float(incomes[i]), "age": int(ages[i]),
+                        "deductions": claims, "taxes_paid": float(rng.integers(0, 2000000))})
+    return records
+
+
+def scalar_row(record, rules_service: RulesService):
+    """Same figures as result_row(), from the scalar functions"""
+    gross_income, age, claims = record["gross_income"], record["age"], dict(record["deductions"])
+    new_claims = {"Standard Deduction": rules_service.get_standard_deduction("new_regime"),
+                  "80CCD_2": claims.get("80CCD_2", 0)}
+    old = calculate_old_regime_tax(gross_income, claims, age, rules_service)
+    new = calculate_new_regime_tax(gross_income, new_claims, age, rules_service)
+    regime, _, savings = recommend_regime(old, new)
+    final_tax = new["total_tax"] if regime == "New Regime" else old["total_tax"]
+    paid = record["taxes_paid"]
+    return {
+        "old_regime": {k: float(old[k]) for k in REGIME_FIELDS},
+        "new_regime": {k: float(new[k]) for k in REGIME_FIELDS},
+        "recommended_regime": regime,
+        "tax_savings": float(savings),
+        "final_tax": float(final_tax),
+        "tax_payable": float(max(0, final_tax - paid)),
+        "refund_amount": float(max(0, paid - final_tax)),
+    }
+
+
+def run(args) -> int:
+    with open(args.rules) as f:
+        rules_service = RulesService.from_rules_json(json.load(f))
+    records = random_records(args.taxpayers, args.seed)
+    print(f"👥 {len(records)} taxpayers, FY {rules_service.financial_year}")
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [scalar_row(record, rules_service) for record in records]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = TaxpayerBatch.from_records(records)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    results = BatchTaxEngine(rules_service).compute(batch)
+    batch_s = time.perf_counter() - start
+
+    mismatches = []
+    for i, want in enumerate(expected):
+        got = result_row(results, i)
+        if got != want:
+            mismatches.append((i, want, got))
+
+    print_table("Throughput", [
+        {"path": "scalar", "seconds": round(scalar_s, 4), "taxpayers_per_sec": round(len(records) / scalar_s)},
+        {"path": "batch (compute)", "seconds": round(batch_s, 4), "taxpayers_per_sec": round(len(records) / batch_s)},
+        {"path": "batch (+ build)", "seconds": round(batch_s + build_s, 4),
+         "taxpayers_per_sec": round(len(records) / (batch_s + build_s))},
+    ])
+
+    if mismatches:
+        for i, want, got in mismatches[:5]:
+            print(f"❌ taxpayer {i}: {records[i]}")
+            print(f"   scalar: {want}")
+            print(f"   batch:  {got}")
+        print(f"\n❌ {len(mismatches)} of {len(records)} taxpayers differ")
+        return 1
+    print(f"\n✅ Batch engine matches the scalar path for all {len(records)} taxpayers")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch tax engine parity / throughput check")
+    parser.add_argument("--taxpayers", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules", default=RULES_PATH, help="Tax rules JSON (rules_json of a TaxRule)")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
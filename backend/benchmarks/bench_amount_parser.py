@@ -0,0 +1,88 @@
+"""
+Benchmark: amount parsing for AIS / 26AS transaction rows
+Compares the per-string cleaning the AIS extractor used to do (regex gate + chained
+.replace + float for every look-ahead) with one parse_amount_column() pass, on
+synthetic AIS statements of growing row counts.
+
+Usage (from backend/):
+    python -m benchmarks.bench_amount_parser --rows 1000 5000 20000
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import time_calls, print_table
+from utils.amount_parser import parse_amount_column
+from utils.extraction_patterns import LINE_GROUPED_AMOUNT_PATTERN
+
+CODES = ["TDS-192", "TDS-194A", "TDS-194", "SFT-005"]
+
+
+def ais_lines(rows: int, seed: int = 7):
+    """Lines of an AIS statement: code, source, count, amount per row"""
+    rng = random.Random(seed)
+    lines = []
+    for row in range(rows):
+        amount = rng.randint(100, 5_000_000)
+        lines += [CODES[row % len(CODES)], f"SOURCE {row} LTD", str(rng.randint(1, 12)), f"{amount:,}"]
+    return lines
+
+
+def legacy_scan(lines):
+    """Old behaviour: each look-ahead re-validates and re-cleans the line (8 look-aheads per row)"""
+    total = 0.0
+    for i in range(len(lines)):
+        for j in range(1, 8):
+            if i + j < len(lines):
+                next_line = lines[i + j].strip()
+                if LINE_GROUPED_AMOUNT_PATTERN.match(next_line):
+                    try:
+                        total += float(next_line.replace(',', '').replace(' ', '').strip())
+                    except ValueError:
+                        pass
+                    break
+    return total
+
+
+def column_scan(lines):
+    """New behaviour: parse the column once, look-aheads index into it"""
+    column, valid = parse_amount_column(lines)
+    amounts, is_amount = column.tolist(), valid.tolist()
+    total = 0.0
+    for i in range(len(lines)):
+        for j in range(1, 8):
+            if i + j < len(lines) and is_amount[i + j]:
+                total += amounts[i + j]
+                break
+    return total
+
+
+def run(args):
+    rows = []
+    for count in args.rows:
+        lines = ais_lines(count)
+        legacy = time_calls(lambda: legacy_scan(lines), repeat=args.repeat, warmup=1)
+        column = time_calls(lambda: column_scan(lines), repeat=args.repeat, warmup=1)
+        parse_only = time_calls(lambda: parse_amount_column(lines), repeat=args.repeat, warmup=1)
+        rows.append({
+            "rows": count,
+            "legacy_p50_ms": legacy["p50_ms"],
+            "column_p50_ms": column["p50_ms"],
+            "parse_column_ms": parse_only["p50_ms"],
+            "speedup": legacy["p50_ms"] / max(column["p50_ms"], 1e-6),
+        })
+    print_table("AIS amount parsing (line scan with look-ahead)", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-line vs column amount parsing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
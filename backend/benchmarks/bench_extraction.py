@@ -0,0 +1,244 @@
+"""
+Benchmark: extraction engine accuracy and throughput
+Runs extract_with_smart_extractor, pick_fy, extract_first_pan, names_match and the
+Form 26AS table parser over the synthetic corpus (benchmarks/extraction_corpus.py)
+and reports, per function:
+- accuracy against the generated ground truth (per field for the full extractor)
+- docs/sec and p50 / p95 latency
+
+Results can be stored as a baseline and later runs compared against it, so a
+change to the regex engine shows its accuracy and speed impact before it ships.
+Accuracy below the baseline fails the run (exit code 1). Latency is only reported
+unless --fail-on-slowdown is given, as it depends on the machine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_extraction                     # compare with the stored baseline
+    python -m benchmarks.bench_extraction --update-baseline   # record a new baseline
+    python -m benchmarks.bench_extraction --per-type 5 --pages 0 20 --noise 0 2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import print_table
+from benchmarks.extraction_corpus import CorpusDocument, build_corpus, form26as_table, FIRST_NAMES, LAST_NAMES
+from utils.smart_extractor import extract_with_smart_extractor
+from utils.table_extractor import parse_table_rows, summarize_form26as
+from utils.text_cleaner import pick_fy, extract_first_pan, names_match
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "extraction.json")
+
+
+def _quiet(fn: Callable[[], Any]) -> Any:
+    """Run fn with the extractor's progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    total_s = sum(ordered) / 1000
+    return {
+        "docs_per_sec": len(ordered) / total_s if total_s else 0.0,
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+def _field_matches(field: str, expected: Any, got: Any) -> bool:
+    if field == "name":
+        return bool(got) and got.upper() == expected
+    if isinstance(expected, float):
+        return isinstance(got, (int, float)) and abs(got - expected) < 0.5
+    return got == expected
+
+
+# ==========================================
+# Per-function runs
+# ==========================================
+
+def bench_smart_extractor(corpus: List[CorpusDocument]) -> Dict[str, Any]:
+    hits: Dict[str, int] = defaultdict(int)
+    totals: Dict[str, int] = defaultdict(int)
+    samples = []
+    for doc in corpus:
+        expected = doc.expected
+        result, elapsed = _timed(lambda: _quiet(lambda: extract_with_smart_extractor(
+            doc.text, expected["name"].title(), expected["pan"], expected["financial_year"]
+        )))
+        samples.append(elapsed)
+        for field, value in expected.items():
+            key = f"{doc.doc_type}.{field}"
+            totals[key] += 1
+            hits[key] += _field_matches(field, value, result.get(field))
+    accuracy = {key: hits[key] / totals[key] for key in sorted(totals)}
+    return {"accuracy": accuracy, "latency": _latency_stats(samples)}
+
+
+def bench_pick_fy(corpus: List[CorpusDocument]) -> Dict[str, Any]:
+    correct, samples = 0, []
+    for doc in corpus:
+        fy, elapsed = _timed(lambda: _quiet(lambda: pick_fy(doc.text, None, doc.doc_type)))
+        samples.append(elapsed)
+        correct += fy == doc.expected["financial_year"]
+    return {"accuracy": {"financial_year": correct / len(corpus)}, "latency": _latency_stats(samples)}
+
+
+def bench_extract_first_pan(corpus: List[CorpusDocument]) -> Dict[str, Any]:
+    correct, samples = 0, []
+    for doc in corpus:
+        pan, elapsed = _timed(lambda: extract_first_pan(doc.text))
+        samples.append(elapsed)
+        correct += pan == doc.expected["pan"]
+    return {"accuracy": {"pan": correct / len(corpus)}, "latency": _latency_stats(samples)}
+
+
+def bench_table_parser(count: int, seed: int = 0) -> Dict[str, Any]:
+    """Form 26AS credit rows whose Sr. No. (192-196) looks like a TDS section"""
+    correct: Dict[str, int] = defaultdict(int)
+    samples = []
+    for index in range(count):
+        doc = form26as_table(seed + index)
+        fields, elapsed = _timed(lambda: summarize_form26as(parse_table_rows([(1, doc.meta["words"])])))
+        samples.append(elapsed)
+        correct["tds_details"] += fields.get("tds_details") == doc.expected["tds_details"]
+        correct["tds_on_salary"] += abs(fields.get("tds_on_salary", 0.0) - doc.expected["tds_on_salary"]) < 0.5
+    return {"accuracy": {key: value / count for key, value in correct.items()}, "latency": _latency_stats(samples)}
+
+
+def name_pairs(count: int, seed: int = 0) -> List[Tuple[str, str, bool]]:
+    """(name on document, name on profile, should match) pairs"""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        document_name = f"{first} {last}"
+        other_last = rng.choice([n for n in LAST_NAMES if n != last])
+        pairs += [
+            (document_name, document_name.title(), True),
+            (document_name, f"  {first.lower()}   {last.lower()} ", True),
+            (f"{first} KUMAR {last}", document_name.title(), True),
+            (document_name, f"{first} {other_last}".title(), False),
+        ]
+    return pairs
+
+
+def bench_names_match(count: int) -> Dict[str, Any]:
+    correct, samples = 0, []
+    pairs = name_pairs(count)
+    for document_name, profile_name, expected in pairs:
+        matched, elapsed = _timed(lambda: names_match(document_name, profile_name))
+        samples.append(elapsed)
+        correct += matched == expected
+    return {"accuracy": {"match": correct / len(pairs)}, "latency": _latency_stats(samples)}
+
+
+# ==========================================
+# Baseline comparison
+# ==========================================
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], accuracy_tolerance: float,
+            latency_tolerance: float) -> Tuple[List[str], List[str]]:
+    """Returns (accuracy regressions, latency regressions) as messages"""
+    accuracy_failures, latency_failures = [], []
+    for name, current in results.items():
+        previous = baseline.get("functions", {}).get(name)
+        if not previous:
+            continue
+        for key, value in current["accuracy"].items():
+            before = previous["accuracy"].get(key)
+            if before is not None and value < before - accuracy_tolerance:
+                accuracy_failures.append(f"{name} {key}: accuracy {before:.3f} -> {value:.3f}")
+        before_p95 = previous["latency"]["p95_ms"]
+        after_p95 = current["latency"]["p95_ms"]
+        if before_p95 and after_p95 > before_p95 * (1 + latency_tolerance):
+            latency_failures.append(f"{name}: p95 {before_p95:.3f} ms -> {after_p95:.3f} ms")
+    return accuracy_failures, latency_failures
+
+
+def run(args) -> int:
+    corpus = build_corpus(per_type=args.per_type, page_sizes=tuple(args.pages),
+                          noise_levels=tuple(args.noise), seed=args.seed)
+    print(f"📚 Corpus: {len(corpus)} documents (pages {args.pages}, noise {args.noise})")
+
+    results = {
+        "extract_with_smart_extractor": bench_smart_extractor(corpus),
+        "pick_fy": bench_pick_fy(corpus),
+        "extract_first_pan": bench_extract_first_pan(corpus),
+        "names_match": bench_names_match(args.per_type * 5),
+        "parse_table_rows": bench_table_parser(args.per_type * 3),
+    }
+
+    print_table("Throughput", [
+        {"function": name, **{k: round(v, 3) for k, v in r["latency"].items()}}
+        for name, r in results.items()
+    ])
+    print_table("Accuracy", [
+        {"function": name, "field": key, "accuracy": round(value, 3)}
+        for name, r in results.items() for key, value in r["accuracy"].items()
+    ])
+
+    config = {"per_type": args.per_type, "pages": args.pages, "noise": args.noise, "seed": args.seed}
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "functions": results}, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  No baseline at {args.baseline} (run with --update-baseline)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"\n⚠️  Baseline was recorded with {baseline.get('config')}; comparing anyway")
+
+    accuracy_failures, latency_failures = compare(
+        results, baseline, args.accuracy_tolerance, args.latency_tolerance
+    )
+    for message in accuracy_failures:
+        print(f"❌ {message}")
+    for message in latency_failures:
+        print(f"{'❌' if args.fail_on_slowdown else '⚠️ '} {message}")
+    if accuracy_failures or (args.fail_on_slowdown and latency_failures):
+        return 1
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction accuracy / throughput benchmark")
+    parser.add_argument("--per-type", type=int, default=20, help="Documents per type, size and noise level")
+    parser.add_argument("--pages", type=int, nargs="+", default=[0, 10], help="Filler pages per document")
+    parser.add_argument("--noise", type=int, nargs="+", default=[0, 1, 2], help="Noise levels (0-2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.0,
+                        help="Allowed accuracy drop per field (0.01 = one point)")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25,
+                        help="Allowed p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--fail-on-slowdown", action="store_true")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: regex stress on worst-case OCR text
+Times the gross salary patterns in their old unbounded form (.*?) against the
+bounded registry versions on synthetic pathological text, then runs the full
+SmartExtractor on the same text to show the per-document regex budget at work.
+
+Worst case: many salary labels with no amount anywhere after them, so each
+label occurrence makes an unbounded span rescan the rest of the document.
+
+Usage (from backend/):
+    python -m benchmarks.bench_regex_stress --sizes 10 50 100 --budget-ms 500
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import time_calls, time_once, print_table
+from utils.extraction_patterns import get_compiled_patterns
+import utils.smart_extractor as smart_extractor
+
+# The gross salary patterns as they were before the audit
+LEGACY_PATTERNS = [
+    re.compile(r'GROSS\s+SALARY\s*[\(\[]?.*?[\)\]]?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)', re.IGNORECASE),
+    re.compile(r'SALARY\s+AS\s+PER\s+.*?SECTION\s+17\s*\(?\s*1\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)', re.IGNORECASE),
+]
+
+NOISE_LINE = "GROSS SALARY (A) SALARY AS PER PROVISIONS CONTAINED IN SECTION SEVENTEEN ~ | ` ^ NO AMOUNT HERE "
+
+
+def worst_case_text(size_kb: int) -> str:
+    """Digit- and comma-free text of roughly size_kb KB, dense with salary labels"""
+    repeats = max(1, (size_kb * 1024) // len(NOISE_LINE))
+    return NOISE_LINE * repeats
+
+
+def run(args):
+    bounded = get_compiled_patterns("form16")["salary"]["gross_salary"][:2]
+    rows = []
+    for size_kb in args.sizes:
+        text = worst_case_text(size_kb)
+        repeat = args.repeat if size_kb <= 50 else 1
+
+        legacy = time_calls(lambda: [p.search(text) for p in LEGACY_PATTERNS], repeat=repeat, warmup=0)
+        current = time_calls(lambda: [p.search(text) for p in bounded], repeat=repeat, warmup=0)
+
+        smart_extractor.REGEX_TIME_BUDGET_MS = args.budget_ms
+        extractor = smart_extractor.SmartExtractor(text)
+        extract_ms = time_once(extractor.extract_all_data)
+
+        rows.append({
+            "text_kb": size_kb,
+            "labels": text.count("GROSS SALARY"),
+            "legacy_p50_ms": legacy["p50_ms"],
+            "bounded_p50_ms": current["p50_ms"],
+            "speedup": legacy["p50_ms"] / max(current["p50_ms"], 1e-6),
+            "extract_ms": extract_ms,
+            "budget_hit": extractor.budget_exhausted,
+        })
+
+    print_table(f"Regex stress benchmark (budget {args.budget_ms:.0f} ms)", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unbounded vs bounded extraction patterns on worst-case text")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="Text sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=smart_extractor.REGEX_TIME_BUDGET_MS)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: NumPy vector index vs Chroma
+Compares startup, bulk add, filtered top-k query latency and recall on synthetic
+user_data-shaped records (explicit embeddings, so Ollama is not needed).
+
+Usage (from backend/):
+    python -m benchmarks.bench_vector_index --vectors 5000 --users 50 --dim 768
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import time_calls, time_once, print_table
+from utils.vector_index import NumpyVectorClient
+
+FINANCIAL_YEARS = ["2022-23", "2023-24", "2024-25"]
+
+
+def make_dataset(n_vectors: int, n_users: int, dim: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n_vectors, dim)).astype(np.float32)
+    ids = [f"vec_{i}" for i in range(n_vectors)]
+    documents = [f"Form 16 - Field {i}: {i * 10}" for i in range(n_vectors)]
+    metadatas = [
+        {
+            "user_id": int(i % n_users) + 1,
+            "financial_year": FINANCIAL_YEARS[i % len(FINANCIAL_YEARS)],
+            "doc_type": "Form 16",
+        }
+        for i in range(n_vectors)
+    ]
+    return ids, documents, metadatas, vectors
+
+
+def add_in_batches(collection, ids, documents, metadatas, vectors, batch_size: int = 1000):
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.add(
+            ids=ids[start:end],
+            documents=documents[start:end],
+            metadatas=metadatas[start:end],
+            embeddings=vectors[start:end].tolist(),
+        )
+
+
+def exact_top_k(vectors, metadatas, query, where_user, where_fy, k):
+    """Brute-force ground truth for recall"""
+    rows = [i for i, m in enumerate(metadatas) if m["user_id"] == where_user and m["financial_year"] == where_fy]
+    sub = vectors[rows]
+    sims = (sub / np.linalg.norm(sub, axis=1, keepdims=True)) @ (query / np.linalg.norm(query))
+    return {f"vec_{rows[i]}" for i in np.argsort(-sims)[:k]}
+
+
+def run(args):
+    ids, documents, metadatas, vectors = make_dataset(args.vectors, args.users, args.dim)
+    rng = np.random.default_rng(11)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    where = {"$and": [{"user_id": 1}, {"financial_year": FINANCIAL_YEARS[0]}]}
+    truths = [exact_top_k(vectors, metadatas, q, 1, FINANCIAL_YEARS[0], args.k) for q in queries]
+
+    rows = []
+    backends = ["numpy"]
+    if not args.skip_chroma:
+        backends.append("chroma")
+
+    for backend in backends:
+        directory = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+        try:
+            start = time.perf_counter()
+            if backend == "numpy":
+                client = NumpyVectorClient(directory)
+                collection = client.get_or_create_collection("user_data")
+            else:
+                import chromadb
+                from chromadb.config import Settings
+                client = chromadb.PersistentClient(path=directory, settings=Settings(anonymized_telemetry=False))
+                collection = client.get_or_create_collection(
+                    "user_data", embedding_function=None, metadata={"hnsw:space": "cosine"}
+                )
+            startup_ms = (time.perf_counter() - start) * 1000
+
+            add_ms = time_once(lambda: add_in_batches(collection, ids, documents, metadatas, vectors))
+
+            # Re-open from disk (cold start of an existing store)
+            if backend == "numpy":
+                reopen_ms = time_once(lambda: NumpyVectorClient(directory).get_or_create_collection("user_data").count())
+            else:
+                reopen_ms = time_once(
+                    lambda: chromadb.PersistentClient(path=directory, settings=Settings(anonymized_telemetry=False))
+                    .get_collection("user_data").count()
+                )
+
+            state = {"i": 0}
+
+            def one_query():
+                q = queries[state["i"] % len(queries)]
+                state["i"] += 1
+                return collection.query(query_embeddings=[q.tolist()], n_results=args.k, where=where)
+
+            stats = time_calls(one_query, repeat=args.queries)
+
+            hits = 0
+            for q, truth in zip(queries, truths):
+                got = collection.query(query_embeddings=[q.tolist()], n_results=args.k, where=where)["ids"][0]
+                hits += len(truth & set(got))
+            recall = hits / max(1, sum(len(t) for t in truths))
+
+            rows.append({
+                "backend": backend,
+                "startup_ms": startup_ms,
+                "add_ms": add_ms,
+                "reopen_ms": reopen_ms,
+                "query_p50_ms": stats["p50_ms"],
+                "query_p95_ms": stats["p95_ms"],
+                "recall@k": recall,
+            })
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    print_table(
+        f"Vector index benchmark ({args.vectors} vectors, {args.users} users, dim {args.dim}, k={args.k})",
+        rows,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy vector index vs Chroma")
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--skip-chroma", action="store_true", help="Only benchmark the NumPy index")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Synthetic extraction corpus
+Generates Form 16 / Form 26AS / AIS text in the layout pdf_processor produces
+("=== PAGE N ===" separated pages), together with the ground truth used to score
+extraction accuracy.
+
+Knobs:
+- pages: filler pages appended after the data pages (document size)
+- noise: 0 = clean, 1 = separator / spacing / case variations,
+         2 = level 1 + OCR character noise in non-data lines and junk lines
+
+The generator is seeded, so a (doc_type, seed, pages, noise) tuple always gives the
+same document and baselines stay comparable between runs.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+FIRST_NAMES = ["RAVI", "PRIYA", "ANIL", "SUNITA", "VIKRAM", "MEERA", "ARJUN", "KAVITA"]
+MIDDLE_NAMES = ["KUMAR", "DEVI", "PRASAD", "LAL", "", ""]
+LAST_NAMES = ["SHARMA", "IYER", "PATEL", "REDDY", "GUPTA", "NAIR", "SINGH", "DAS"]
+EMPLOYERS = ["ACME TECHNOLOGIES PVT LTD", "SUNRISE SOFTWARE LIMITED", "BHARAT INFRA PROJECTS LTD",
+             "GLOBAL FINSERV PRIVATE LIMITED"]
+CITIES = ["PUNE", "BENGALURU", "CHENNAI", "KOLKATA", "NEW DELHI"]
+BANKS = ["STATE BANK OF INDIA", "HDFC BANK LIMITED", "ICICI BANK LIMITED"]
+FILLER = ("This is a computer generated statement. Verification: I, the undersigned, certify that "
+          "the information given above is true and correct based on the books of account. ")
+OCR_SWAPS = {"O": "0", "I": "l", "S": "5", "E": "F", "B": "8"}
+
+FINANCIAL_YEARS = ["2022-23", "2023-24", "2024-25"]
+
+
+@dataclass
+class CorpusDocument:
+    """One generated document and what a correct extraction returns for it"""
+    doc_id: str
+    doc_type: str
+    text: str
+    expected: Dict[str, Any]
+    pages: int
+    noise: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+def indian_format(amount: int) -> str:
+    """10,69,432 style grouping"""
+    digits = str(amount)
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups) + "," + tail
+
+
+def _pan(rng: random.Random, fourth: str = "P") -> str:
+    letters = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    return ("".join(rng.choice(letters) for _ in range(3)) + fourth + rng.choice(letters)
+            + "".join(rng.choice("0123456789") for _ in range(4)) + rng.choice(letters))
+
+
+def _tan(rng: random.Random) -> str:
+    letters = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    return ("".join(rng.choice(letters) for _ in range(4))
+            + "".join(rng.choice("0123456789") for _ in range(5)) + rng.choice(letters))
+
+
+def _name(rng: random.Random) -> str:
+    parts = [rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES), rng.choice(LAST_NAMES)]
+    return " ".join(p for p in parts if p)
+
+
+def _assessment_year(fy: str) -> str:
+    start = int(fy[:4]) + 1
+    return f"{start}-{str(start + 1)[2:]}"
+
+
+def _add_noise(lines: List[str], data_lines: set, rng: random.Random, noise: int) -> List[str]:
+    """Noise everywhere except inside data_lines (titles, labelled identifiers, amounts)"""
+    if noise <= 0:
+        return lines
+    out = []
+    for index, line in enumerate(lines):
+        if rng.random() < 0.3:
+            line = line.replace(": ", "  ~ ", 1)
+        if rng.random() < 0.2:
+            line = line.lower() if index not in data_lines else line.title()
+        if noise >= 2 and index not in data_lines:
+            line = "".join(OCR_SWAPS.get(c, c) if rng.random() < 0.05 else c for c in line)
+        out.append(line)
+        if noise >= 2 and rng.random() < 0.15:
+            out.append("|  ~  .  ' " * rng.randint(1, 4))
+    return out
+
+
+def _paginate(pages: List[List[str]], filler_pages: int) -> str:
+    text = ""
+    for number, lines in enumerate(pages, 1):
+        text += f"\n=== PAGE {number} ===\n" + "\n".join(lines) + "\n"
+    for extra in range(filler_pages):
+        text += f"\n=== PAGE {len(pages) + extra + 1} ===\n" + FILLER * 12 + "\n"
+    return text
+
+
+# ==========================================
+# Document generators
+# ==========================================
+
+def form16(seed: int, pages: int = 0, noise: int = 0) -> CorpusDocument:
+    rng = random.Random(seed)
+    fy = rng.choice(FINANCIAL_YEARS)
+    pan, name, employer, tan = _pan(rng), _name(rng), rng.choice(EMPLOYERS), _tan(rng)
+    gross = rng.randint(8, 60) * 50000
+    tds = gross // rng.randint(9, 14)
+    deduction_80c = min(150000, rng.randint(2, 20) * 10000)
+
+    part_a = [
+        "FORM NO. 16",
+        "[See rule 31(1)(a)]",
+        "PART A",
+        "Certificate under section 203 of the Income-tax Act, 1961 for tax deducted at source on salary",
+        f"Name and address of the Employer: {employer}",
+        f"TAN of the Deductor {tan}",
+        f"Employee Name: {name}, {rng.choice(CITIES)}",
+        f"PAN of the Employee {pan}",
+        f"Assessment Year {_assessment_year(fy)}",
+        f"Financial Year {fy}",
+    ]
+    for quarter in range(1, 5):
+        part_a.append(f"Q{quarter} {indian_format(gross // 4)} {indian_format(tds // 4)}")
+    part_b = [
+        "PART B",
+        "Details of Salary Paid and any other income and tax deducted",
+        "1. Gross Salary",
+        f"(a) Salary as per provisions contained in section 17(1) {indian_format(gross)}.00",
+        f"Standard Deduction u/s 16(ia) 50,000.00",
+        f"Professional Tax 2,500",
+        f"Deduction under section 80C {indian_format(deduction_80c)}",
+        f"Gross Total Income {indian_format(gross)}.00",
+        f"Total tax deducted {indian_format(tds)}",
+    ]
+    data_lines = {0, 4, 5, 6, 7, 8, 9}
+    part_a = _add_noise(part_a, data_lines, rng, noise)
+    part_b = _add_noise(part_b, {3, 4, 5, 6, 7, 8}, rng, noise)
+
+    return CorpusDocument(
+        doc_id=f"form16-{seed}-p{pages}-n{noise}", doc_type="Form 16",
+        text=_paginate([part_a, part_b], pages),
+        expected={"pan": pan, "name": name, "financial_year": fy, "document_type": "Form 16",
+                  "gross_salary": float(gross), "total_tds": float(tds)},
+        pages=2 + pages, noise=noise,
+    )
+
+
+def form26as(seed: int, pages: int = 0, noise: int = 0) -> CorpusDocument:
+    rng = random.Random(seed)
+    fy = rng.choice(FINANCIAL_YEARS)
+    pan, name, employer, tan = _pan(rng), _name(rng), rng.choice(EMPLOYERS), _tan(rng)
+    gross = rng.randint(8, 60) * 50000
+    tds = gross // rng.randint(9, 14)
+
+    header = [
+        "Form 26AS",
+        "Annual Tax Statement under Section 203AA of the Income Tax Act, 1961",
+        f"Permanent Account Number (PAN) {pan}",
+        f"Assessee Name: {name}, {rng.choice(CITIES)}",
+        f"Assessment Year {_assessment_year(fy)}",
+        f"Financial Year {fy}",
+    ]
+    part_one = [
+        "PART-I - Details of Tax Deducted at Source",
+        employer,
+        tan,
+        f"{gross}.00",
+        f"{tds}.00",
+        f"{tds}.00",
+    ]
+    header = _add_noise(header, {0, 2, 3, 4, 5}, rng, noise)
+
+    return CorpusDocument(
+        doc_id=f"form26as-{seed}-p{pages}-n{noise}", doc_type="Form 26AS",
+        text=_paginate([header, part_one], pages),
+        expected={"pan": pan, "name": name, "financial_year": fy, "document_type": "Form 26AS",
+                  "gross_salary": float(gross), "total_tds": float(tds)},
+        pages=2 + pages, noise=noise,
+    )
+
+
+def ais(seed: int, pages: int = 0, noise: int = 0) -> CorpusDocument:
+    rng = random.Random(seed)
+    fy = rng.choice(FINANCIAL_YEARS)
+    pan, name, employer = _pan(rng), _name(rng), rng.choice(EMPLOYERS)
+    gross = rng.randint(8, 60) * 50000
+    interest = rng.randint(2, 90) * 500 + 17
+    dividend = rng.randint(2, 40) * 250 + 3
+
+    header = [
+        "Annual Information Statement (AIS)",
+        f"Financial Year {fy}",
+        f"Assessment Year {_assessment_year(fy)}",
+        f"PAN {pan}",
+        f"Assessee Name: {name}, {rng.choice(CITIES)}",
+    ]
+    rows = [
+        "TDS-192", "Salary received (Section 192)", employer, "12", indian_format(gross),
+        "TDS-194A", "Interest from deposit", rng.choice(BANKS), "4", indian_format(interest),
+        "TDS-194", "Dividend", "INFOSYS LIMITED", "2", indian_format(dividend),
+    ]
+    header = _add_noise(header, {0, 1, 2, 3, 4}, rng, noise)
+
+    return CorpusDocument(
+        doc_id=f"ais-{seed}-p{pages}-n{noise}", doc_type="AIS",
+        text=_paginate([header, rows], pages),
+        expected={"pan": pan, "name": name, "financial_year": fy, "document_type": "AIS",
+                  "gross_salary": float(gross), "interest_income": float(interest),
+                  "dividend_income": float(dividend)},
+        pages=2 + pages, noise=noise,
+    )
+
+
+GENERATORS = {"Form 16": form16, "Form 26AS": form26as, "AIS": ais}
+
+TDS_SECTIONS = ["192", "194", "194A", "194C", "194H", "194J", "194Q"]
+
+
+def _words(cells: List[str], y: float) -> List[tuple]:
+    """PyMuPDF-style words (x0, y0, x1, y1, text) for one table row, 40pt between cells"""
+    words, x = [], 20.0
+    for cell in cells:
+        for token in cell.split():
+            width = 5.0 * len(token)
+            words.append((x, y, x + width, y + 8, token))
+            x += width + 3
+        x += 40
+    return words
+
+
+def form26as_table(seed: int, rows: int = 12) -> CorpusDocument:
+    """
+    Form 26AS Part-I as PyMuPDF words (meta["words"]): one deductor row, then credits
+    numbered so that the Sr. No. runs through 192-196 (which look like TDS sections)
+    """
+    rng = random.Random(seed)
+    employer, tan = rng.choice(EMPLOYERS), _tan(rng)
+    first_serial = rng.randint(186, 192)
+    credits = []
+    for index in range(rows):
+        section = rng.choice(TDS_SECTIONS)
+        paid = rng.randint(10, 200) * 1000
+        credits.append((str(first_serial + index), section, paid, paid // 10))
+
+    total_paid = sum(c[2] for c in credits)
+    total_tds = sum(c[3] for c in credits)
+    words = _words(["1", employer, tan, f"{total_paid}.00", f"{total_tds}.00", f"{total_tds}.00"], 100)
+    for row, (serial, section, paid, tds) in enumerate(credits):
+        words += _words([serial, section, f"{rng.randint(1, 28):02d}-Jun-2024", "F", "18-Jul-2024",
+                         f"{paid}.00", f"{tds}.00", f"{tds}.00"], 120 + 14 * row)
+
+    tds_details: Dict[str, float] = {}
+    for _, section, _, tds in credits:
+        tds_details[section] = tds_details.get(section, 0.0) + tds
+    return CorpusDocument(
+        doc_id=f"form26as-table-{seed}", doc_type="Form 26AS", text="",
+        expected={"tds_details": tds_details, "tds_on_salary": tds_details.get("192", 0.0)},
+        pages=1, noise=0, meta={"words": words, "serials": [c[0] for c in credits]},
+    )
+
+
+def build_corpus(per_type: int = 20, page_sizes=(0, 10), noise_levels=(0, 1, 2),
+                 seed: int = 0) -> List[CorpusDocument]:
+    """Every document type x page size x noise level, per_type seeds each"""
+    documents = []
+    for doc_type, generator in GENERATORS.items():
+        for pages in page_sizes:
+            for noise in noise_levels:
+                for index in range(per_type):
+                    documents.append(generator(seed + index, pages=pages, noise=noise))
+    return documents
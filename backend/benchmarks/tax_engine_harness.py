@@ -0,0 +1,371 @@
+"""
+Tax engine harness: property checks + throughput
+Runs utils/tax_calculator.py / utils/rules_service.py against rules in both stored
+formats (FY 2023-24 "income_tax_slabs" / "common_deductions_exemptions" and FY
+2024-25 "slabs" / "deductions", see benchmarks/fixtures/) with random incomes, ages
+and deductions, and checks invariants that must survive any optimisation:
+
+- slab_reference:     compiled slab tax == a plain walk over get_slabs()
+- identities:         taxable = gross - deductions, cess and total add up, nothing negative
+- income_monotonic:   more income never means less tax within a surcharge band
+- deduction_monotonic: a larger claim never means more old-regime tax (same band)
+- rebate_cliff:       87A applies in full up to its income limit and not one rupee above
+- marginal_relief:    surcharge never exceeds the income above the threshold
+- statutory_relief:   tax + surcharge stays between its value at the threshold and that
+                      plus the income above it (a known deviation, see KNOWN_ISSUES)
+- batch_parity:       BatchTaxEngine gives exactly the scalar figures
+
+It then measures computations/sec of the scalar engine (old + new regime per
+computation), the compiled slab lookup and the batch engine.
+A failed check (other than a KNOWN_ISSUES entry) exits with code 1.
+
+Usage (from backend/):
+    python -m benchmarks.tax_engine_harness
+    python -m benchmarks.tax_engine_harness --samples 2000 --seed 7
+    python -m benchmarks.tax_engine_harness --rules path/to/rules.json
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import print_table
+from utils.batch_tax_engine import BatchTaxEngine, TaxpayerBatch, REGIME_FIELDS, result_row
+from utils.rules_service import RulesService
+from utils.tax_calculator import calculate_old_regime_tax, calculate_new_regime_tax
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+AGES = (25, 45, 59, 60, 70, 79, 80, 90)
+TOLERANCE = 1e-6
+
+# Claim ranges for random taxpayers (around and above the usual caps)
+CLAIM_RANGES = {
+    "80C": 200000, "80CCD_1B": 80000, "80CCD_2": 200000, "80D": 120000, "80E": 100000,
+    "80TTA": 20000, "80TTB": 80000, "24b_home_loan_interest": 300000,
+    "Standard Deduction": 80000, "Professional Tax": 3000,
+}
+
+
+def _quiet(fn: Callable[[], Any]) -> Any:
+    """Run fn with the calculator's progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def _close(a: float, b: float) -> bool:
+    return abs(a - b) <= TOLERANCE * max(1.0, abs(a), abs(b))
+
+
+def new_regime_claims(rules_service: RulesService, claims: Dict[str, float]) -> Dict[str, float]:
+    """New regime claims as calculate_comprehensive_tax builds them"""
+    return {"Standard Deduction": rules_service.get_standard_deduction("new_regime"),
+            "80CCD_2": claims.get("80CCD_2", 0)}
+
+
+def compute(rules_service: RulesService, regime: str, gross: float, claims: Dict[str, float],
+            age: int) -> Dict[str, Any]:
+    if regime == "old_regime":
+        return _quiet(lambda: calculate_old_regime_tax(gross, dict(claims), age, rules_service))
+    return _quiet(lambda: calculate_new_regime_tax(
+        gross, new_regime_claims(rules_service, claims), age, rules_service
+    ))
+
+
+def random_taxpayer(rng: random.Random) -> Tuple[float, int, Dict[str, float]]:
+    gross = float(round(math.exp(rng.uniform(math.log(1e5), math.log(1e8)))))
+    claims = {key: float(rng.randint(0, upper)) for key, upper in CLAIM_RANGES.items() if rng.random() < 0.5}
+    return gross, rng.choice(AGES), claims
+
+
+# ==========================================
+# Property checks (each returns failure messages)
+# ==========================================
+
+def check_slab_reference(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    """Compiled table vs the slab-by-slab walk tax_calculator used before compilation"""
+    failures = []
+    for regime in ("old_regime", "new_regime"):
+        for age in (30, 65, 85):
+            slabs = rules_service.get_slabs(regime, age)
+            table = rules_service.get_compiled_slabs(regime, age)
+            edges = [s["min"] for s in slabs] + [s["max"] for s in slabs if s["max"] is not None]
+            incomes = [e + d for e in edges for d in (-1, 0, 1)] + [rng.uniform(0, 5e7) for _ in range(samples)]
+            for income in incomes:
+                expected = 0.0
+                for slab in slabs:
+                    upper = slab["max"] if slab["max"] is not None else float("inf")
+                    if income > slab["min"]:
+                        expected += (min(income, upper) - slab["min"]) * slab["rate_percent"] / 100
+                if not _close(table.tax(income), expected):
+                    failures.append(f"{regime} age {age} income {income}: {table.tax(income)} != {expected}")
+    return failures
+
+
+def check_identities(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    failures = []
+    cess_percent = rules_service.get_cess_percent()
+    for _ in range(samples):
+        gross, age, claims = random_taxpayer(rng)
+        for regime in ("old_regime", "new_regime"):
+            r = compute(rules_service, regime, gross, claims, age)
+            problems = []
+            if not _close(r["taxable_income"], max(0, gross - r["total_deductions"])):
+                problems.append("taxable != gross - deductions")
+            if not _close(r["cess"], (r["tax_after_rebate"] + r["surcharge"]) * cess_percent / 100):
+                problems.append("cess")
+            if not _close(r["total_tax"], r["tax_after_rebate"] + r["surcharge"] + r["cess"]):
+                problems.append("total != after rebate + surcharge + cess")
+            if any(r[k] < -TOLERANCE for k in REGIME_FIELDS):
+                problems.append("negative figure")
+            if problems:
+                failures.append(f"{regime} gross {gross} age {age} claims {claims}: {', '.join(problems)}")
+    return failures
+
+
+def _surcharge_band(rules_service: RulesService, regime: str, income: float) -> int:
+    return sum(income > t["min_exclusive"] for t in rules_service.get_surcharge_thresholds(regime))
+
+
+def check_income_monotonic(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    """
+    Total tax along a sorted income grid (incl. slab, rebate and surcharge edges) never
+    drops within a surcharge band; crossing a threshold is covered by statutory_relief.
+    """
+    failures = []
+    edges = [t["min_exclusive"] for regime in ("old_regime", "new_regime")
+             for t in rules_service.get_surcharge_thresholds(regime)]
+    edges += [rules_service.get_rebate_87a(regime)["max_total_income"] for regime in ("old_regime", "new_regime")]
+    for _ in range(max(1, samples // 20)):
+        _, age, claims = random_taxpayer(rng)
+        incomes = sorted({float(round(math.exp(rng.uniform(math.log(1e5), math.log(1e8))))) for _ in range(40)}
+                         | {float(e + d) for e in edges for d in (-1, 0, 1, 1000, 50000)})
+        for regime in ("old_regime", "new_regime"):
+            previous = None
+            for gross in incomes:
+                r = compute(rules_service, regime, gross, claims, age)
+                band = _surcharge_band(rules_service, regime, r["taxable_income"])
+                if previous is not None and previous[2] == band and r["total_tax"] < previous[1] - TOLERANCE:
+                    failures.append(f"{regime} age {age}: tax {previous[1]:.2f} at {previous[0]:.0f} "
+                                    f"-> {r['total_tax']:.2f} at {gross:.0f}")
+                previous = (gross, r["total_tax"], band)
+    return failures
+
+
+def check_deduction_monotonic(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    """A larger claim never raises old-regime tax (within a surcharge band, as above)"""
+    failures = []
+    for _ in range(samples):
+        gross, age, claims = random_taxpayer(rng)
+        section = rng.choice(list(CLAIM_RANGES))
+        more = dict(claims, **{section: claims.get(section, 0) + rng.randint(1, 100000)})
+        before = compute(rules_service, "old_regime", gross, claims, age)
+        after = compute(rules_service, "old_regime", gross, more, age)
+        crossed = (_surcharge_band(rules_service, "old_regime", before["taxable_income"])
+                   != _surcharge_band(rules_service, "old_regime", after["taxable_income"]))
+        before, after = before["total_tax"], after["total_tax"]
+        if not crossed and after > before + TOLERANCE:
+            failures.append(f"gross {gross} age {age}: raising {section} to {more[section]} "
+                            f"increased tax {before:.2f} -> {after:.2f}")
+    return failures
+
+
+def check_rebate_cliff(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    failures = []
+    for regime in ("old_regime", "new_regime"):
+        config = rules_service.get_rebate_87a(regime)
+        limit, cap = config["max_total_income"], config["rebate_cap"]
+        # Gross income that gives the wanted taxable income with no other claims
+        offset = rules_service.get_standard_deduction("new_regime") if regime == "new_regime" else 0
+        targets = [limit - 1, limit, limit + 1] + [rng.uniform(0, 2 * limit) for _ in range(samples)]
+        for age in AGES:
+            for taxable in targets:
+                r = compute(rules_service, regime, taxable + offset, {}, age)
+                if r["taxable_income"] <= limit:
+                    ok = _close(r["rebate"], min(r["tax_before_rebate"], cap))
+                else:
+                    ok = r["rebate"] == 0
+                if not ok:
+                    failures.append(f"{regime} age {age} taxable {r['taxable_income']:.0f}: "
+                                    f"rebate {r['rebate']} (tax {r['tax_before_rebate']}, limit {limit}, cap {cap})")
+    return failures
+
+
+def check_marginal_relief(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    failures = []
+    for regime in ("old_regime", "new_regime"):
+        thresholds = rules_service.get_surcharge_thresholds(regime)
+        for t in thresholds:
+            threshold = t["min_exclusive"]
+            incomes = [threshold + d for d in (1, 10, 1000, 100000)] + [
+                threshold * rng.uniform(1, 1.2) for _ in range(max(1, samples // 10))
+            ]
+            for taxable in incomes:
+                r = compute(rules_service, regime, taxable, {}, 30) if regime == "old_regime" else compute(
+                    rules_service, regime, taxable + rules_service.get_standard_deduction("new_regime"), {}, 30)
+                income = r["taxable_income"]
+                applicable = [x for x in thresholds if income > x["min_exclusive"]]
+                if not applicable:
+                    continue
+                top = applicable[-1]
+                if r["surcharge"] > income - top["min_exclusive"] + TOLERANCE:
+                    failures.append(f"{regime} income {income:.0f}: surcharge {r['surcharge']:.2f} exceeds "
+                                    f"income above {top['min_exclusive']}")
+                if r["surcharge"] > r["tax_after_rebate"] * top["rate_percent"] / 100 + TOLERANCE:
+                    failures.append(f"{regime} income {income:.0f}: surcharge above {top['rate_percent']}% of tax")
+    return failures
+
+
+def check_statutory_relief(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    """
+    Statutory marginal relief: just above a threshold, tax + surcharge lies between the
+    tax + surcharge at the threshold and that plus the income above it.
+    """
+    failures = []
+    for regime in ("old_regime", "new_regime"):
+        # Gross income that gives the wanted taxable income with no other claims
+        offset = rules_service.get_standard_deduction("new_regime") if regime == "new_regime" else 0
+        for t in rules_service.get_surcharge_thresholds(regime):
+            threshold = t["min_exclusive"]
+            at_threshold = compute(rules_service, regime, threshold + offset, {}, 30)
+            base = at_threshold["tax_after_rebate"] + at_threshold["surcharge"]
+            excesses = [1, 1000, 100000] + [threshold * rng.uniform(0, 0.05) for _ in range(max(1, samples // 30))]
+            for excess in excesses:
+                r = compute(rules_service, regime, threshold + excess + offset, {}, 30)
+                charged = r["tax_after_rebate"] + r["surcharge"]
+                if not base - TOLERANCE <= charged <= base + excess + TOLERANCE:
+                    failures.append(f"{regime} income {threshold + excess:.0f}: tax + surcharge {charged:.2f} "
+                                    f"outside [{base:.2f}, {base + excess:.2f}]")
+    return failures
+
+
+def check_batch_parity(rules_service: RulesService, rng: random.Random, samples: int) -> List[str]:
+    records = []
+    for _ in range(samples):
+        gross, age, claims = random_taxpayer(rng)
+        records.append({"gross_income": gross, "age": age, "deductions": claims})
+    results = BatchTaxEngine(rules_service).compute(TaxpayerBatch.from_records(records))
+    failures = []
+    for index, record in enumerate(records):
+        got = result_row(results, index)
+        for regime in ("old_regime", "new_regime"):
+            expected = compute(rules_service, regime, record["gross_income"], record["deductions"], record["age"])
+            for key in REGIME_FIELDS:
+                if got[regime][key] != expected[key]:
+                    failures.append(f"{regime} {record}: {key} batch {got[regime][key]} != scalar {expected[key]}")
+    return failures
+
+
+CHECKS = {
+    "slab_reference": check_slab_reference,
+    "identities": check_identities,
+    "income_monotonic": check_income_monotonic,
+    "deduction_monotonic": check_deduction_monotonic,
+    "rebate_cliff": check_rebate_cliff,
+    "marginal_relief": check_marginal_relief,
+    "statutory_relief": check_statutory_relief,
+    "batch_parity": check_batch_parity,
+}
+
+# Pre-existing deviations: reported, but don't fail the run
+KNOWN_ISSUES = {
+    "statutory_relief": "calculate_surcharge caps the surcharge alone at the income above the "
+                        "threshold, ignoring the slab tax on that income (tax rises faster than "
+                        "income just past ₹50 lakh) and the surcharge already due at the threshold "
+                        "(tax drops just past the higher thresholds)",
+}
+
+
+# ==========================================
+# Throughput
+# ==========================================
+
+def measure_throughput(rules_service: RulesService, rng: random.Random, count: int) -> Dict[str, float]:
+    taxpayers = [random_taxpayer(rng) for _ in range(count)]
+
+    def scalar_run():
+        for gross, age, claims in taxpayers:
+            calculate_old_regime_tax(gross, dict(claims), age, rules_service)
+            calculate_new_regime_tax(gross, new_regime_claims(rules_service, claims), age, rules_service)
+
+    start = time.perf_counter()
+    _quiet(scalar_run)
+    scalar_s = time.perf_counter() - start
+
+    table = rules_service.get_compiled_slabs("old_regime", 30)
+    start = time.perf_counter()
+    for gross, _, _ in taxpayers:
+        table.tax(gross)
+    slab_s = time.perf_counter() - start
+
+    batch = TaxpayerBatch.from_records(
+        [{"gross_income": g, "age": a, "deductions": c} for g, a, c in taxpayers]
+    )
+    engine = BatchTaxEngine(rules_service)
+    start = time.perf_counter()
+    engine.compute(batch)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "scalar_computations_per_sec": count / scalar_s,
+        "slab_lookups_per_sec": count / slab_s if slab_s else float("inf"),
+        "batch_computations_per_sec": count / batch_s,
+    }
+
+
+def run(args) -> int:
+    rule_files = args.rules or sorted(glob.glob(os.path.join(FIXTURES_DIR, "tax_rules_*.json")))
+    failed = False
+    for path in rule_files:
+        with open(path) as f:
+            rules_service = RulesService.from_rules_json(json.load(f))
+        print(f"\n📐 FY {rules_service.financial_year} ({os.path.basename(path)})")
+
+        rows = []
+        for name, check in CHECKS.items():
+            rng = random.Random(f"{args.seed}-{name}")
+            start = time.perf_counter()
+            failures = check(rules_service, rng, args.samples)
+            known = name in KNOWN_ISSUES
+            if not failures:
+                result = "PASS"
+            else:
+                result = f"{'KNOWN' if known else 'FAIL'} ({len(failures)})"
+            rows.append({"property": name, "result": result, "seconds": round(time.perf_counter() - start, 2)})
+            for message in failures[:args.show]:
+                print(f"   {'⚠️ ' if known else '❌'} {name}: {message}")
+            failed = failed or (bool(failures) and not known)
+        print_table("Properties", rows)
+        for name, note in KNOWN_ISSUES.items():
+            print(f"⚠️  Known issue ({name}): {note}")
+
+        throughput = measure_throughput(rules_service, random.Random(args.seed), args.throughput)
+        print_table("Throughput", [{"measure": k, "per_sec": round(v)} for k, v in throughput.items()])
+
+    if failed:
+        print("\n❌ Tax engine properties violated")
+        return 1
+    print("\n✅ All tax engine properties hold")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tax engine property checks and throughput")
+    parser.add_argument("--samples", type=int, default=300, help="Random cases per property")
+    parser.add_argument("--throughput", type=int, default=5000, help="Taxpayers for the throughput run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show", type=int, default=5, help="Failures printed per property")
+    parser.add_argument("--rules", nargs="+", help="Rules JSON files (default: benchmarks/fixtures)")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,14 +17,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
+import threading
 import uvicorn
 
-from database import engine, get_db
+from database import engine, get_db, ensure_columns
 from models import Base
 from routers import auth, documents, tax, dashboard, qna, investments, admin
+from utils.rules_indexer import sync_rules_index
 
-# Create database tables
+# Create database tables (and columns added since a table was created)
 Base.metadata.create_all(bind=engine)
+ensure_columns(Base.metadata)
 
 app = FastAPI(
     title="AI-CA: AI-Powered Virtual Chartered Accountant",
@@ -50,6 +53,11 @@ app.include_router(qna.router, prefix="/api/qna", tags=["Q&A"])
 app.include_router(investments.router, prefix="/api/investments", tags=["Investments"])
 app.include_router(admin.router, prefix="/api", tags=["Admin"])
 
+@app.on_event("startup")
+def seed_rules_index():
+    # Index active tax rules into the RAG knowledge base without delaying startup
+    threading.Thread(target=sync_rules_index, daemon=True).start()
+
 @app.get("/")
 def read_root():
     return {
@@ -111,6 +111,8 @@ class TaxComputation(Base):
     refund_amount = Column(Float, default=0.0)
     
     computed_at = Column(DateTime, default=datetime.utcnow)
+    # Hash of the documents' extracted data, the rules and the DOB this result was computed from
+    input_fingerprint = Column(String(64), nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="tax_computations")
@@ -2,7 +2,7 @@
 Admin Router - Tax Rules Management
 Only accessible by admin users
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -11,6 +11,9 @@ from datetime import datetime
 from database import get_db
 from models import TaxRule, User
 from dependencies import get_admin_user
+from utils.rules_indexer import reindex_tax_rules
+from utils.rules_service import invalidate_rules_cache
+from utils.recompute_jobs import create_recompute_job, get_recompute_job, list_recompute_jobs, run_recompute_job
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -65,6 +68,22 @@ class TaxRuleTemplate(BaseModel):
     instructions: List[str]
 
 
+class RecomputeJobResponse(BaseModel):
+    """Progress of a bulk tax recompute for one FY"""
+    job_id: str
+    financial_year: str
+    status: str
+    total: int
+    processed: int
+    updated: int
+    skipped: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 # ==========================================
 # API Endpoints
 # ==========================================
@@ -116,6 +135,7 @@ def get_tax_rule(
 @router.post("/tax-rules", response_model=TaxRuleResponse, status_code=status.HTTP_201_CREATED)
 def create_tax_rule(
     tax_rule: TaxRuleCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user)
 ):
@@ -154,6 +174,10 @@ def create_tax_rule(
     db.add(new_rule)
     db.commit()
     db.refresh(new_rule)
+    invalidate_rules_cache(new_rule.financial_year)
+    
+    # Refresh the rules knowledge base used by Q&A
+    background_tasks.add_task(reindex_tax_rules, new_rule.financial_year)
     
     return new_rule
 
@@ -162,6 +186,7 @@ def create_tax_rule(
 def update_tax_rule(
     financial_year: str,
     update_data: TaxRuleUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user)
 ):
@@ -195,6 +220,9 @@ def update_tax_rule(
     rule.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(rule)
+    invalidate_rules_cache(financial_year)
+    
+    background_tasks.add_task(reindex_tax_rules, financial_year)
     
     return rule
 
@@ -202,6 +230,7 @@ def update_tax_rule(
 @router.delete("/tax-rules/{financial_year}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_tax_rule(
     financial_year: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user)
 ):
@@ -216,6 +245,9 @@ def delete_tax_rule(
     
     db.delete(rule)
     db.commit()
+    invalidate_rules_cache(financial_year)
+    
+    background_tasks.add_task(reindex_tax_rules, financial_year)
     
     return None
 
@@ -350,6 +382,7 @@ def duplicate_tax_rule(
     financial_year: str,
     new_financial_year: str,
     new_assessment_year: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user)
 ):
@@ -388,6 +421,10 @@ def duplicate_tax_rule(
     db.add(new_rule)
     db.commit()
     db.refresh(new_rule)
+    invalidate_rules_cache(new_rule.financial_year)
+    
+    # Inactive copies are kept out of the knowledge base until activated
+    background_tasks.add_task(reindex_tax_rules, new_rule.financial_year)
     
     return {
         "message": f"Tax rules duplicated from FY {financial_year} to FY {new_financial_year}",
@@ -398,6 +435,60 @@ def duplicate_tax_rule(
     }
 
 
+@router.post("/tax-rules/{financial_year}/recompute", response_model=RecomputeJobResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+def recompute_tax_computations(
+    financial_year: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """
+    Recompute every user's stored tax computation for a FY with the current rules
+    (run after updating the rules). Runs in the background - poll the returned job.
+    If a recompute for the FY is already running, that job is returned instead.
+    """
+    rule = db.query(TaxRule).filter(TaxRule.financial_year == financial_year).first()
+    
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tax rules not found for FY {financial_year}"
+        )
+    
+    job, created = create_recompute_job(financial_year)
+    if created:
+        background_tasks.add_task(run_recompute_job, job.job_id)
+    
+    return job.to_dict()
+
+
+@router.get("/recompute-jobs", response_model=List[RecomputeJobResponse])
+def list_recompute_job_status(
+    financial_year: Optional[str] = None,
+    admin: User = Depends(get_admin_user)
+):
+    """List recompute jobs of this server process (newest first)"""
+    return [job.to_dict() for job in list_recompute_jobs(financial_year)]
+
+
+@router.get("/recompute-jobs/{job_id}", response_model=RecomputeJobResponse)
+def get_recompute_job_status(
+    job_id: str,
+    admin: User = Depends(get_admin_user)
+):
+    """Progress of a recompute job"""
+    job = get_recompute_job(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recompute job {job_id} not found"
+        )
+    
+    return job.to_dict()
+
+
 @router.get("/check-admin")
 def check_admin_status(
     admin: User = Depends(get_admin_user)
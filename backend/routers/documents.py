@@ -72,13 +72,12 @@ async def verify_and_extract_task(document_id: int, db: Session):
         document.extracted_data = verification_result.get("extracted_data", {})
         db.commit()
 
-        # Perform comprehensive data extraction
-        extracted_text_content = verification_result.get("text_content")
+        # Perform comprehensive data extraction (reuses the pages read during verification)
         extracted_data = await extract_document_data(
             document.file_path,
             document.doc_type,
             document.financial_year,
-            text_content=extracted_text_content
+            pdf_text=verification_result.get("pdf_text")
         )
 
         # Merge with initial data
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from typing import Optional
 from database import get_db
 from models import User, TaxComputation, InvestmentSuggestion, ActivityHistory
-from schemas import InvestmentSuggestionResponse
+from schemas import InvestmentSuggestionResponse, DeductionPlanResponse
 from dependencies import get_current_user
 from utils.ollama_client import generate_investment_suggestions
+from utils.deduction_optimizer import optimize_deductions
+from utils.rules_service import RulesService, TaxRulesNotFoundError
+from utils.tax_calculator import calculate_age
 from datetime import datetime
 
 router = APIRouter()
@@ -88,6 +92,51 @@ async def get_investment_suggestions(
             detail=f"Error generating suggestions: {str(e)}"
         )
 
+@router.get("/optimize/{financial_year}", response_model=DeductionPlanResponse)
+def get_deduction_plan(
+    financial_year: str,
+    budget: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Minimum-tax allocation of an extra investment budget across 80C / 80CCD(1B) /
+    80D / 24(b) (whole remaining limits if no budget), and the deduction total at
+    which the old regime beats the new one. Rules-based, no AI call, nothing stored.
+    """
+    if budget is not None and budget < 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Budget cannot be negative"
+        )
+    
+    computation = db.query(TaxComputation).filter(
+        TaxComputation.user_id == current_user.id,
+        TaxComputation.financial_year == financial_year
+    ).first()
+    
+    if not computation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tax computation not found. Please calculate tax first."
+        )
+    
+    try:
+        rules_service = RulesService(db, financial_year)
+    except TaxRulesNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    age = calculate_age(current_user.date_of_birth, financial_year) if current_user.date_of_birth else 30
+    plan = optimize_deductions(
+        gross_income=computation.gross_total_income,
+        claims=computation.old_regime_deductions or {},
+        age=age,
+        rules_service=rules_service,
+        budget=budget
+    )
+    
+    return {"financial_year": financial_year, **plan}
+
 @router.get("/suggestions/{financial_year}", response_model=InvestmentSuggestionResponse)
 def get_existing_suggestions(
     financial_year: str,
@@ -127,7 +127,7 @@ async def ask_question(
     try:
         rag = get_rag_engine()
         # 1. Retrieve Context from RAG (Rules + User Documents)
-        context_text = rag.search_context(
+        context_text = await rag.search_context(
             query=question_data.question, 
             user_id=current_user.id,
             financial_year=target_year
@@ -151,6 +151,52 @@ class TaxComputationDetail(BaseModel):
     class Config:
         from_attributes = True
 
+# What-if simulation schemas
+MAX_SIMULATION_SCENARIOS = 50
+
+class TaxScenario(BaseModel):
+    name: Optional[str] = None
+    deductions: Dict[str, float]  # section -> amount added to current claims, e.g. {"80C": 50000}
+
+class TaxSimulationRequest(BaseModel):
+    scenarios: List[TaxScenario]
+    
+    @validator('scenarios')
+    def limit_scenarios(cls, v):
+        if not v:
+            raise ValueError('At least one scenario is required')
+        if len(v) > MAX_SIMULATION_SCENARIOS:
+            raise ValueError(f'At most {MAX_SIMULATION_SCENARIOS} scenarios per request')
+        return v
+
+class RegimeSimulation(BaseModel):
+    total_deductions: float
+    taxable_income: float
+    tax_before_rebate: float
+    rebate: float
+    tax_after_rebate: float
+    surcharge: float
+    cess: float
+    total_tax: float
+
+class ScenarioResult(BaseModel):
+    name: Optional[str] = None
+    deductions: Dict[str, float]
+    old_regime: RegimeSimulation
+    new_regime: RegimeSimulation
+    recommended_regime: str
+    tax_savings: float
+    final_tax: float
+    change_vs_current: float  # final_tax minus the current final tax (negative = saves tax)
+    tax_payable: float
+    refund_amount: float
+
+class TaxSimulationResponse(BaseModel):
+    financial_year: str
+    gross_total_income: float
+    current: ScenarioResult
+    scenarios: List[ScenarioResult]
+
 # Dashboard schemas
 class DashboardStats(BaseModel):
     financial_year: str
@@ -187,6 +233,22 @@ class InvestmentSuggestionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DeductionPlanResponse(BaseModel):
+    financial_year: str
+    budget: Optional[float] = None
+    remaining_limits: Dict[str, float]
+    allocation: Dict[str, float]  # section -> extra amount to invest / claim
+    invested: float
+    old_regime_tax_now: float
+    old_regime_tax_after: float
+    old_regime_tax_saved: float
+    new_regime_tax: float
+    recommended_regime_now: str
+    recommended_regime_after: str
+    current_deductions: float
+    break_even_deductions: Optional[float] = None  # total deductions at which old regime becomes cheaper (None: beyond the limits)
+    extra_deductions_for_old_regime: Optional[float] = None
+
 # Q&A schemas
 class QuestionRequest(BaseModel):
     question: str
@@ -0,0 +1,129 @@
+"""
+Indian Amount Parsing
+Turns amount strings from Form 16 / Form 26AS / AIS text into floats.
+
+Handles:
+- Indian digit grouping (10,69,432.00) and plain numbers (1069432.00)
+- Currency prefixes: ₹, Rs, Rs., INR
+- Trailing "/-" (₹ 5,000/-)
+- Trailing Cr / Dr (Dr = debit, returned as a negative amount)
+
+parse_indian_amount() handles a single value. parse_amount_column() handles a whole
+column of strings (e.g. every line of an AIS statement) with NumPy string operations,
+returning a float array and a validity mask instead of cleaning rows one at a time.
+"""
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Removed before parsing, in this order ("RS." before "RS")
+STRIP_TOKENS = ('₹', 'INR', 'RS.', 'RS', '/-', ',', ' ')
+DEBIT_SUFFIX = 'DR'
+CREDIT_SUFFIX = 'CR'
+# First characters an amount can have (after stripping whitespace)
+AMOUNT_START_CHARS = list('0123456789-.₹RrIi')
+
+
+def parse_indian_amount(value: Any) -> Optional[float]:
+    """
+    Parse one amount. Returns None if the value is not an amount.
+    parse_indian_amount("₹ 10,69,432.00") -> 1069432.0
+    parse_indian_amount("5,000 Dr") -> -5000.0
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+
+    cleaned = value.strip().upper()
+    for token in STRIP_TOKENS:
+        cleaned = cleaned.replace(token, '')
+
+    negative = False
+    if cleaned.endswith(DEBIT_SUFFIX):
+        negative = True
+        cleaned = cleaned[:-2]
+    elif cleaned.endswith(CREDIT_SUFFIX):
+        cleaned = cleaned[:-2]
+    if cleaned.startswith('-'):
+        negative = not negative
+        cleaned = cleaned[1:]
+
+    digits = cleaned.replace('.', '', 1)
+    if not (digits.isascii() and digits.isdecimal()):
+        return None
+    amount = float(cleaned)
+    return -amount if negative else amount
+
+
+def _parse_decorated(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Full rules (currency prefixes, /-, Cr/Dr, sign) for a column of stripped strings"""
+    column = np.char.upper(column)
+    for token in STRIP_TOKENS:
+        column = np.char.replace(column, token, '')
+
+    debit = np.char.endswith(column, DEBIT_SUFFIX)
+    suffixed = debit | np.char.endswith(column, CREDIT_SUFFIX)
+    if suffixed.any():
+        column = np.where(suffixed, np.char.rstrip(column, 'CDR'), column)
+
+    signed = np.char.startswith(column, '-')
+    if signed.any():
+        column = np.where(signed, np.char.lstrip(column, '-'), column)
+
+    valid = np.char.isdecimal(np.char.replace(column, '.', '', count=1))
+    amounts = _to_float(column, valid)
+    amounts[debit ^ signed] *= -1
+    return amounts, valid
+
+
+def _to_float(column: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """float64 of the valid entries (0.0 elsewhere); clears valid for non-ASCII digits"""
+    amounts = np.zeros(len(column), dtype=np.float64)
+    if not valid.any() or column.dtype.itemsize == 0:
+        valid[:] = False
+        return amounts
+    # isdecimal() also accepts other scripts' digits; amounts are ASCII only
+    codes = column.view(np.uint32).reshape(len(column), -1)
+    valid &= (codes < 128).all(axis=1)
+    amounts[valid] = column[valid].astype(np.float64)
+    return amounts
+
+
+def parse_amount_column(values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a column of amount strings in one go.
+    Returns (amounts, valid): a float64 array (0.0 where invalid) and a bool mask.
+    Same rules as parse_indian_amount.
+
+    Only entries that can start an amount (digit, sign, '.', ₹, Rs, INR) are parsed;
+    plain grouped numbers (10,69,432.00) take a fast path and only the rest go
+    through prefix / suffix handling.
+    """
+    count = len(values)
+    amounts = np.zeros(count, dtype=np.float64)
+    valid = np.zeros(count, dtype=bool)
+    if count == 0:
+        return amounts, valid
+
+    column = np.char.strip(np.asarray(values, dtype=str))
+    candidates = np.flatnonzero(np.isin(column.astype('U1'), AMOUNT_START_CHARS))
+    if not len(candidates):
+        return amounts, valid
+
+    subset = np.char.replace(column[candidates], ',', '')
+    plain = np.char.isdecimal(np.char.replace(subset, '.', '', count=1))
+    parsed = np.zeros(len(candidates), dtype=bool)
+
+    plain_valid = np.ones(int(plain.sum()), dtype=bool)
+    amounts[candidates[plain]] = _to_float(subset[plain], plain_valid)
+    parsed[plain] = plain_valid
+
+    if not plain.all():
+        decorated_amounts, decorated_valid = _parse_decorated(subset[~plain])
+        amounts[candidates[~plain]] = decorated_amounts
+        parsed[~plain] = decorated_valid
+    valid[candidates] = parsed
+    return amounts, valid
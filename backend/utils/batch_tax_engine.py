@@ -0,0 +1,269 @@
+"""
+Batch Tax Engine
+Computes old- and new-regime tax for many taxpayers at once with NumPy, for
+year-end recomputation after a rules change and employer bulk onboarding.
+
+Per taxpayer it follows the scalar path in utils/tax_calculator.py step for step
+(apply_deduction_limits -> slab tax -> rebate 87A -> surcharge with marginal
+relief -> cess -> regime recommendation), in the same arithmetic order, so results
+match calculate_old_regime_tax / calculate_new_regime_tax exactly.
+All figures come from RulesService, as in the scalar path.
+
+    engine = BatchTaxEngine(RulesService(db, "2024-25"))
+    batch = TaxpayerBatch.from_records(records)          # or build the arrays directly
+    results = engine.compute(batch)                      # dict of NumPy arrays
+    results["new_regime"]["total_tax"], results["recommended_new"], ...
+"""
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from utils.rules_service import RulesService
+from utils.tax_calculator import prepare_regime_inputs, total_taxes_paid_from
+from utils.slab_table import CompiledSlabs
+
+# Old regime claims read by apply_deduction_limits
+DEDUCTION_KEYS = (
+    "80C", "80CCC", "80CCD_1", "80CCD_1B", "80CCD_2", "80D", "80E", "80G", "80GG",
+    "80TTA", "80TTB", "80U", "80DD", "80DDB", "80EE", "80EEA", "24b_home_loan_interest",
+    "Standard Deduction", "Professional Tax",
+)
+
+# Age bands with their own slabs / limits (below 60, 60-79, 80+)
+AGE_BANDS = (0, 60, 80)
+
+REGIME_FIELDS = (
+    "total_deductions", "taxable_income", "tax_before_rebate", "rebate",
+    "tax_after_rebate", "surcharge", "cess", "total_tax",
+)
+
+
+@dataclass
+class TaxpayerBatch:
+    """Column-wise inputs for n taxpayers (deduction arrays default to zeros)"""
+    gross_income: np.ndarray
+    age: np.ndarray
+    deductions: Dict[str, np.ndarray] = field(default_factory=dict)
+    taxes_paid: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.gross_income = np.asarray(self.gross_income, dtype=np.float64)
+        self.age = np.asarray(self.age, dtype=np.int64)
+        n = len(self.gross_income)
+        self.deductions = {
+            key: np.asarray(self.deductions.get(key, np.zeros(n)), dtype=np.float64) for key in DEDUCTION_KEYS
+        }
+        self.taxes_paid = np.zeros(n) if self.taxes_paid is None else np.asarray(self.taxes_paid, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.gross_income)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "TaxpayerBatch":
+        """
+        From per-taxpayer dicts:
+        {"gross_income": float, "age": int, "deductions": {key: amount}, "taxes_paid": float}
+        """
+        records = list(records)
+        claims = [r.get("deductions") or {} for r in records]
+        return cls(
+            gross_income=np.array([r.get("gross_income", 0) for r in records], dtype=np.float64),
+            age=np.array([r.get("age", 30) for r in records], dtype=np.int64),
+            deductions={
+                key: np.array([c.get(key, 0) for c in claims], dtype=np.float64) for key in DEDUCTION_KEYS
+            },
+            taxes_paid=np.array([r.get("taxes_paid", 0) for r in records], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_extracted(cls, rows: Iterable[Tuple[Dict[str, Any], int]],
+                       rules_service: RulesService) -> "TaxpayerBatch":
+        """
+        From (aggregated extracted_data, age) pairs, as calculate_comprehensive_tax
+        receives them - gross income and claims go through prepare_regime_inputs.
+        """
+        records = []
+        for extracted_data, age in rows:
+            data = copy.deepcopy(extracted_data)
+            gross_income, _, old_regime_deductions, _ = prepare_regime_inputs(data, rules_service, verbose=False)
+            records.append({
+                "gross_income": gross_income,
+                "age": age,
+                "deductions": old_regime_deductions,
+                "taxes_paid": total_taxes_paid_from(data),
+            })
+        return cls.from_records(records)
+
+
+class _SlabArrays:
+    """CompiledSlabs as arrays for np.searchsorted"""
+
+    def __init__(self, table: CompiledSlabs):
+        self.breakpoints = np.array(table.breakpoints, dtype=np.float64)
+        self.rates = np.array(table.rates, dtype=np.float64)
+        self.prefix_tax = np.array(table.prefix_tax, dtype=np.float64)
+
+    def tax(self, income: np.ndarray) -> np.ndarray:
+        if not len(self.breakpoints):
+            return np.zeros_like(income)
+        j = np.searchsorted(self.breakpoints, income, side="right") - 1
+        safe = np.maximum(j, 0)
+        tax = self.prefix_tax[safe] + (income - self.breakpoints[safe]) * self.rates[safe] / 100
+        return np.where(j < 0, 0.0, tax)
+
+
+class BatchTaxEngine:
+    """Rules for one FY, pre-extracted into arrays; compute() runs a whole batch"""
+
+    def __init__(self, rules_service: RulesService):
+        self.financial_year = rules_service.financial_year
+        self.slabs = {
+            (regime, band): _SlabArrays(rules_service.get_compiled_slabs(regime, band))
+            for regime in ("old_regime", "new_regime") for band in AGE_BANDS
+        }
+        self.limits = {
+            senior: rules_service.get_all_deduction_limits(60 if senior else 30) for senior in (False, True)
+        }
+        self.rebate = {regime: rules_service.get_rebate_87a(regime) for regime in ("old_regime", "new_regime")}
+        self.surcharge = {
+            regime: rules_service.get_surcharge_thresholds(regime) for regime in ("old_regime", "new_regime")
+        }
+        self.cess_percent = rules_service.get_cess_percent()
+        self.new_standard_deduction = rules_service.get_standard_deduction("new_regime")
+
+    # ==========================================
+    # Building blocks
+    # ==========================================
+    def _limit(self, key: str, senior: np.ndarray) -> np.ndarray:
+        return np.where(senior, self.limits[True][key], self.limits[False][key]).astype(np.float64)
+
+    def capped_deductions_total(self, batch: TaxpayerBatch) -> np.ndarray:
+        """Sum of apply_deduction_limits() values, summed in the same order"""
+        d = batch.deductions
+        senior = batch.age >= 60
+        limit = lambda key: self._limit(key, senior)
+
+        parts = [
+            np.minimum(d["80C"] + d["80CCC"] + d["80CCD_1"], limit("80C")),
+            np.minimum(d["80CCD_1B"], limit("80CCD_1B")),
+            np.minimum(d["80CCD_2"], batch.gross_income * (limit("80CCD_2_percent") / 100)),
+            np.minimum(d["80D"], limit("80D_self") + limit("80D_parents_senior")),
+            d["80E"],
+            d["80G"],
+            np.minimum(d["80GG"], limit("80GG")),
+            # 80TTB for seniors, 80TTA otherwise (the other one is 0)
+            np.where(senior, np.minimum(d["80TTB"], limit("80TTB")), np.minimum(d["80TTA"], limit("80TTA"))),
+            np.minimum(d["80U"], limit("80U_severe")),
+            np.minimum(d["80DD"], limit("80DD_severe")),
+            np.minimum(d["80DDB"], limit("80DDB")),
+            np.minimum(d["80EE"], limit("80EE")),
+            np.minimum(d["80EEA"], limit("80EEA")),
+            np.minimum(d["24b_home_loan_interest"], limit("24b")),
+            np.minimum(d["Standard Deduction"], limit("Standard Deduction")),
+            np.minimum(d["Professional Tax"], limit("Professional Tax")),
+        ]
+        total = np.zeros(len(batch))
+        for part in parts:
+            total = total + part
+        return total
+
+    def slab_tax(self, regime: str, taxable_income: np.ndarray, age: np.ndarray) -> np.ndarray:
+        band = np.where(age >= 80, 80, np.where(age >= 60, 60, 0))
+        tax = np.zeros_like(taxable_income)
+        for value in AGE_BANDS:
+            mask = band == value
+            if mask.any():
+                tax[mask] = self.slabs[(regime, value)].tax(taxable_income[mask])
+        return tax
+
+    def surcharge_with_relief(self, regime: str, income: np.ndarray, tax: np.ndarray) -> np.ndarray:
+        """calculate_surcharge(): last matching threshold's rate, capped at income above it"""
+        rate = np.zeros_like(income)
+        threshold = np.zeros_like(income)
+        for entry in self.surcharge[regime]:
+            above = income > entry["min_exclusive"]
+            rate = np.where(above, entry["rate_percent"], rate)
+            threshold = np.where(above, entry["min_exclusive"], threshold)
+        surcharge = tax * rate / 100
+        relieved = (threshold > 0) & (surcharge > income - threshold)
+        surcharge = np.where(relieved, income - threshold, surcharge)
+        return np.where(rate == 0, 0.0, surcharge)
+
+    def _finish(self, regime: str, total_deductions: np.ndarray, taxable_income: np.ndarray,
+                age: np.ndarray) -> Dict[str, np.ndarray]:
+        tax_before_rebate = self.slab_tax(regime, taxable_income, age)
+        config = self.rebate[regime]
+        rebate = np.where(
+            taxable_income <= config["max_total_income"], np.minimum(tax_before_rebate, config["rebate_cap"]), 0.0
+        )
+        tax_after_rebate = np.maximum(0, tax_before_rebate - rebate)
+        surcharge = self.surcharge_with_relief(regime, taxable_income, tax_after_rebate)
+        cess = (tax_after_rebate + surcharge) * self.cess_percent / 100
+        return {
+            "total_deductions": total_deductions,
+            "taxable_income": taxable_income,
+            "tax_before_rebate": tax_before_rebate,
+            "rebate": rebate,
+            "tax_after_rebate": tax_after_rebate,
+            "surcharge": surcharge,
+            "cess": cess,
+            "total_tax": tax_after_rebate + surcharge + cess,
+        }
+
+    def tax_on_taxable_income(self, regime: str, taxable_income: np.ndarray, age: np.ndarray) -> Dict[str, np.ndarray]:
+        """Slab tax -> rebate -> surcharge -> cess for given taxable incomes (deductions already applied)"""
+        taxable_income = np.asarray(taxable_income, dtype=np.float64)
+        age = np.broadcast_to(np.asarray(age, dtype=np.int64), taxable_income.shape)
+        return self._finish(regime, np.zeros_like(taxable_income), taxable_income, age)
+
+    # ==========================================
+    # Regimes
+    # ==========================================
+    def old_regime(self, batch: TaxpayerBatch) -> Dict[str, np.ndarray]:
+        total_deductions = np.minimum(self.capped_deductions_total(batch), batch.gross_income)
+        taxable_income = np.maximum(0, batch.gross_income - total_deductions)
+        return self._finish("old_regime", total_deductions, taxable_income, batch.age)
+
+    def new_regime(self, batch: TaxpayerBatch) -> Dict[str, np.ndarray]:
+        # Standard deduction from rules + employer NPS (80CCD(2)) only
+        standard_deduction = np.full(len(batch), float(self.new_standard_deduction))
+        total_deductions = standard_deduction + batch.deductions["80CCD_2"]
+        taxable_income = np.maximum(0, batch.gross_income - total_deductions)
+        return self._finish("new_regime", total_deductions, taxable_income, batch.age)
+
+    def compute(self, batch: TaxpayerBatch) -> Dict[str, Any]:
+        """Both regimes, the recommendation (as recommend_regime) and the final liability"""
+        old = self.old_regime(batch)
+        new = self.new_regime(batch)
+        recommended_new = new["total_tax"] < old["total_tax"]
+        final_tax = np.where(recommended_new, new["total_tax"], old["total_tax"])
+        return {
+            "old_regime": old,
+            "new_regime": new,
+            "recommended_new": recommended_new,
+            "tax_savings": np.where(recommended_new, old["total_tax"] - new["total_tax"],
+                                    new["total_tax"] - old["total_tax"]),
+            "final_tax": final_tax,
+            "tax_payable": np.maximum(0, final_tax - batch.taxes_paid),
+            "refund_amount": np.maximum(0, batch.taxes_paid - final_tax),
+        }
+
+
+def get_batch_engine(rules_service: RulesService) -> BatchTaxEngine:
+    """BatchTaxEngine for the service's rules, built once per loaded rules version"""
+    return rules_service.memo("batch_engine", lambda: BatchTaxEngine(rules_service))
+
+
+def result_row(results: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """One taxpayer's figures from compute() as plain Python values"""
+    return {
+        "old_regime": {k: float(results["old_regime"][k][index]) for k in REGIME_FIELDS},
+        "new_regime": {k: float(results["new_regime"][k][index]) for k in REGIME_FIELDS},
+        "recommended_regime": "New Regime" if results["recommended_new"][index] else "Old Regime",
+        "tax_savings": float(results["tax_savings"][index]),
+        "final_tax": float(results["final_tax"][index]),
+        "tax_payable": float(results["tax_payable"][index]),
+        "refund_amount": float(results["refund_amount"][index]),
+    }
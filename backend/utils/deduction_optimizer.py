@@ -0,0 +1,183 @@
+"""
+Deduction Optimizer
+Deterministic answer to "where should my next ₹X of tax-saving investment go, and
+is it worth staying in the old regime?" - no LLM call, all figures from RulesService.
+
+- optimize_deductions(): the allocation of an extra budget across 80C, 80CCD(1B),
+  80D and 24(b) that minimises old-regime tax. Every one of these sections reduces
+  taxable income rupee for rupee up to its remaining limit, so the tax depends only
+  on the total placed; sections are filled in the given order, and only as much as
+  still lowers tax (nothing is suggested once taxable income reaches the zero-tax
+  zone of the slabs / rebate 87A).
+- The break-even total deduction at which the old regime becomes cheaper than the
+  new regime (None when the deduction limits can't get there).
+
+Old-regime tax is monotonic in taxable income only within a surcharge band: the
+marginal relief in calculate_surcharge lets it drop just past a threshold (see the
+statutory_relief known issue in benchmarks/tax_engine_harness.py). Both searches
+therefore bisect band by band.
+
+Tax is evaluated with BatchTaxEngine (compiled slabs), so a full plan takes a few
+milliseconds.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from utils.batch_tax_engine import TaxpayerBatch, get_batch_engine, result_row
+from utils.rules_service import RulesService
+
+# Sections the optimizer may allocate to, in default fill order
+OPTIMIZABLE_SECTIONS = ("80C", "80CCD_1B", "80D", "24b_home_loan_interest")
+
+
+def remaining_limits(claims: Mapping[str, float], age: int, rules_service: RulesService) -> Dict[str, float]:
+    """Headroom left in each optimizable section (same caps as apply_deduction_limits)"""
+    limits = rules_service.get_all_deduction_limits(age)
+    section_80c_total = claims.get("80C", 0) + claims.get("80CCC", 0) + claims.get("80CCD_1", 0)
+    return {
+        "80C": max(0, limits["80C"] - section_80c_total),
+        "80CCD_1B": max(0, limits["80CCD_1B"] - claims.get("80CCD_1B", 0)),
+        "80D": max(0, limits["80D_self"] + limits["80D_parents_senior"] - claims.get("80D", 0)),
+        "24b_home_loan_interest": max(0, limits["24b"] - claims.get("24b_home_loan_interest", 0)),
+    }
+
+
+def _old_regime_tax(engine, taxable_income, age) -> np.ndarray:
+    return engine.tax_on_taxable_income("old_regime", taxable_income, age)["total_tax"]
+
+
+def _surcharge_cuts(rules_service: RulesService) -> List[float]:
+    """Taxable incomes after which the old-regime surcharge rate changes"""
+    return sorted(t["min_exclusive"] for t in rules_service.get_surcharge_thresholds("old_regime"))
+
+
+def _smallest_extra_for_min_tax(engine, rules_service: RulesService, taxable_income: float,
+                                usable: float, age: int) -> float:
+    """Least extra deduction (whole rupees, <= usable) giving the lowest tax reachable with usable"""
+    def tax(extra: int) -> float:
+        return _old_regime_tax(engine, [max(0.0, taxable_income - min(extra, usable))], age)[0]
+
+    # Bands of extra deduction, lowest first; tax is non-increasing within each
+    last = int(np.ceil(usable))
+    bands, start = [], 0
+    for cut in _surcharge_cuts(rules_service):
+        first_at_or_below = int(np.ceil(taxable_income - cut))  # taxable <= cut from here on
+        if start < first_at_or_below <= last:
+            bands.append((start, first_at_or_below - 1))
+            start = first_at_or_below
+    bands.append((start, last))
+
+    min_tax = min(tax(hi) for _, hi in bands)
+    for lo, hi in bands:
+        if tax(hi) > min_tax:
+            continue
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tax(mid) <= min_tax:
+                hi = mid
+            else:
+                lo = mid + 1
+        return float(min(hi, usable))
+    return float(usable)
+
+
+def old_regime_break_even(gross_income: float, age: int, new_regime_tax: float,
+                          rules_service: RulesService,
+                          max_deductions: Optional[float] = None) -> Optional[float]:
+    """
+    Smallest total old-regime deduction (after caps) at which old-regime tax is lower
+    than new_regime_tax, in whole rupees. None if the old regime is never cheaper, or
+    only with more than max_deductions (what the limits allow).
+    """
+    engine = get_batch_engine(rules_service)
+    if new_regime_tax <= 0:
+        return None
+
+    def cheaper(taxable: int) -> bool:
+        return _old_regime_tax(engine, [float(taxable)], age)[0] < new_regime_tax
+
+    # Largest taxable income X with old tax(X) < new tax; the deduction needed is gross - X.
+    # Bands of taxable income, highest first; tax is non-decreasing within each.
+    top = int(np.floor(gross_income))
+    bands, end = [], top
+    for cut in reversed(_surcharge_cuts(rules_service)):
+        if 0 <= cut < end:
+            bands.append((int(cut) + 1, end))
+            end = int(cut)
+    bands.append((0, end))
+
+    for lo, hi in bands:
+        if not cheaper(lo):
+            continue
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if cheaper(mid):
+                lo = mid
+            else:
+                hi = mid - 1
+        break_even = 0.0 if lo == top else float(gross_income - lo)
+        if max_deductions is not None and break_even > max_deductions:
+            return None
+        return break_even
+    return None
+
+
+def optimize_deductions(gross_income: float, claims: Mapping[str, float], age: int,
+                        rules_service: RulesService, budget: Optional[float] = None,
+                        sections: Sequence[str] = OPTIMIZABLE_SECTIONS) -> Dict[str, Any]:
+    """
+    Minimum-tax allocation of an extra investment budget (None = as much as the
+    limits allow) plus the old / new regime break-even.
+    """
+    engine = get_batch_engine(rules_service)
+    headroom = remaining_limits(claims, age, rules_service)
+    headroom = {section: headroom[section] for section in sections}
+
+    current = result_row(engine.compute(TaxpayerBatch.from_records([
+        {"gross_income": gross_income, "age": age, "deductions": dict(claims)}
+    ])), 0)
+    old_now, new_now = current["old_regime"], current["new_regime"]
+
+    available = sum(headroom.values())
+    usable = available if budget is None else min(max(0.0, budget), available)
+    # Deductions can't take the total past gross income
+    usable = min(usable, max(0.0, gross_income - old_now["total_deductions"]))
+    worthwhile = (_smallest_extra_for_min_tax(engine, rules_service, old_now["taxable_income"], usable, age)
+                  if usable > 0 else 0.0)
+
+    allocation, left = {}, worthwhile
+    for section in sections:
+        amount = min(headroom[section], left)
+        if amount > 0:
+            allocation[section] = amount
+            left -= amount
+
+    planned_claims = dict(claims)
+    for section, amount in allocation.items():
+        planned_claims[section] = planned_claims.get(section, 0) + amount
+    planned = result_row(engine.compute(TaxpayerBatch.from_records([
+        {"gross_income": gross_income, "age": age, "deductions": planned_claims}
+    ])), 0)
+
+    break_even = old_regime_break_even(
+        gross_income, age, new_now["total_tax"], rules_service,
+        max_deductions=old_now["total_deductions"] + available
+    )
+    return {
+        "budget": budget,
+        "remaining_limits": headroom,
+        "allocation": allocation,
+        "invested": sum(allocation.values()),
+        "old_regime_tax_now": old_now["total_tax"],
+        "old_regime_tax_after": planned["old_regime"]["total_tax"],
+        "old_regime_tax_saved": old_now["total_tax"] - planned["old_regime"]["total_tax"],
+        "new_regime_tax": new_now["total_tax"],
+        "recommended_regime_now": current["recommended_regime"],
+        "recommended_regime_after": planned["recommended_regime"],
+        "current_deductions": old_now["total_deductions"],
+        "break_even_deductions": break_even,
+        "extra_deductions_for_old_regime": (
+            None if break_even is None else max(0.0, break_even - old_now["total_deductions"])
+        ),
+    }
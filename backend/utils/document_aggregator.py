@@ -0,0 +1,499 @@
+"""
+Document Aggregation
+Combines the extracted_data of a user's verified Form 16 / 26AS / AIS documents for a
+financial year into one dict of incomes, deductions, taxes paid and ITR form signals.
+Used by the tax router, the bulk recompute job and the what-if simulator.
+"""
+
+
+def aggregate_document_data(documents):
+    """
+    Comprehensive aggregation of data from multiple tax documents
+    Combines Form 16, Form 26AS, and AIS data intelligently
+    
+    Extracts signals for ITR form type detection:
+    - Income from all sources
+    - TDS section codes
+    - Eligibility indicators (foreign assets, director status, etc.)
+    """
+    
+    aggregated = {
+        # Income Details
+        "gross_total_income": 0,
+        "salary_income": 0,
+        "gross_salary": 0,
+        "net_salary": 0,
+        "house_property_income": 0,
+        "capital_gains": 0,
+        "capital_gains_short_term": 0,
+        "capital_gains_long_term": 0,
+        "capital_gains_ltcg_112a": 0,  # LTCG under section 112A (equity)
+        "other_income": 0,
+        "interest_income": 0,
+        "dividend_income": 0,
+        "business_income": 0,
+        "professional_income": 0,
+        "agricultural_income": 0,
+        "crypto_income": 0,
+        "rental_income": 0,
+        
+        # TDS Details
+        "total_tds": 0,
+        "tds_on_salary": 0,
+        "advance_tax_paid": 0,
+        "self_assessment_tax": 0,
+        
+        # TDS Section codes (for ITR form detection)
+        "tds_sections": [],
+        "tds_details": {},
+        
+        # Exemptions (Section 10, 16)
+        "exemptions": {
+            "hra_exemption": 0,
+            "lta_exemption": 0,
+            "standard_deduction": 0,
+            "professional_tax": 0,
+            "entertainment_allowance": 0,
+            "total_exemptions": 0
+        },
+        
+        # Chapter VI-A Deductions (Old Regime)
+        "old_regime_deductions": {
+            "80C": 0,
+            "80CCC": 0,
+            "80CCD_1": 0,
+            "80CCD_1B": 0,
+            "80CCD_2": 0,
+            "80D": 0,
+            "80DD": 0,
+            "80DDB": 0,
+            "80E": 0,
+            "80EE": 0,
+            "80EEA": 0,
+            "80G": 0,
+            "80GG": 0,
+            "80TTA": 0,
+            "80TTB": 0,
+            "80U": 0,
+            "24b_home_loan_interest": 0,
+            "Standard Deduction": 0,
+            "Professional Tax": 0,
+        },
+        
+        # Tax computation details (from Form 16)
+        "tax_on_total_income": 0,
+        "rebate_87a": 0,
+        "surcharge": 0,
+        "cess": 0,
+        "total_tax_liability": 0,
+        "relief_89": 0,
+        
+        # === ITR FORM ELIGIBILITY FLAGS ===
+        "has_capital_gains": False,
+        "has_business_income": False,
+        "has_foreign_assets": False,
+        "has_foreign_income": False,
+        "is_director_in_company": False,
+        "has_unlisted_equity": False,
+        "is_resident": True,
+        "num_house_properties": 1,
+        "multiple_house_properties": False,
+        
+        # Presumptive taxation flags
+        "has_presumptive_income_44ad": False,
+        "has_presumptive_income_44ada": False,
+        "has_presumptive_income_44ae": False,
+    }
+    
+    for doc in documents:
+        if not doc.extracted_data:
+            continue
+        
+        data = doc.extracted_data
+        doc_type_value = doc.doc_type.value if doc.doc_type else ""
+        
+        print(f"📊 Aggregating data from {doc_type_value}...")
+        
+        # === FORM 16 DATA ===
+        if doc_type_value == "Form 16":
+            # Salary Income - Use maximum (Form 16 is authoritative for salary)
+            aggregated["salary_income"] = max(
+                aggregated["salary_income"],
+                _safe_float(data.get("gross_salary", 0)),
+                _safe_float(data.get("salary_income", 0))
+            )
+            aggregated["gross_salary"] = max(
+                aggregated["gross_salary"],
+                _safe_float(data.get("gross_salary", 0))
+            )
+            aggregated["net_salary"] = max(
+                aggregated["net_salary"],
+                _safe_float(data.get("net_salary", 0))
+            )
+            
+            # Gross Total Income
+            aggregated["gross_total_income"] = max(
+                aggregated["gross_total_income"],
+                _safe_float(data.get("gross_total_income", 0)),
+                _safe_float(data.get("total_income", 0))
+            )
+            
+            # TDS
+            aggregated["total_tds"] = max(
+                aggregated["total_tds"],
+                _safe_float(data.get("total_tds", 0)),
+                _safe_float(data.get("total_tax_deducted", 0))
+            )
+            aggregated["tds_on_salary"] = max(
+                aggregated["tds_on_salary"],
+                _safe_float(data.get("tds_on_salary", 0))
+            )
+            
+            # House Property Income/Loss
+            hp_income = _safe_float(data.get("income_from_house_property", 0))
+            if hp_income != 0:
+                aggregated["house_property_income"] = hp_income
+            
+            # Other Income
+            aggregated["other_income"] = max(
+                aggregated["other_income"],
+                _safe_float(data.get("income_from_other_sources", 0)),
+                _safe_float(data.get("other_income", 0))
+            )
+            
+            # === EXEMPTIONS (Section 10, 16) ===
+            exemptions = data.get("exemptions", {})
+            if isinstance(exemptions, dict):
+                for key in ["hra_exemption", "lta_exemption", "standard_deduction", 
+                           "professional_tax", "entertainment_allowance", "total_exemptions"]:
+                    aggregated["exemptions"][key] = max(
+                        aggregated["exemptions"].get(key, 0),
+                        _safe_float(exemptions.get(key, 0))
+                    )
+            
+            # Direct exemption fields (if not nested)
+            if "standard_deduction" in data:
+                aggregated["exemptions"]["standard_deduction"] = max(
+                    aggregated["exemptions"]["standard_deduction"],
+                    _safe_float(data.get("standard_deduction", 0))
+                )
+            if "professional_tax" in data:
+                aggregated["exemptions"]["professional_tax"] = max(
+                    aggregated["exemptions"]["professional_tax"],
+                    _safe_float(data.get("professional_tax", 0))
+                )
+            
+            # === CHAPTER VI-A DEDUCTIONS ===
+            deductions = data.get("deductions", {})
+            if isinstance(deductions, dict):
+                for key in ["80C", "80CCC", "80CCD_1", "80CCD_1B", "80CCD_2", 
+                           "80D", "80DD", "80DDB", "80E", "80EE", "80EEA",
+                           "80G", "80GG", "80TTA", "80TTB", "80U", 
+                           "24b_home_loan_interest", "total_deductions"]:
+                    value = _safe_float(deductions.get(key, 0))
+                    if value > 0:
+                        aggregated["old_regime_deductions"][key] = max(
+                            aggregated["old_regime_deductions"].get(key, 0),
+                            value
+                        )
+                
+                # Handle lowercase variations (from older extraction)
+                key_mapping = {
+                    "80c": "80C", "80ccc": "80CCC", "80ccd": "80CCD_1",
+                    "80d": "80D", "80e": "80E", "80g": "80G"
+                }
+                for old_key, new_key in key_mapping.items():
+                    value = _safe_float(deductions.get(old_key, 0))
+                    if value > 0:
+                        aggregated["old_regime_deductions"][new_key] = max(
+                            aggregated["old_regime_deductions"].get(new_key, 0),
+                            value
+                        )
+            
+            # Add Standard Deduction and Professional Tax to deductions for old regime calc
+            aggregated["old_regime_deductions"]["Standard Deduction"] = max(
+                aggregated["old_regime_deductions"].get("Standard Deduction", 0),
+                aggregated["exemptions"].get("standard_deduction", 0)
+            )
+            aggregated["old_regime_deductions"]["Professional Tax"] = max(
+                aggregated["old_regime_deductions"].get("Professional Tax", 0),
+                aggregated["exemptions"].get("professional_tax", 0)
+            )
+            
+            # Tax computation details
+            aggregated["tax_on_total_income"] = max(
+                aggregated["tax_on_total_income"],
+                _safe_float(data.get("tax_on_total_income", 0))
+            )
+            aggregated["rebate_87a"] = max(
+                aggregated["rebate_87a"],
+                _safe_float(data.get("rebate_87a", 0))
+            )
+            aggregated["surcharge"] = max(
+                aggregated["surcharge"],
+                _safe_float(data.get("surcharge", 0))
+            )
+            aggregated["cess"] = max(
+                aggregated["cess"],
+                _safe_float(data.get("cess", 0))
+            )
+            aggregated["relief_89"] = max(
+                aggregated["relief_89"],
+                _safe_float(data.get("relief_89", 0))
+            )
+        
+        # === FORM 26AS DATA ===
+        elif doc_type_value == "Form 26AS":
+            # TDS from 26AS is authoritative
+            aggregated["total_tds"] = max(
+                aggregated["total_tds"],
+                _safe_float(data.get("total_tds", 0))
+            )
+            aggregated["advance_tax_paid"] = max(
+                aggregated["advance_tax_paid"],
+                _safe_float(data.get("advance_tax_paid", 0))
+            )
+            aggregated["self_assessment_tax"] = max(
+                aggregated["self_assessment_tax"],
+                _safe_float(data.get("self_assessment_tax", 0))
+            )
+            
+            # TDS details by section - Extract section codes for ITR form detection
+            tds_details = data.get("tds_details", {})
+            if isinstance(tds_details, dict):
+                # Merge TDS details
+                for section_key, amount in tds_details.items():
+                    if section_key not in aggregated["tds_details"]:
+                        aggregated["tds_details"][section_key] = 0
+                    aggregated["tds_details"][section_key] = max(
+                        aggregated["tds_details"][section_key],
+                        _safe_float(amount)
+                    )
+                    
+                    # Extract section code and add to list
+                    # Handle various formats: "salary_192", "192", "section_192"
+                    import re
+                    section_match = re.search(r'(\d+[A-Z]*)', str(section_key).upper())
+                    if section_match:
+                        section_code = section_match.group(1)
+                        if section_code not in aggregated["tds_sections"]:
+                            aggregated["tds_sections"].append(section_code)
+                
+                # Salary TDS (192)
+                salary_tds = _safe_float(tds_details.get("salary_192", 0))
+                if salary_tds == 0:
+                    salary_tds = _safe_float(tds_details.get("192", 0))
+                if salary_tds > 0:
+                    aggregated["tds_on_salary"] = max(
+                        aggregated["tds_on_salary"], salary_tds
+                    )
+                    if "192" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("192")
+                
+                # Professional income detection (194J)
+                prof_tds = _safe_float(tds_details.get("194J", 0)) + _safe_float(tds_details.get("professional_194J", 0))
+                if prof_tds > 0:
+                    if "194J" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("194J")
+                    # Estimate professional income from TDS (assuming 10% TDS rate)
+                    estimated_prof_income = prof_tds / 0.1
+                    aggregated["professional_income"] = max(
+                        aggregated["professional_income"],
+                        estimated_prof_income
+                    )
+                    aggregated["has_business_income"] = True
+                
+                # Contractor income detection (194C)
+                contractor_tds = _safe_float(tds_details.get("194C", 0)) + _safe_float(tds_details.get("contractor_194C", 0))
+                if contractor_tds > 0:
+                    if "194C" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("194C")
+                    aggregated["has_business_income"] = True
+                
+                # Commission income detection (194H)
+                commission_tds = _safe_float(tds_details.get("194H", 0)) + _safe_float(tds_details.get("commission_194H", 0))
+                if commission_tds > 0:
+                    if "194H" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("194H")
+                    aggregated["has_business_income"] = True
+                
+                # Property sale detection (194IA)
+                property_tds = _safe_float(tds_details.get("194IA", 0)) + _safe_float(tds_details.get("property_sale_194IA", 0))
+                if property_tds > 0:
+                    if "194IA" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("194IA")
+                    aggregated["has_capital_gains"] = True
+                
+                # Crypto detection (194S)
+                crypto_tds = _safe_float(tds_details.get("194S", 0)) + _safe_float(tds_details.get("crypto_194S", 0))
+                if crypto_tds > 0:
+                    if "194S" not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append("194S")
+                    # Estimate crypto income (1% TDS rate)
+                    estimated_crypto = crypto_tds / 0.01
+                    aggregated["crypto_income"] = max(aggregated["crypto_income"], estimated_crypto)
+                    aggregated["has_capital_gains"] = True
+            
+            # Also check for TDS sections directly in the extracted data
+            tds_sections_raw = data.get("tds_sections", [])
+            if isinstance(tds_sections_raw, list):
+                for section in tds_sections_raw:
+                    section_str = str(section).upper()
+                    if section_str not in aggregated["tds_sections"]:
+                        aggregated["tds_sections"].append(section_str)
+        
+        # === AIS DATA ===
+        elif doc_type_value == "AIS":
+            # Income details
+            aggregated["salary_income"] = max(
+                aggregated["salary_income"],
+                _safe_float(data.get("salary_income", 0)),
+                _safe_float(data.get("salary", 0))
+            )
+            
+            # Interest Income
+            interest = _safe_float(data.get("interest_income", 0))
+            if interest > 0:
+                aggregated["interest_income"] = max(aggregated["interest_income"], interest)
+                aggregated["other_income"] += interest  # Add to other income
+            
+            # Dividend Income
+            dividend = _safe_float(data.get("dividend_income", 0))
+            if dividend > 0:
+                aggregated["dividend_income"] = max(aggregated["dividend_income"], dividend)
+                aggregated["other_income"] += dividend
+            
+            # Capital Gains
+            stcg = _safe_float(data.get("capital_gains_short_term", 0))
+            ltcg = _safe_float(data.get("capital_gains_long_term", 0))
+            if stcg > 0 or ltcg > 0:
+                aggregated["capital_gains_short_term"] = max(aggregated["capital_gains_short_term"], stcg)
+                aggregated["capital_gains_long_term"] = max(aggregated["capital_gains_long_term"], ltcg)
+                aggregated["capital_gains"] = aggregated["capital_gains_short_term"] + aggregated["capital_gains_long_term"]
+                aggregated["has_capital_gains"] = True
+            
+            # LTCG under section 112A (equity/mutual funds)
+            ltcg_112a = _safe_float(data.get("capital_gains_ltcg_112a", 0))
+            if ltcg_112a == 0:
+                ltcg_112a = _safe_float(data.get("equity_ltcg", 0))
+            if ltcg_112a > 0:
+                aggregated["capital_gains_ltcg_112a"] = max(aggregated["capital_gains_ltcg_112a"], ltcg_112a)
+            
+            # Crypto/Virtual Digital Assets
+            crypto = _safe_float(data.get("crypto_income", 0))
+            if crypto == 0:
+                crypto = _safe_float(data.get("vda_income", 0))
+            if crypto > 0:
+                aggregated["crypto_income"] = max(aggregated["crypto_income"], crypto)
+                aggregated["has_capital_gains"] = True
+            
+            # Business Income
+            business = _safe_float(data.get("business_income", 0))
+            if business > 0:
+                aggregated["business_income"] = max(aggregated["business_income"], business)
+                aggregated["has_business_income"] = True
+            
+            # Professional Income
+            professional = _safe_float(data.get("professional_income", 0))
+            if professional > 0:
+                aggregated["professional_income"] = max(aggregated["professional_income"], professional)
+                aggregated["has_business_income"] = True
+            
+            # Foreign assets/income detection
+            if data.get("foreign_assets") or data.get("has_foreign_assets"):
+                aggregated["has_foreign_assets"] = True
+            if data.get("foreign_income") or data.get("has_foreign_income"):
+                aggregated["has_foreign_income"] = True
+            foreign_income_value = _safe_float(data.get("foreign_income_value", 0))
+            if foreign_income_value > 0:
+                aggregated["has_foreign_income"] = True
+            
+            # Director status
+            if data.get("is_director") or data.get("is_director_in_company"):
+                aggregated["is_director_in_company"] = True
+            
+            # Unlisted equity
+            if data.get("unlisted_equity") or data.get("has_unlisted_equity"):
+                aggregated["has_unlisted_equity"] = True
+            
+            # House property count
+            hp_count = data.get("num_house_properties", 0)
+            if hp_count > 1:
+                aggregated["num_house_properties"] = max(aggregated["num_house_properties"], hp_count)
+                aggregated["multiple_house_properties"] = True
+            if data.get("multiple_house_properties"):
+                aggregated["multiple_house_properties"] = True
+                aggregated["num_house_properties"] = max(2, aggregated["num_house_properties"])
+            
+            # Agricultural income
+            agri = _safe_float(data.get("agricultural_income", 0))
+            if agri > 0:
+                aggregated["agricultural_income"] = max(aggregated["agricultural_income"], agri)
+            
+            # Other Income
+            other = _safe_float(data.get("other_income", 0))
+            aggregated["other_income"] += other
+            
+            # TDS
+            aggregated["total_tds"] = max(
+                aggregated["total_tds"],
+                _safe_float(data.get("total_tds", 0))
+            )
+    
+    # === CALCULATE DERIVED VALUES ===
+    
+    # If salary_income is 0 but gross_salary exists, use gross_salary
+    if aggregated["salary_income"] == 0 and aggregated["gross_salary"] > 0:
+        aggregated["salary_income"] = aggregated["gross_salary"]
+    
+    # Calculate gross total income if not set
+    if aggregated["gross_total_income"] == 0:
+        aggregated["gross_total_income"] = (
+            aggregated["salary_income"] +
+            aggregated["house_property_income"] +
+            aggregated["capital_gains"] +
+            aggregated["other_income"] +
+            aggregated["business_income"] +
+            aggregated["professional_income"]
+        )
+    
+    # Ensure standard deduction has reasonable defaults for salaried
+    if aggregated["salary_income"] > 0 and aggregated["exemptions"]["standard_deduction"] == 0:
+        # Default standard deduction (FY 2024-25: Rs. 75,000, earlier: Rs. 50,000)
+        aggregated["exemptions"]["standard_deduction"] = 50000
+        aggregated["old_regime_deductions"]["Standard Deduction"] = 50000
+        print("   ℹ️ Applied default Standard Deduction: ₹50,000")
+    
+    print(f"✅ Aggregation complete:")
+    print(f"   Gross Total Income: ₹{aggregated['gross_total_income']:,.0f}")
+    print(f"   Salary Income: ₹{aggregated['salary_income']:,.0f}")
+    print(f"   Total TDS: ₹{aggregated['total_tds']:,.0f}")
+    print(f"   Deductions found: {sum(v for k, v in aggregated['old_regime_deductions'].items() if isinstance(v, (int, float)) and v > 0)}")
+    
+    # Log ITR form detection signals
+    if aggregated["tds_sections"]:
+        print(f"   TDS Sections found: {aggregated['tds_sections']}")
+    if aggregated["has_capital_gains"]:
+        print(f"   Capital Gains: ₹{aggregated['capital_gains']:,.0f}")
+    if aggregated["has_business_income"]:
+        print(f"   Business/Professional Income detected")
+    if aggregated["has_foreign_assets"]:
+        print(f"   Foreign Assets detected")
+    
+    return aggregated
+
+
+def _safe_float(value) -> float:
+    """Safely convert value to float"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            # Remove commas and currency symbols
+            cleaned = value.replace(',', '').replace('₹', '').replace('Rs.', '').replace('Rs', '').strip()
+            return float(cleaned)
+        except ValueError:
+            return 0.0
+    return 0.0
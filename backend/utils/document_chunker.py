@@ -0,0 +1,179 @@
+"""
+Document Chunker for RAG Indexing
+Groups extracted document fields (Form 16, 26AS, AIS) into a few semantic sections
+(salary breakup, exemptions, Chapter VI-A, TDS ...) instead of one chunk per JSON leaf.
+Zero / empty values and internal extraction metadata are skipped.
+"""
+import re
+from typing import Dict, Any, List, Tuple
+
+# Keys that only describe the extraction itself
+INTERNAL_KEYS = {
+    "all_pans_found", "all_names_found", "extraction_confidence", "extraction_method",
+    "raw_text", "text_content", "verification_data",
+    # Row-level table records, present in documents extracted by earlier versions
+    "tds_transactions", "ais_transactions",
+}
+
+# Sections in display order: (section id, title, top-level keys)
+SECTIONS: List[Tuple[str, str, List[str]]] = [
+    ("identity", "Taxpayer Details", [
+        "name", "pan", "financial_year", "assessment_year", "document_type",
+        "employer_name", "employer_tan",
+    ]),
+    ("salary", "Salary Breakup", [
+        "gross_salary", "salary_income", "basic_salary", "hra_received", "special_allowance",
+        "lta", "bonus", "perquisites", "profits_in_lieu_of_salary", "net_salary",
+    ]),
+    ("exemptions", "Exemptions (Section 10 / 16)", ["exemptions"]),
+    ("income", "Other Income & Gross Total Income", [
+        "income_from_house_property", "rental_income", "income_from_other_sources", "interest_income",
+        "dividend_income", "capital_gains_short_term", "capital_gains_long_term", "business_income",
+        "other_income", "gross_total_income",
+    ]),
+    ("deductions", "Chapter VI-A Deductions", ["deductions"]),
+    ("tax_computation", "Tax Computation", [
+        "total_income", "net_taxable_income", "tax_on_total_income", "rebate_87a", "surcharge",
+        "cess", "total_tax_liability", "relief_89", "tax_payable", "refund_due",
+    ]),
+    ("tds", "TDS & Taxes Paid", [
+        "total_tds", "total_tax_deducted", "tds_on_salary", "tds_on_interest", "tds_on_other",
+        "tds_on_other_income", "tds_details", "tds_by_deductor", "advance_tax_paid",
+        "self_assessment_tax", "refund_received",
+    ]),
+]
+
+# Readable labels for common keys
+LABELS = {
+    "pan": "PAN",
+    "employer_tan": "Employer TAN",
+    "hra_received": "HRA Received",
+    "hra_exemption": "HRA Exemption",
+    "lta": "LTA",
+    "lta_exemption": "LTA Exemption",
+    "rebate_87a": "Rebate u/s 87A",
+    "relief_89": "Relief u/s 89",
+    "tds_on_salary": "TDS on Salary",
+    "tds_on_interest": "TDS on Interest",
+    "tds_on_other": "TDS on Other Income",
+    "tds_on_other_income": "TDS on Other Income",
+    "total_tds": "Total TDS",
+    "24b_home_loan_interest": "Section 24(b) Home Loan Interest",
+    "ppf": "PPF",
+    "epf": "EPF",
+    "elss": "ELSS",
+    "nsc": "NSC",
+    "other_80c": "Other 80C",
+    "tds_by_deductor": "TDS by Deductor",
+    "tds_deducted": "TDS Deducted",
+    "deductor_tan": "TAN",
+    "salary_192": "Salary (192)",
+    "dividend_194": "Dividend (194)",
+}
+
+# Split a section into several chunks beyond this many lines
+MAX_LINES_PER_CHUNK = 15
+
+
+def _label(key: str) -> str:
+    if key in LABELS:
+        return LABELS[key]
+    # 80C -> Section 80C, 80CCD_1B -> Section 80CCD(1B), 80C_details -> Section 80C Details
+    match = re.match(r"^(\d{2}[A-Z]+)(?:_(\d[A-Z]?))?(?:_(.*))?$", key)
+    if match:
+        section, sub, rest = match.groups()
+        label = f"Section {section}" + (f"({sub})" if sub else "")
+        return f"{label} {rest.replace('_', ' ').title()}" if rest else label
+    return key.replace("_", " ").strip().title()
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return value == 0
+    if isinstance(value, str):
+        return value.strip() in ("", "0", "0.0", "None", "null")
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"₹{value:,}" if isinstance(value, int) else f"₹{value:,.2f}"
+    return str(value)
+
+
+def _field_lines(key: str, value: Any, prefix: str = "", depth: int = 0) -> List[str]:
+    """Render a field (possibly nested) as 'Label: value' lines, skipping empty values"""
+    if key in INTERNAL_KEYS or key.startswith("_") or _is_empty(value):
+        return []
+
+    label = f"{prefix}{_label(key)}"
+    if isinstance(value, dict):
+        # Top-level groups (exemptions, deductions) list their fields as-is;
+        # nested breakups are prefixed with their parent, e.g. "Section 80C - PPF"
+        if depth == 0:
+            child_prefix = ""
+        elif key.endswith("_details"):
+            child_prefix = f"{prefix}{_label(key[:-len('_details')])} - "
+        else:
+            child_prefix = f"{label} - "
+        lines = []
+        for sub_key, sub_value in value.items():
+            lines.extend(_field_lines(sub_key, sub_value, child_prefix, depth + 1))
+        return lines
+    if isinstance(value, list):
+        if all(not isinstance(v, (dict, list)) for v in value):
+            return [f"{label}: {', '.join(str(v) for v in value)}"]
+        lines = []
+        for item in value:
+            if isinstance(item, dict):
+                parts = [f"{_label(k)} {_format_value(v)}" for k, v in item.items() if not _is_empty(v)]
+                if parts:
+                    lines.append(f"{label}: " + ", ".join(parts))
+        return lines
+    return [f"{label}: {_format_value(value)}"]
+
+
+def build_document_chunks(doc_type: str, financial_year: str, data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Build section-level chunks for one document.
+
+    Returns: list of {"section": section id, "text": chunk text}
+    """
+    data = data or {}
+    chunks: List[Dict[str, str]] = []
+    used = set()
+
+    def emit(section_id: str, title: str, lines: List[str]):
+        for part, start in enumerate(range(0, len(lines), MAX_LINES_PER_CHUNK)):
+            body = "\n".join(lines[start:start + MAX_LINES_PER_CHUNK])
+            chunks.append({
+                "section": section_id if part == 0 else f"{section_id}_{part + 1}",
+                "text": f"{doc_type} ({financial_year}) - {title}:\n{body}",
+            })
+
+    for section_id, title, keys in SECTIONS:
+        lines: List[str] = []
+        for key in keys:
+            if key in data:
+                used.add(key)
+                lines.extend(_field_lines(key, data[key]))
+        if lines:
+            emit(section_id, title, lines)
+
+    # Anything not covered above (e.g. extra AI-extracted fields)
+    other_lines: List[str] = []
+    for key, value in data.items():
+        if key not in used:
+            other_lines.extend(_field_lines(key, value))
+    if other_lines:
+        emit("other", "Other Details", other_lines)
+
+    return chunks
@@ -0,0 +1,371 @@
+"""
+Extraction Pattern Registry
+Regex patterns used by SmartExtractor, grouped per document type and field.
+Patterns are compiled once (lazily, on first use) and shared across all extractions,
+so no per-document compile / re module cache lookups are needed.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Pattern, Tuple
+
+from utils.pattern_scanner import AnchorScanner
+
+# ==========================================
+# Form 16 (Part A + Part B)
+# ==========================================
+# group -> field -> patterns (in priority order)
+FORM16_PATTERNS: Dict[str, Dict[str, List[str]]] = {
+    "salary": {
+        'gross_salary': [
+            # Label-to-amount spans are bounded (.{0,200}?): an unbounded .*? rescans the
+            # rest of the document at every label occurrence on digit-free OCR noise
+            r'GROSS\s+SALARY\s*[\(\[]?.{0,200}?[\)\]]?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'SALARY\s+AS\s+PER\s+.{0,200}?SECTION\s+17\s*\(?\s*1\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'1\.\s*GROSS\s+SALARY\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'basic_salary': [
+            r'BASIC\s+(?:SALARY|PAY)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'BASIC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'hra_received': [
+            r'HOUSE\s+RENT\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'HRA\s+RECEIVED\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'HRA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'special_allowance': [
+            r'SPECIAL\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'OTHER\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'lta': [
+            r'LEAVE\s+TRAVEL\s+(?:ALLOWANCE|CONCESSION)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'LTA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'LTC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'bonus': [
+            r'BONUS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'PERFORMANCE\s+BONUS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'perquisites': [
+            r'PERQUISITES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'VALUE\s+OF\s+PERQUISITES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'17\s*\(?\s*2\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'profits_in_lieu_of_salary': [
+            r'PROFITS\s+IN\s+LIEU\s+OF\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'17\s*\(?\s*3\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+    "exemptions": {
+        'hra_exemption': [
+            r'(?:ALLOWANCE|HRA)\s+(?:EXEMPT|EXEMPTION)\s*(?:U/?S\s*10)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'10\s*\(?\s*13A\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'HRA\s+EXEMPTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'lta_exemption': [
+            r'(?:LTA|LTC)\s+EXEMPTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'10\s*\(?\s*5\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'standard_deduction': [
+            r'STANDARD\s+DEDUCTION\s*(?:U/?S\s*16\s*\(?\s*IA?\s*\)?)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'DEDUCTION\s+U/?S\s+16\s*\(?\s*IA?\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'16\s*\(?\s*IA?\s*\)?\s*STANDARD\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'professional_tax': [
+            r'PROFESSIONAL\s+TAX\s*(?:U/?S\s*16\s*\(?\s*III?\s*\)?)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TAX\s+ON\s+EMPLOYMENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'16\s*\(?\s*III?\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'entertainment_allowance': [
+            r'ENTERTAINMENT\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'16\s*\(?\s*II\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'total_exemptions': [
+            r'TOTAL\s+(?:EXEMPTIONS?|DEDUCTIONS?\s+UNDER\s+16)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s*\(?\s*B\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+    "deductions": {
+        '80C': [
+            r'(?:DEDUCTION|DEDN)\s+(?:U/?S|UNDER\s+SECTION)\s*80\s*C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'80\s*C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'SECTION\s+80C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80CCC': [
+            r'80\s*CCC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'PENSION\s+FUND\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80CCD_1': [
+            r'80\s*CCD\s*\(?\s*1\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'EMPLOYEE\s+(?:NPS|PENSION)\s+CONTRIBUTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80CCD_1B': [
+            r'80\s*CCD\s*\(?\s*1B\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'ADDITIONAL\s+NPS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80CCD_2': [
+            r'80\s*CCD\s*\(?\s*2\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'EMPLOYER\s+(?:NPS|PENSION)\s+CONTRIBUTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80D': [
+            r'80\s*D\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'(?:MEDICAL|HEALTH)\s+INSURANCE\s+PREMIUM\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80DD': [
+            r'80\s*DD\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'DISABLED\s+DEPENDENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80DDB': [
+            r'80\s*DDB\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'MEDICAL\s+TREATMENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80E': [
+            r'80\s*E\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'EDUCATION\s+LOAN\s+INTEREST\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80EE': [
+            r'80\s*EE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80EEA': [
+            r'80\s*EEA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80G': [
+            r'80\s*G\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'DONATIONS?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80GG': [
+            r'80\s*GG\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'RENT\s+PAID\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80TTA': [
+            r'80\s*TTA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'SAVINGS\s+(?:ACCOUNT\s+)?INTEREST\s+DEDUCTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80TTB': [
+            r'80\s*TTB\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '80U': [
+            r'80\s*U\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'DISABILITY\s+DEDUCTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        '24b_home_loan_interest': [
+            r'(?:SECTION\s+)?24\s*\(?\s*B?\s*\)?\s*(?:HOME\s+LOAN\s+)?INTEREST\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'INTEREST\s+ON\s+(?:HOUSING|HOME)\s+LOAN\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'HOUSE\s+PROPERTY\s+LOSS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'total_deductions': [
+            r'TOTAL\s+DEDUCTION\s+UNDER\s+CHAPTER\s+VI[\-\s]?A\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'AGGREGATE\s+OF\s+DEDUCTIONS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s+DEDUCTIONS?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+    "income": {
+        'gross_total_income': [
+            r'GROSS\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s+GROSS\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'total_income': [
+            r'TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'NET\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'net_taxable_income': [
+            r'NET\s+TAXABLE\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TAXABLE\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'income_from_house_property': [
+            r'INCOME\s+(?:FROM\s+)?HOUSE\s+PROPERTY\s*[:\-]?\s*(?:RS?\.?\s*)?\(?([0-9,]+(?:\.\d{2})?)\)?',
+            r'LOSS\s+FROM\s+HOUSE\s+PROPERTY\s*[:\-]?\s*(?:RS?\.?\s*)?\(?([0-9,]+(?:\.\d{2})?)\)?',
+        ],
+        'income_from_other_sources': [
+            r'INCOME\s+FROM\s+OTHER\s+SOURCES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+    "tax": {
+        'tax_on_total_income': [
+            r'TAX\s+ON\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'INCOME\s+TAX\s+COMPUTED\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'rebate_87a': [
+            r'REBATE\s+(?:U/?S|UNDER\s+SECTION)?\s*87\s*A?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'surcharge': [
+            r'SURCHARGE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'cess': [
+            r'(?:HEALTH\s+(?:AND|&)\s+EDUCATION\s+)?CESS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'H\s*&?\s*E\s*CESS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'total_tax_liability': [
+            r'TOTAL\s+TAX\s+(?:LIABILITY|PAYABLE)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TAX\s+PAYABLE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'relief_89': [
+            r'RELIEF\s+(?:U/?S|UNDER\s+SECTION)?\s*89\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+    "tds": {
+        'total_tds': [
+            r'TOTAL\s+(?:TAX\s+)?(?:TDS\s+)?DEDUCTED\s*(?:AT\s+SOURCE)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TDS\s+(?:ON\s+SALARY)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+            r'TAX\s+DEDUCTED\s+AT\s+SOURCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'tds_on_salary': [
+            r'TDS\s+ON\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'advance_tax_paid': [
+            r'ADVANCE\s+TAX\s+(?:PAID)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'self_assessment_tax': [
+            r'SELF\s+ASSESSMENT\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+}
+
+# Where each Form 16 group is stored in the result dict (None = top level)
+FORM16_GROUP_TARGETS: Dict[str, str] = {
+    "salary": None,
+    "exemptions": "exemptions",
+    "deductions": "deductions",
+    "income": None,
+    "tax": None,
+    "tds": None,
+}
+
+# Label patterns for contextual (OCR noise tolerant) fallbacks: field -> labels
+FORM16_CONTEXT_LABELS: Dict[str, List[str]] = {
+    "gross_total_income": [
+        r'GROSS\s+TOTAL\s+INCOME',
+        r'TOTAL\s+INCOME\s*\(\s*6\s*\+\s*8\s*\)',
+        r'NET\s+TAXABLE\s+INCOME',
+    ],
+    "gross_salary": [
+        r'GROSS\s+SALARY',
+        r'SALARY\s+AS\s+PER',
+        r'TOTAL\s+SALARY',
+    ],
+    "total_income": [
+        r'TOTAL\s+INCOME',
+        r'INCOME\s+CHARGEABLE\s+UNDER\s+THE\s+HEAD\s+SALARIES',
+    ],
+    "total_tds": [
+        r'LESS\s*[:\-]?\s*TAX\s+DEDUCTED\s+AT\s+SOURCE',
+        r'NET\s+TAX\s+PAYABLE',
+        r'TOTAL\s+AMOUNT\s+OF\s+TAX\s+DEDUCTED',
+        r'TOTAL\s+TAX\s+LIABILITY',
+    ],
+}
+
+# ==========================================
+# Form 26AS
+# ==========================================
+FORM26AS_PATTERNS: Dict[str, Dict[str, List[str]]] = {
+    "tds": {
+        'advance_tax_paid': [
+            r'ADVANCE\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+        'self_assessment_tax': [
+            r'SELF\s+ASSESSMENT\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+}
+
+# ==========================================
+# Generic / unknown documents
+# ==========================================
+GENERIC_PATTERNS: Dict[str, Dict[str, List[str]]] = {
+    "amounts": {
+        'gross_salary': [
+            r'GROSS\s+SALARY\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s+GROSS\s+SALARY\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
+        ],
+        'tax_deducted': [
+            r'TAX\s+DEDUCTED\s+AT\s+SOURCE\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
+            r'TOTAL\s+TAX\s+DEDUCTED\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
+            r'TDS\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
+        ],
+    },
+}
+
+_REGISTRY: Dict[str, Dict[str, Dict[str, List[str]]]] = {
+    "form16": FORM16_PATTERNS,
+    "form16_context": {"labels": FORM16_CONTEXT_LABELS},
+    "form26as": FORM26AS_PATTERNS,
+    "generic": GENERIC_PATTERNS,
+}
+
+# ==========================================
+# Identity / misc patterns (compiled at import)
+# ==========================================
+# Same flags as the original re.search calls (text is already upper-cased)
+AY_PATTERNS: Tuple[Pattern, ...] = tuple(re.compile(p) for p in [
+    r'ASSESSMENT\s+YEAR\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
+    r'A\.?Y\.?\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
+    r'AY\s*(\d{4})\s*-\s*(\d{2})',
+])
+
+FY_PATTERNS: Tuple[Pattern, ...] = tuple(re.compile(p) for p in [
+    r'F\.?Y\.?\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',  # F.Y. 2024-25
+    r'FINANCIAL\s+YEAR\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
+])
+
+NAME_PATTERNS: Tuple[Pattern, ...] = tuple(re.compile(p) for p in [
+    r'NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
+    r'EMPLOYEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
+    r'ASSESSEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
+    r'DEDUCTEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
+    r'MR\.\s+([A-Z][A-Z\s\.]{2,50})',
+    r'MRS\.\s+([A-Z][A-Z\s\.]{2,50})',
+    r'MS\.\s+([A-Z][A-Z\s\.]{2,50})',
+])
+
+# Name patterns used in the window around the PAN
+NAME_NEAR_PAN_PATTERNS: Tuple[Pattern, ...] = NAME_PATTERNS[:2]
+
+EMPLOYER_PATTERNS: Tuple[Pattern, ...] = tuple(re.compile(p) for p in [
+    r'EMPLOYER\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
+    r'DEDUCTOR\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
+    r'NAME\s+OF\s+EMPLOYER\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
+])
+
+# TAN format: 4 letters + 5 digits + 1 letter (e.g., ABCD12345E)
+TAN_PATTERN: Pattern = re.compile(r'\b[A-Z]{4}\d{5}[A-Z]\b')
+
+# Contextual amount candidates (Indian / western grouping or 4+ plain digits)
+CONTEXT_NUMBER_PATTERN: Pattern = re.compile(r'(?<![A-Z0-9])(?:\d{1,3}(?:,\d{2,3})+|\d{4,})(?:\.\d{2})?')
+
+# Line-level patterns for tabular 26AS / AIS text
+LINE_TAN_PATTERN: Pattern = re.compile(r'^[A-Z]{4}\d{5}[A-Z]$')  # e.g., PNEF01495E
+LINE_AMOUNT_PATTERN: Pattern = re.compile(r'^(\d+(?:\.\d{2})?)$')  # e.g., 1069432.00
+LINE_LARGE_AMOUNT_5_PATTERN: Pattern = re.compile(r'^(\d{5,}(?:\.\d{2})?)$')
+LINE_LARGE_AMOUNT_6_PATTERN: Pattern = re.compile(r'^(\d{6,}(?:\.\d{2})?)$')
+LINE_LARGE_AMOUNT_4_PATTERN: Pattern = re.compile(r'^(\d{4,}(?:\.\d{2})?)$')
+LINE_GROUPED_AMOUNT_PATTERN: Pattern = re.compile(r'^[\d,]+$')  # e.g., 10,69,432
+
+
+@lru_cache(maxsize=None)
+def get_compiled_patterns(doc_type: str) -> Dict[str, Dict[str, Tuple[Pattern, ...]]]:
+    """
+    Compiled patterns for a document type: group -> field -> compiled patterns.
+    Compiled on first use and cached for the life of the process.
+    """
+    groups = _REGISTRY.get(doc_type)
+    if groups is None:
+        raise KeyError(f"Unknown pattern registry: {doc_type}")
+    return {
+        group: {
+            field: tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+            for field, patterns in fields.items()
+        }
+        for group, fields in groups.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def get_scanner(doc_type: str) -> AnchorScanner:
+    """Single-pass anchor scanner over all field patterns of a document type"""
+    return AnchorScanner(
+        pattern
+        for fields in get_compiled_patterns(doc_type).values()
+        for patterns in fields.values()
+        for pattern in patterns
+    )
@@ -0,0 +1,238 @@
+"""
+Typed Extraction Records
+Fixed-layout __slots__ records for SmartExtractor output (Form 16 / Form 26AS / AIS)
+instead of large nested dicts pre-filled with zeros.
+
+Records behave like dicts (result['gross_salary'], result.get(...), result['deductions']['80C'])
+so extraction code reads the same, and serialise sparsely with to_dict(): zero, empty
+and None values are left out. This keeps Document.extracted_data rows small and makes
+the later dict merges (pattern + AI + tables, verification + extraction) cheaper.
+Keys the record does not declare (e.g. merged AI fields) are kept in a small overflow dict.
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+def _attribute(key: str) -> str:
+    """Slot name for a field key ('80C' -> 'f_80C', 'gross_salary' -> 'gross_salary')"""
+    return key if key.isidentifier() else f"f_{key}"
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return value == 0
+    if isinstance(value, (str, list, tuple, dict, SlotRecord)):
+        return len(value) == 0
+    return False
+
+
+class SlotRecord(MutableMapping):
+    """
+    Base record. Subclasses list their fields in FIELDS as (key, default) pairs;
+    a callable default is a factory (lists, nested records).
+    """
+    __slots__ = ("_extra",)
+    FIELDS: Tuple[Tuple[str, Any], ...] = ()
+    _ATTRIBUTES: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._ATTRIBUTES = {key: _attribute(key) for key, _ in cls.FIELDS}
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._extra: Optional[Dict[str, Any]] = None
+        for key, default in self.FIELDS:
+            object.__setattr__(self, self._ATTRIBUTES[key], default() if callable(default) else default)
+        if data:
+            self.update(data)
+
+    # ------------------------------------------------------------------
+    # Mapping protocol
+    # ------------------------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        current = getattr(self, attribute)
+        if isinstance(current, SlotRecord) and isinstance(value, dict):
+            # Keep nested records typed when a plain dict is assigned
+            value = type(current)(value)
+        setattr(self, attribute, value)
+
+    def __delitem__(self, key: str):
+        if key in self._ATTRIBUTES:
+            default = dict(self.FIELDS)[key]
+            setattr(self, self._ATTRIBUTES[key], default() if callable(default) else default)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._ATTRIBUTES
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._ATTRIBUTES) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ATTRIBUTES or (self._extra is not None and key in self._extra)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+    def to_dict(self, sparse: bool = True) -> Dict[str, Any]:
+        """Plain dict (JSON-ready). sparse=True omits zero / empty / None values."""
+        out: Dict[str, Any] = {}
+        for key, attribute in self._ATTRIBUTES.items():
+            value = getattr(self, attribute)
+            if isinstance(value, SlotRecord):
+                value = value.to_dict(sparse)
+            if sparse and _is_empty(value):
+                continue
+            out[key] = value
+        if self._extra:
+            for key, value in self._extra.items():
+                if isinstance(value, SlotRecord):
+                    value = value.to_dict(sparse)
+                if sparse and _is_empty(value):
+                    continue
+                out[key] = value
+        return out
+
+
+def _float_fields(*keys: str) -> Tuple[Tuple[str, float], ...]:
+    return tuple((key, 0.0) for key in keys)
+
+
+# ==========================================
+# Nested groups
+# ==========================================
+
+class ExemptionsRecord(SlotRecord):
+    """Section 10 / 16 exemptions"""
+    __slots__ = tuple(_attribute(k) for k in (
+        "hra_exemption", "lta_exemption", "standard_deduction", "professional_tax",
+        "entertainment_allowance", "other_exemptions", "total_exemptions",
+    ))
+    FIELDS = _float_fields(
+        "hra_exemption", "lta_exemption", "standard_deduction", "professional_tax",
+        "entertainment_allowance", "other_exemptions", "total_exemptions",
+    )
+
+
+class Section80CDetails(SlotRecord):
+    """Breakup of the 80C limit"""
+    __slots__ = (
+        "ppf", "epf", "elss", "life_insurance", "nsc", "tuition_fees",
+        "home_loan_principal", "sukanya_samriddhi", "tax_saving_fd", "other_80c",
+    )
+    FIELDS = _float_fields(*__slots__)
+
+
+class Section80DDetails(SlotRecord):
+    """Breakup of the 80D health insurance deduction"""
+    __slots__ = ("self_family", "parents", "preventive_health_checkup")
+    FIELDS = _float_fields(*__slots__)
+
+
+_DEDUCTION_KEYS = (
+    "80C", "80CCC", "80CCD_1", "80CCD_1B", "80CCD_2", "80D", "80DD", "80DDB", "80E",
+    "80EE", "80EEA", "80G", "80GG", "80GGA", "80GGC", "80TTA", "80TTB", "80U",
+    "24b_home_loan_interest", "total_deductions",
+)
+
+
+class DeductionsRecord(SlotRecord):
+    """Chapter VI-A deductions (+ 24(b) interest)"""
+    __slots__ = tuple(_attribute(k) for k in _DEDUCTION_KEYS + ("80C_details", "80D_details"))
+    FIELDS = (
+        ("80C", 0.0),
+        ("80C_details", Section80CDetails),
+        *_float_fields("80CCC", "80CCD_1", "80CCD_1B", "80CCD_2", "80D"),
+        ("80D_details", Section80DDetails),
+        *_float_fields(*_DEDUCTION_KEYS[6:]),
+    )
+
+
+# ==========================================
+# Document result
+# ==========================================
+
+_IDENTITY_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    ("pan", None),
+    ("name", None),
+    ("financial_year", None),
+    ("assessment_year", None),
+    ("document_type", None),
+    ("employer_name", None),
+    ("employer_tan", None),
+    ("all_pans_found", list),
+    ("all_names_found", list),
+)
+
+_SALARY_KEYS = (
+    "gross_salary", "basic_salary", "hra_received", "special_allowance", "lta", "bonus",
+    "perquisites", "profits_in_lieu_of_salary",
+)
+_INCOME_KEYS = (
+    "net_salary", "income_from_house_property", "income_from_other_sources", "interest_income",
+    "dividend_income", "capital_gains_short_term", "capital_gains_long_term", "business_income",
+    "gross_total_income",
+)
+_TAX_KEYS = (
+    "total_income", "net_taxable_income", "tax_on_total_income", "rebate_87a", "surcharge",
+    "cess", "total_tax_liability", "total_tds", "total_tax_deducted", "tds_on_salary",
+    "tds_on_other_income", "advance_tax_paid", "self_assessment_tax", "relief_89",
+    "tax_payable", "refund_due",
+)
+
+
+class ExtractionResult(SlotRecord):
+    """
+    SmartExtractor output for one document (Form 16, Form 26AS or AIS).
+    26AS / AIS only fill the income and TDS fields; the rest stay at their
+    defaults and are dropped by to_dict().
+    """
+    __slots__ = tuple(
+        _attribute(k) for k in
+        [key for key, _ in _IDENTITY_FIELDS] + list(_SALARY_KEYS) + ["exemptions"] + list(_INCOME_KEYS)
+        + ["deductions"] + list(_TAX_KEYS) + ["extraction_confidence", "extraction_method"]
+    )
+    FIELDS = (
+        *_IDENTITY_FIELDS,
+        *_float_fields(*_SALARY_KEYS),
+        ("exemptions", ExemptionsRecord),
+        *_float_fields(*_INCOME_KEYS),
+        ("deductions", DeductionsRecord),
+        *_float_fields(*_TAX_KEYS),
+        ("extraction_confidence", 0.0),
+        ("extraction_method", list),
+    )
@@ -0,0 +1,26 @@
+"""
+Tax Input Fingerprint
+Hash of everything a stored tax computation depends on. The tax router, the bulk
+recompute job and the what-if simulator compare it to skip work whose inputs have
+not changed.
+"""
+import hashlib
+import json
+from typing import Any, Sequence
+
+# Bumped when the same inputs start giving different results
+# (2: age taken as on 31 March of the FY instead of today)
+FINGERPRINT_VERSION = 2
+
+
+def input_fingerprint(documents: Sequence[Any], date_of_birth: Any, rules_fingerprint: str) -> str:
+    """
+    Hash of everything a tax computation depends on: each document's extracted_data,
+    the user's DOB and the rules content. Equal fingerprints give equal results.
+    """
+    digest = hashlib.sha256(f"v{FINGERPRINT_VERSION};".encode())
+    for doc in sorted(documents, key=lambda d: d.id):
+        data = json.dumps(doc.extracted_data or {}, sort_keys=True, default=str)
+        digest.update(f"{doc.id}:{hashlib.sha256(data.encode()).hexdigest()};".encode())
+    digest.update(f"dob:{date_of_birth};rules:{rules_fingerprint}".encode())
+    return digest.hexdigest()
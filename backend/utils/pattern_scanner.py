@@ -0,0 +1,262 @@
+"""
+Single-Pass Anchor Scanner
+Finds where field patterns can possibly match with ONE pass over the text, then
+tries each pattern only at those positions instead of scanning the full text per pattern.
+
+Every field pattern starts with a literal label (e.g. GROSS\\s+SALARY..., 80\\s*C...,
+(?:LTA|LTC)\\s+EXEMPTION...). That leading literal is its "anchor": a match can only
+start where an anchor occurs. One alternation over all anchors records
+those positions, and pattern.match() at the candidate positions in order gives the
+same leftmost match as pattern.search(). Patterns without a derivable anchor
+fall back to a plain search.
+
+The anchors are compiled into a trie-shaped regex (common prefixes factored out,
+longest anchor wins) and searched from each hit's start + 1, so overlapping anchors
+are still all recorded while the engine only branches on matching characters.
+
+PageIndex maps those anchor positions to the "=== PAGE N ===" pages of the text, so a
+field group can be searched only on the pages where its labels actually occur.
+"""
+import re
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Match
+
+# Escaped characters that stand for themselves
+_LITERAL_ESCAPES = set(".()[]-/:&+,")
+
+
+def _literal_prefix(source: str) -> str:
+    """Longest required literal prefix of a regex source (stops at any metachar/class)"""
+    out: List[str] = []
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            if i + 1 < len(source) and source[i + 1] in _LITERAL_ESCAPES:
+                literal, step = source[i + 1], 2
+            else:
+                break  # \s, \d, \b ... are not literals
+        elif char.isalnum() or char in "/&,:-_":
+            literal, step = char, 1
+        else:
+            break
+
+        following = source[i + step] if i + step < len(source) else ""
+        if following in ("?", "*", "{"):
+            break  # optional / repeated char is not a required prefix
+        out.append(literal)
+        if following == "+":
+            break
+        i += step
+    return "".join(out)
+
+
+def _has_top_level_alternation(source: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def derive_anchors(source: str) -> Optional[Tuple[str, ...]]:
+    """
+    Literal anchors for a pattern: one of them must occur where a match starts.
+    Returns None when no safe anchor can be derived.
+    """
+    if _has_top_level_alternation(source):
+        return None
+
+    if source.startswith("(?:"):
+        close = source.find(")")
+        inner = source[3:close]
+        if close == -1 or "(" in inner or "[" in inner:
+            return None
+        if source[close + 1:close + 2] in ("?", "*", "{"):
+            return None  # optional leading group
+        anchors = []
+        for alternative in inner.split("|"):
+            literal = _literal_prefix(alternative)
+            if not literal:
+                return None
+            anchors.append(literal.upper())
+        return tuple(anchors)
+
+    if source.startswith("("):
+        return None  # lookarounds / capturing groups
+
+    literal = _literal_prefix(source)
+    return (literal.upper(),) if literal else None
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex source matching any of the words, factored as a trie (greedy = longest)"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Page separators written by pdf_processor (kept by whitespace normalisation)
+PAGE_MARKER = re.compile(r'=== PAGE \d+ ===')
+
+# (start, end) offsets of a run of pages
+Span = Tuple[int, int]
+
+
+class PageIndex:
+    """Offsets of the pages of a text joined with '=== PAGE N ===' markers"""
+
+    def __init__(self, text: str):
+        self.length = len(text)
+        self.starts: List[int] = [0]
+        for marker in PAGE_MARKER.finditer(text):
+            if marker.start() == 0:
+                continue
+            self.starts.append(marker.start())
+
+    @property
+    def page_count(self) -> int:
+        return len(self.starts)
+
+    def page_at(self, position: int) -> int:
+        """0-based page containing an offset"""
+        return bisect_right(self.starts, position) - 1
+
+    def spans(self, pages: Iterable[int]) -> List[Span]:
+        """Offsets covering the given pages, adjacent pages merged, in text order"""
+        spans: List[Span] = []
+        for page in sorted(set(pages)):
+            start = self.starts[page]
+            end = self.starts[page + 1] if page + 1 < len(self.starts) else self.length
+            if spans and spans[-1][1] == start:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+        return spans
+
+
+class AnchorIndex:
+    """Anchor positions found in one text; answers pattern searches from them"""
+
+    def __init__(self, text: str, positions: Dict[str, List[int]], scanner: "AnchorScanner"):
+        self.text = text
+        self._positions = positions
+        self._scanner = scanner
+
+    def candidates(self, pattern: Pattern) -> Optional[List[int]]:
+        anchors = self._scanner.anchors_for(pattern)
+        if anchors is None:
+            return None
+        if len(anchors) == 1:
+            return self._positions.get(anchors[0], [])
+        merged = set()
+        for anchor in anchors:
+            merged.update(self._positions.get(anchor, ()))
+        return sorted(merged)
+
+    def pages_for(self, patterns: Iterable[Pattern], page_index: PageIndex) -> set:
+        """Pages on which any of the patterns' anchors occur"""
+        pages = set()
+        for pattern in patterns:
+            for position in self.candidates(pattern) or ():
+                pages.add(page_index.page_at(position))
+        return pages
+
+    def search(self, pattern: Pattern, deadline: Optional[float] = None,
+               spans: Optional[List[Span]] = None) -> Optional[Match]:
+        """
+        Equivalent of pattern.search(text), trying only anchor positions.
+        With spans, only matches starting inside those (start, end) ranges are
+        considered; patterns without anchors are searched within the spans only.
+        With a deadline (time.perf_counter() value) the remaining positions are
+        given up once it has passed.
+        """
+        positions = self.candidates(pattern)
+        if positions is None:
+            if spans is None:
+                return pattern.search(self.text)
+            for start, end in spans:
+                match = pattern.search(self.text, start, end)
+                if match:
+                    return match
+            return None
+        if spans is not None:
+            positions = [p for p in positions if any(start <= p < end for start, end in spans)]
+        for position in positions:
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            match = pattern.match(self.text, position)
+            if match:
+                return match
+        return None
+
+
+class AnchorScanner:
+    """Built once per pattern set; index(text) runs the single scanning pass"""
+
+    def __init__(self, patterns: Iterable[Pattern]):
+        self._anchors: Dict[Pattern, Optional[Tuple[str, ...]]] = {}
+        for pattern in patterns:
+            self._anchors[pattern] = derive_anchors(pattern.pattern)
+
+        all_anchors = sorted(
+            {a for anchors in self._anchors.values() if anchors for a in anchors},
+            key=lambda a: (-len(a), a)
+        )
+        # The alternation reports only the longest anchor at a position,
+        # so also credit the shorter anchors that are prefixes of it
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            anchor: tuple(other for other in all_anchors if other != anchor and anchor.startswith(other))
+            for anchor in all_anchors
+        }
+        source = _trie_regex(all_anchors) if all_anchors else None
+        # Anchors are upper case; upper-cased text (SmartExtractor) takes the exact-case scan
+        self._scan = re.compile(source) if source else None
+        self._scan_ignorecase = re.compile(source, re.IGNORECASE) if source else None
+
+    def anchors_for(self, pattern: Pattern) -> Optional[Tuple[str, ...]]:
+        # Patterns outside this scanner's set were not part of the scan: plain search
+        return self._anchors.get(pattern)
+
+    def index(self, text: str) -> AnchorIndex:
+        positions: Dict[str, List[int]] = defaultdict(list)
+        if self._scan is not None:
+            search = (self._scan if text.isupper() else self._scan_ignorecase).search
+            match = search(text)
+            while match:
+                start = match.start()
+                anchor = match.group().upper()
+                positions[anchor].append(start)
+                for prefix in self._prefixes[anchor]:
+                    positions[prefix].append(start)
+                match = search(text, start + 1)
+        return AnchorIndex(text, positions, self)
@@ -1,12 +1,16 @@
 import re
 import fitz  # PyMuPDF
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
 from models import DocType
 from utils.ollama_client import extract_data_with_ai
 from utils.text_cleaner import (
-    extract_all_pans
+    extract_all_pans,
+    extract_document_type,
+    find_nearest_name_around_pan,
+    pick_fy
 )
 from utils.smart_extractor import extract_with_smart_extractor
+from utils.table_extractor import extract_transaction_tables
 
 # Try to import OCR (optional - fallback if not installed)
 try:
@@ -17,6 +21,24 @@ except ImportError:
     print("=== WARNING: OCR not available. Install pytesseract and pdf2image for scanned PDF support ===")
 
 
+IDENTITY_FIELDS = frozenset({"pan", "doc_type", "name", "fy"})
+
+
+def _identity_fields_on_page(page_text: str, page_upper: str, expected_fy: str = None,
+                             doc_type: DocType = None) -> Set[str]:
+    """Which of PAN, document type, name and FY appear on one page"""
+    found = set()
+    if extract_all_pans(page_text, text_upper=page_upper):
+        found.add("pan")
+    if extract_document_type(page_text, text_upper=page_upper):
+        found.add("doc_type")
+    if find_nearest_name_around_pan(page_text, ''):
+        found.add("name")
+    if pick_fy(page_text, expected_fy, doc_type.value if doc_type else None):
+        found.add("fy")
+    return found
+
+
 async def verify_document(file_path: str, user_name: str, user_pan: str, doc_type: DocType,
                           expected_fy: str = None) -> Dict[str, Any]:
     """
@@ -89,8 +111,46 @@ async def verify_document(file_path: str, user_name: str, user_pan: str, doc_typ
         user_pan_clean = _clean_pan(user_pan)
         expected_fy_clean = _normalize_fy(expected_fy) if expected_fy else None
 
-        # STEP 1: Extract text (hybrid approach)
-        text = extract_text_from_pdf_advanced(file_path)
+        # STEP 1: Extract text page by page, only until a PAN, a name, the FY and
+        # the document type have all appeared (normally page 1). The PAN is
+        # compared on the page where the first one appears: if the user's PAN is
+        # not among the pages read by then, the document is rejected right away.
+        # The remaining pages are loaded later, if full extraction proceeds.
+        pdf_text = LazyPdfText(file_path)
+        found = set()
+        user_pan_seen = not user_pan_clean
+        while pdf_text.load_next_page():
+            page_text = pdf_text.last_page_text
+            page_upper = page_text.upper()
+            found |= _identity_fields_on_page(page_text, page_upper, expected_fy, doc_type)
+            user_pan_seen = user_pan_seen or _pan_exists_in_text(user_pan_clean, page_upper)
+            if ("pan" in found and not user_pan_seen) or found >= IDENTITY_FIELDS:
+                break
+        pdf_text.close()
+        text = pdf_text.text
+
+        if len(text.strip()) <= 200 and pdf_text.fully_loaded:
+            # Little or no text layer (scanned PDF): OCR the whole document
+            text = pdf_text.full_text()
+
+        print(f"📄 Verification read {pdf_text.pages_loaded}/{pdf_text.page_count} pages")
+
+        if "pan" in found and not user_pan_seen:
+            document_pans = extract_all_pans(text)
+            debug_msg = f"[ERROR] PAN verification failed: PAN mismatch detected."
+            debug_msg += f"\n   Your registered PAN: {user_pan_clean}"
+            debug_msg += f"\n   PANs found in document: {', '.join(document_pans)}"
+            debug_msg += f"\n   [REASON] Your PAN ({user_pan_clean}) is not on the page(s) where this document states its PAN"
+            debug_msg += f"\n   [ACTION] Please upload a document that belongs to you (PAN: {user_pan_clean})"
+            debug_msg += f"\n   [SECURITY] This prevents uploading someone else's documents"
+
+            print(debug_msg)
+            return {
+                "verified": False,
+                "message": debug_msg,
+                "extracted_data": {"all_pans_found": document_pans},
+                "error_type": "pan_mismatch"
+            }
 
         if not text or len(text.strip()) < 10:
             return {
@@ -443,7 +503,8 @@ async def verify_document(file_path: str, user_name: str, user_pan: str, doc_typ
             "verified": True,
             "message": f"[SUCCESS] Document verified! PAN: {extracted_pan_clean}, FY: {extracted_fy or 'N/A'}, Type: {extracted_doc_type or 'N/A'}",
             "extracted_data": extracted,
-            "text_content": text
+            # Full text is only loaded if extraction asks for it
+            "pdf_text": pdf_text
         }
 
     except Exception as e:
@@ -522,8 +583,94 @@ def extract_text_from_pdf_advanced(file_path: str) -> str:
     )
 
 
+class LazyPdfText:
+    """
+    PDF text loaded one page at a time (same "=== PAGE N ===" format as
+    extract_text_from_pdf_advanced). Verification reads only the pages it needs;
+    full_text() loads the rest, falling back to OCR for scanned PDFs.
+    The PDF is re-opened on demand, so close() can be called between phases.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._doc = None
+        self._page_count: Optional[int] = None
+        self._next_page = 0
+        self._parts: List[str] = []
+        self._last_page_text = ""
+        self._full_text: Optional[str] = None
+
+    def _open(self):
+        if self._doc is not None:
+            return
+        try:
+            self._doc = fitz.open(self.file_path)
+            self._page_count = self._doc.page_count
+        except Exception as e:
+            print(f"[WARNING] PyMuPDF failed: {str(e)}")
+            self._page_count = 0
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._open()
+        return self._page_count
+
+    @property
+    def pages_loaded(self) -> int:
+        return self._next_page
+
+    @property
+    def fully_loaded(self) -> bool:
+        return self._next_page >= self.page_count
+
+    @property
+    def text(self) -> str:
+        """Text of the pages loaded so far"""
+        return "".join(self._parts)
+
+    @property
+    def last_page_text(self) -> str:
+        """Text of the page loaded by the last load_next_page() call"""
+        return self._last_page_text
+
+    def load_next_page(self) -> bool:
+        """Load one more page. Returns False when there are no pages left."""
+        if self.fully_loaded:
+            self.close()
+            return False
+        self._open()
+        if self._doc is None:
+            return False
+        page_text = self._doc[self._next_page].get_text("text", sort=True)
+        self._last_page_text = page_text or ""
+        if page_text:
+            self._parts.append(f"\n=== PAGE {self._next_page + 1} ===\n{page_text}\n")
+        self._next_page += 1
+        return True
+
+    def full_text(self) -> str:
+        """Text of every page (OCR for scanned PDFs)"""
+        if self._full_text is None:
+            while self.load_next_page():
+                pass
+            text = self.text
+            if len(text.strip()) > 200:
+                self._full_text = text
+            else:
+                # Scanned / image PDF: the full extractor handles the OCR fallback
+                self._full_text = extract_text_from_pdf_advanced(self.file_path)
+        return self._full_text
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+
 async def extract_document_data(file_path: str, doc_type: DocType, financial_year: str,
-                                text_content: str = None) -> Dict[str, Any]:
+                                text_content: str = None,
+                                pdf_text: Optional["LazyPdfText"] = None) -> Dict[str, Any]:
     """
     🎯 COMPREHENSIVE DATA EXTRACTION FROM VERIFIED DOCUMENT
     
@@ -541,6 +688,9 @@ async def extract_document_data(file_path: str, doc_type: DocType, financial_yea
         if text_content and len(text_content) > 10:
             print(f"[CACHE] Using pre-extracted text from verification phase ({len(text_content)} chars)")
             text = text_content
+        elif pdf_text is not None:
+            print(f"[CACHE] Reusing {pdf_text.pages_loaded} page(s) read during verification, loading the rest")
+            text = pdf_text.full_text()
         else:
             text = extract_text_from_pdf_advanced(file_path)
 
@@ -592,6 +742,18 @@ async def extract_document_data(file_path: str, doc_type: DocType, financial_yea
                 elif key not in merged_data or not merged_data[key]:
                     merged_data[key] = value
         
+        # STEP 4: Transaction tables (Form 26AS / AIS) from word coordinates.
+        # Row-level values are more reliable than the line heuristics and the AI summary.
+        if doc_type in (DocType.FORM_26AS, DocType.AIS):
+            try:
+                table_data = extract_transaction_tables(file_path, doc_type.value)
+            except Exception as e:
+                print(f"⚠️  Table extraction failed: {str(e)}")
+                table_data = {}
+            for key, value in table_data.items():
+                if value:
+                    merged_data[key] = value
+
         # Ensure financial year is set
         if not merged_data.get('financial_year') and financial_year:
             merged_data['financial_year'] = financial_year
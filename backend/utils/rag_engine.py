@@ -12,62 +12,101 @@ warnings.filterwarnings(
     message="urllib3 v2 only supports OpenSSL 1.1.1+",
 )
 
-# Chroma calls posthog.capture with positional args. Some posthog builds only
-# support keyword arguments, which causes noisy telemetry errors in logs.
-try:
-    import posthog
+import asyncio
+import threading
+import shutil
+import httpx
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 
-    posthog.disabled = True
+from utils.vector_index import NumpyVectorClient
+from utils.document_chunker import build_document_chunks
 
-    def _capture_noop(*args, **kwargs):
-        return None
+# Vector store backend: "chroma" (default) or "numpy" (in-process index for small deployments)
+RAG_BACKEND = os.getenv("RAG_BACKEND", "chroma").strip().lower()
 
-    posthog.capture = _capture_noop
-except Exception:
-    pass
+CHROMA_AVAILABLE = False
+if RAG_BACKEND != "numpy":
+    # Chroma calls posthog.capture with positional args. Some posthog builds only
+    # support keyword arguments, which causes noisy telemetry errors in logs.
+    try:
+        import posthog
 
-import chromadb
-from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
-from chromadb.config import Settings
-import uuid
-import shutil
-import httpx
-from typing import List, Dict, Any, Optional
-from utils.ollama_client import OLLAMA_BASE_URL, OLLAMA_MODEL
+        posthog.disabled = True
+
+        def _capture_noop(*args, **kwargs):
+            return None
+
+        posthog.capture = _capture_noop
+    except Exception:
+        pass
+
+    try:
+        import chromadb
+        from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
+        from chromadb.config import Settings
+        CHROMA_AVAILABLE = True
+    except ImportError:
+        print("⚠️ chromadb not installed - using NumPy vector index")
+
+if not CHROMA_AVAILABLE:
+    chromadb = None
+    EmbeddingFunction = object
+    Documents = List[str]
+    Embeddings = List[List[float]]
+
+from utils.ollama_client import OLLAMA_BASE_URL, OLLAMA_MODEL, get_embedding
+
+# Candidates fetched per collection before the merged rerank, and context size kept after it
+RULES_CANDIDATES = 4
+USER_DATA_CANDIDATES = 8
+CONTEXT_RESULTS = 7
+
+# Number of per-user collections kept open at once (least recently used are released)
+USER_PARTITION_CACHE_SIZE = int(os.getenv("RAG_USER_PARTITIONS", "64"))
 
 
 class OllamaEmbeddingFunction(EmbeddingFunction):
     """Custom embedding function for Ollama (compatible with chromadb 0.4.x)"""
     
-    def __init__(self, url: str, model_name: str):
+    def __init__(self, url: str, model_name: str, max_workers: int = 4):
         self.url = url
         self.model_name = model_name
-    
+        self.max_workers = max(1, max_workers)
+        # One pooled client for all requests (keeps connections alive during bulk indexing)
+        self._client = httpx.Client(timeout=60.0)
+
+    def _embed_one(self, text: str) -> List[float]:
+        try:
+            response = self._client.post(
+                self.url,
+                json={"model": self.model_name, "prompt": text}
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("embedding", [])
+            # Fallback: return empty embedding
+            print(f"Ollama embedding error: {response.status_code}")
+            return [0.0] * 768
+        except Exception as e:
+            print(f"Ollama embedding exception: {e}")
+            return [0.0] * 768
+
     def __call__(self, input: Documents) -> Embeddings:
-        embeddings = []
-        for text in input:
-            try:
-                response = httpx.post(
-                    self.url,
-                    json={"model": self.model_name, "prompt": text},
-                    timeout=60.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    embeddings.append(data.get("embedding", []))
-                else:
-                    # Fallback: return empty embedding
-                    print(f"Ollama embedding error: {response.status_code}")
-                    embeddings.append([0.0] * 768)
-            except Exception as e:
-                print(f"Ollama embedding exception: {e}")
-                embeddings.append([0.0] * 768)
-        return embeddings
+        if len(input) <= 1:
+            return [self._embed_one(text) for text in input]
+
+        # Bulk indexing: embed several passages concurrently, preserving order
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(input))) as pool:
+            return list(pool.map(self._embed_one, input))
 
 class RAGEngine:
-    def __init__(self, persist_directory: Optional[str] = None):
+    def __init__(self, persist_directory: Optional[str] = None, backend: Optional[str] = None):
+        self.backend = (backend or RAG_BACKEND) if CHROMA_AVAILABLE else "numpy"
         if persist_directory is None:
-            persist_directory = os.path.join(os.path.dirname(__file__), "..", "chroma_db")
+            store = "vector_index" if self.backend == "numpy" else "chroma_db"
+            persist_directory = os.path.join(os.path.dirname(__file__), "..", store)
 
         self.persist_directory = os.path.abspath(persist_directory)
         self.storage_mode = "persistent"
@@ -75,12 +114,18 @@ class RAGEngine:
 
         self.ollama_ef = OllamaEmbeddingFunction(
             url=f"{OLLAMA_BASE_URL}/api/embeddings",
-            model_name=OLLAMA_MODEL
+            model_name=OLLAMA_MODEL,
+            max_workers=int(os.getenv("RAG_EMBED_WORKERS", "4"))
         )
+        self._user_partitions: "OrderedDict[int, Any]" = OrderedDict()
+        self._partition_lock = threading.Lock()
         self._initialize_collections()
 
     def _create_client(self, persistent: bool = True):
-        if persistent:
+        if self.backend == "numpy":
+            self.storage_mode = "numpy"
+            self.client = NumpyVectorClient(self.persist_directory)
+        elif persistent:
             self.storage_mode = "persistent"
             self.client = chromadb.PersistentClient(
                 path=self.persist_directory,
@@ -97,10 +142,12 @@ class RAGEngine:
             name="tax_rules",
             embedding_function=self.ollama_ef
         )
+        # Legacy shared collection (all users); rows are moved to per-user partitions on first access
         self.user_data_collection = self.client.get_or_create_collection(
             name="user_data",
             embedding_function=self.ollama_ef
         )
+        self._user_partitions.clear()
 
     @staticmethod
     def _is_schema_mismatch(error: Exception) -> bool:
@@ -139,6 +186,54 @@ class RAGEngine:
                         f"Chroma init failed (persistent + ephemeral): {third_error}"
                     ) from third_error
 
+    def _user_collection(self, user_id: int):
+        """
+        Per-user partition of user data (user_data_u<id>), opened lazily and kept in an LRU.
+        Filtered search then only touches that user's vectors.
+        """
+        with self._partition_lock:
+            collection = self._user_partitions.get(user_id)
+            if collection is not None:
+                self._user_partitions.move_to_end(user_id)
+                return collection
+
+            collection = self.client.get_or_create_collection(
+                name=f"user_data_u{user_id}",
+                embedding_function=self.ollama_ef
+            )
+            self._migrate_legacy_user_data(user_id, collection)
+
+            self._user_partitions[user_id] = collection
+            while len(self._user_partitions) > max(1, USER_PARTITION_CACHE_SIZE):
+                evicted_id, _ = self._user_partitions.popitem(last=False)
+                if isinstance(self.client, NumpyVectorClient):
+                    # Frees the vectors; the client keeps the (now empty) instance for the name
+                    self.client.release_collection(f"user_data_u{evicted_id}")
+            return collection
+
+    def _migrate_legacy_user_data(self, user_id: int, collection):
+        """Move this user's rows from the shared user_data collection (keeps their embeddings)"""
+        try:
+            if self.user_data_collection.count() == 0:
+                return
+            legacy = self.user_data_collection.get(
+                where={"user_id": user_id},
+                include=["documents", "metadatas", "embeddings"]
+            )
+            if not legacy.get("ids"):
+                return
+
+            collection.add(
+                ids=legacy["ids"],
+                documents=legacy["documents"],
+                metadatas=legacy["metadatas"],
+                embeddings=[e.tolist() if hasattr(e, "tolist") else list(e) for e in legacy["embeddings"]]
+            )
+            self.user_data_collection.delete(ids=legacy["ids"])
+            print(f"Moved {len(legacy['ids'])} indexed chunks of user {user_id} to partition")
+        except Exception as e:
+            print(f"Error migrating legacy user data: {e}")
+
     def index_user_document(self, user_id: int, doc_type: str, financial_year: str, data: Dict[str, Any]):
         """
         Index a user document (Form 16, AIS etc) with strict metadata for the specific Financial Year.
@@ -146,48 +241,30 @@ class RAGEngine:
         if not financial_year:
             financial_year = "unknown"
 
-        chunks = []
-        metadatas = []
-        ids = []
-
-        # Helper to flatten JSON into readable text chunks
-        def process_json(obj, parent_key=''):
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    new_key = f"{parent_key} {k}" if parent_key else k
-                    process_json(v, new_key)
-            elif isinstance(obj, list):
-                for i, v in enumerate(obj):
-                    process_json(v, f"{parent_key}[{i}]")
-            else:
-                # This is a leaf value (int, float, string)
-                # Create a semantic sentence: "Form 16 (2024-25) - Gross Salary: 500000"
-                clean_key = parent_key.replace('_', ' ').strip().title()
-                # Skip if value is null or empty
-                if obj is None or obj == "":
-                    return
-                    
-                text = f"{doc_type} ({financial_year}) - {clean_key}: {obj}"
-                
-                chunks.append(text)
-                
-                # METADATA IS KEY: This allows us to filter later
-                metadatas.append({
-                    "user_id": user_id,
-                    "financial_year": financial_year,
-                    "doc_type": doc_type,
-                    "field": clean_key
-                })
-                ids.append(f"{user_id}_{financial_year}_{doc_type.replace(' ', '_')}_{str(uuid.uuid4())}")
-
-        process_json(data)
-
-        # Clear out old data for this user, doc type, and year to prevent duplicates
+        # One chunk per semantic section (salary breakup, Chapter VI-A, TDS ...), zeros skipped
+        sections = build_document_chunks(doc_type, financial_year, data)
+        doc_slug = doc_type.replace(' ', '_')
+
+        chunks = [section["text"] for section in sections]
+        # METADATA IS KEY: This allows us to filter later
+        metadatas = [
+            {
+                "user_id": user_id,
+                "financial_year": financial_year,
+                "doc_type": doc_type,
+                "section": section["section"]
+            }
+            for section in sections
+        ]
+        ids = [f"{user_id}_{financial_year}_{doc_slug}_{section['section']}" for section in sections]
+
+        user_collection = self._user_collection(user_id)
+
+        # Clear out old data for this doc type and year to prevent duplicates
         try:
-            self.user_data_collection.delete(
+            user_collection.delete(
                 where={
                     "$and": [
-                        {"user_id": user_id},
                         {"financial_year": financial_year},
                         {"doc_type": doc_type}
                     ]
@@ -200,7 +277,7 @@ class RAGEngine:
         # Add new data
         try:
             if chunks:
-                self.user_data_collection.add(
+                user_collection.add(
                     documents=chunks,
                     metadatas=metadatas,
                     ids=ids
@@ -209,63 +286,156 @@ class RAGEngine:
         except Exception as e:
             print(f"Error adding to index: {e}")
 
-    def search_context(self, query: str, user_id: int, financial_year: Optional[str] = None) -> str:
+    def index_tax_rules(self, financial_year: str, passages: List[Dict[str, str]], version: str) -> int:
         """
-        Retrieve context strictly filtering by Financial Year if provided.
+        Replace the indexed rule passages of a financial year.
+        passages: [{"section": ..., "text": ...}] built by utils.rules_indexer
+        Returns the number of passages indexed (0 if the add failed).
         """
-        context_parts = []
+        self.delete_tax_rules(financial_year)
+
+        if not passages:
+            return 0
 
-        # 1. Fetch relevant generic tax rules
         try:
-            rule_results = self.rules_collection.query(
-                query_texts=[query],
-                n_results=2
+            self.rules_collection.add(
+                documents=[p["text"] for p in passages],
+                metadatas=[
+                    {
+                        "financial_year": financial_year,
+                        "section": p["section"],
+                        "rules_version": version,
+                        "source": "tax_rules_db"
+                    }
+                    for p in passages
+                ],
+                # Counter keeps ids unique even if two passages share a section slug
+                ids=[f"rules_{financial_year}_{i}_{p['section']}" for i, p in enumerate(passages)]
             )
-            if rule_results['documents'] and rule_results['documents'][0]:
-                context_parts.append("RELEVANT TAX RULES:")
-                context_parts.extend(rule_results['documents'][0])
+            print(f"Indexed {len(passages)} rule passages for FY {financial_year}")
+            return len(passages)
         except Exception as e:
-            print(f"Error querying rules: {e}")
+            print(f"Error indexing tax rules for FY {financial_year}: {e}")
+            return 0
 
-        # 2. Fetch User Data with Filter
-        # If financial_year is specified, we ONLY look at that year's docs
-        where_filter = {"user_id": user_id}
-        
+    def delete_tax_rules(self, financial_year: str):
+        """Remove all rule passages of a financial year"""
+        try:
+            self.rules_collection.delete(where={"financial_year": financial_year})
+        except Exception as e:
+            print(f"Error clearing rules index: {e}")
+
+    def get_rules_version(self, financial_year: str) -> Optional[str]:
+        """Version of the rules currently indexed for a financial year (None if not indexed)"""
+        try:
+            result = self.rules_collection.get(
+                where={"financial_year": financial_year},
+                limit=1,
+                include=["metadatas"]
+            )
+            if result.get("metadatas"):
+                return result["metadatas"][0].get("rules_version")
+        except Exception as e:
+            print(f"Error reading rules index version: {e}")
+        return None
+
+    def get_indexed_rule_years(self) -> List[str]:
+        """Financial years that currently have rule passages indexed"""
+        try:
+            result = self.rules_collection.get(include=["metadatas"])
+            return sorted({m.get("financial_year") for m in result.get("metadatas") or [] if m})
+        except Exception as e:
+            print(f"Error listing rules index: {e}")
+            return []
+
+    @staticmethod
+    def _query_collection(collection, query: str, query_embedding: List[float], n_results: int,
+                          where: Optional[Dict[str, Any]] = None) -> List[tuple]:
+        """Run one collection query, returning [(document, distance)]"""
+        params = {"n_results": n_results, "include": ["documents", "distances"]}
+        if query_embedding:
+            params["query_embeddings"] = [query_embedding]
+        else:
+            # Embedding service unavailable for the query; let Chroma embed it
+            params["query_texts"] = [query]
+        if where:
+            params["where"] = where
+
+        results = collection.query(**params)
+        documents = (results.get("documents") or [[]])[0] or []
+        distances = (results.get("distances") or [[]])[0] or []
+        return list(zip(documents, distances))
+
+    async def search_context(self, query: str, user_id: int, financial_year: Optional[str] = None) -> str:
+        """
+        Retrieve context strictly filtering by Financial Year if provided.
+        The query is embedded once and both collections are searched in parallel;
+        hits are then merged and reranked by distance.
+        """
+        query_embedding = await get_embedding(query)
+
+        # Rules: only the requested year's rules when known
+        rules_where = {"financial_year": financial_year} if financial_year else None
+
+        # User data lives in the user's own partition; if financial_year is
+        # specified, we ONLY look at that year's docs
+        user_where = None
         if financial_year:
-            where_filter = {
-                "$and": [
-                    {"user_id": user_id},
-                    {"financial_year": financial_year}
-                ]
-            }
+            user_where = {"financial_year": financial_year}
             header = f"USER DATA (FY {financial_year}):"
         else:
             header = "USER DATA (ALL YEARS):"
 
-        try:
-            user_results = self.user_data_collection.query(
-                query_texts=[query],
-                n_results=5,
-                where=where_filter
-            )
+        rule_hits, user_hits = await asyncio.gather(
+            asyncio.to_thread(
+                self._query_collection, self.rules_collection,
+                query, query_embedding, RULES_CANDIDATES, rules_where
+            ),
+            asyncio.to_thread(
+                lambda: self._query_collection(
+                    self._user_collection(user_id),
+                    query, query_embedding, USER_DATA_CANDIDATES, user_where
+                )
+            ),
+            return_exceptions=True
+        )
 
-            if user_results['documents'] and user_results['documents'][0]:
-                context_parts.append(f"\n{header}")
-                context_parts.extend(user_results['documents'][0])
-        except Exception as e:
-            print(f"Error querying user data: {e}")
+        if isinstance(rule_hits, Exception):
+            print(f"Error querying rules: {rule_hits}")
+            rule_hits = []
+        if isinstance(user_hits, Exception):
+            print(f"Error querying user data: {user_hits}")
+            user_hits = []
+
+        # Rerank both sources together and keep the closest passages
+        ranked = sorted(
+            [("rules", doc, dist) for doc, dist in rule_hits] +
+            [("user", doc, dist) for doc, dist in user_hits],
+            key=lambda hit: hit[2]
+        )[:CONTEXT_RESULTS]
+
+        rules_docs = [doc for source, doc, _ in ranked if source == "rules"]
+        user_docs = [doc for source, doc, _ in ranked if source == "user"]
+
+        context_parts = []
+        if rules_docs:
+            context_parts.append("RELEVANT TAX RULES:")
+            context_parts.extend(rules_docs)
+        if user_docs:
+            context_parts.append(f"\n{header}")
+            context_parts.extend(user_docs)
 
         return "\n\n".join(context_parts)
 
-    def get_relevant_rules(self, query: str, n_results: int = 5) -> List[str]:
+    def get_relevant_rules(self, query: str, n_results: int = 5, financial_year: Optional[str] = None) -> List[str]:
         """
         Retrieve relevant tax rules based on a query.
         """
         try:
-            rule_results = self.rules_collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
+            rule_query = {"query_texts": [query], "n_results": n_results}
+            if financial_year:
+                rule_query["where"] = {"financial_year": financial_year}
+            rule_results = self.rules_collection.query(**rule_query)
             return rule_results.get('documents', [[]])[0]
         except Exception as e:
             print(f"Error querying rules: {e}")
@@ -278,10 +448,23 @@ class NullRAGEngine:
     def index_user_document(self, user_id: int, doc_type: str, financial_year: str, data: Dict[str, Any]):
         print("RAG disabled: skipping document indexing.")
 
-    def search_context(self, query: str, user_id: int, financial_year: Optional[str] = None) -> str:
+    def index_tax_rules(self, financial_year: str, passages: List[Dict[str, str]], version: str) -> int:
+        print("RAG disabled: skipping tax rules indexing.")
+        return 0
+
+    def delete_tax_rules(self, financial_year: str):
+        return None
+
+    def get_rules_version(self, financial_year: str) -> Optional[str]:
+        return None
+
+    def get_indexed_rule_years(self) -> List[str]:
+        return []
+
+    async def search_context(self, query: str, user_id: int, financial_year: Optional[str] = None) -> str:
         return ""
 
-    def get_relevant_rules(self, query: str, n_results: int = 5) -> List[str]:
+    def get_relevant_rules(self, query: str, n_results: int = 5, financial_year: Optional[str] = None) -> List[str]:
         return []
 
 
@@ -0,0 +1,217 @@
+"""
+Bulk Tax Recompute Jobs
+When an admin changes the rules for a FY, every stored TaxComputation for that FY
+was computed with the old figures. A recompute job walks those computations in
+pages (keyset pagination on TaxComputation.id, so memory stays flat however many
+users there are), aggregates each user's verified documents, computes both regimes
+for the whole page with BatchTaxEngine and writes the page back with one bulk
+update.
+
+Only users who already have a computation for the FY are recomputed - users who
+never calculated get the new rules on their first /api/tax/calculate. Stale
+documents are not re-extracted here; the job only re-runs the tax figures.
+The recommended ITR form does not depend on the rules and is left as stored.
+
+Jobs run in the background (FastAPI BackgroundTasks) and report progress through
+get_recompute_job(); job state is kept in-process.
+"""
+import os
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from database import SessionLocal
+from models import User, Document, TaxComputation, VerificationStatus
+from utils.batch_tax_engine import BatchTaxEngine, TaxpayerBatch, REGIME_FIELDS, result_row
+from utils.document_aggregator import aggregate_document_data
+from utils.fingerprint import input_fingerprint
+from utils.rules_service import RulesService
+from utils.tax_calculator import calculate_age, prepare_regime_inputs, recommend_regime, total_taxes_paid_from
+
+# Computations loaded, computed and written per round trip
+RECOMPUTE_PAGE_SIZE = int(os.getenv("TAX_RECOMPUTE_PAGE_SIZE", "500"))
+
+_jobs: Dict[str, "RecomputeJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+@dataclass
+class RecomputeJob:
+    """Progress of one FY recompute"""
+    job_id: str
+    financial_year: str
+    status: str = "queued"  # queued -> running -> completed / failed
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    skipped: int = 0  # no verified documents left for the FY
+    failed: int = 0
+    error: Optional[str] = None
+    created_at: datetime = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def create_recompute_job(financial_year: str) -> Tuple[RecomputeJob, bool]:
+    """
+    Register a job for the FY. Returns (job, created) - if a job for the FY is
+    already queued / running, that job with created=False.
+    """
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job.financial_year == financial_year and job.active:
+                return job, False
+        job = RecomputeJob(job_id=uuid.uuid4().hex, financial_year=financial_year, created_at=datetime.utcnow())
+        _jobs[job.job_id] = job
+        return job, True
+
+
+def get_recompute_job(job_id: str) -> Optional[RecomputeJob]:
+    return _jobs.get(job_id)
+
+
+def list_recompute_jobs(financial_year: Optional[str] = None) -> List[RecomputeJob]:
+    jobs = [job for job in _jobs.values() if financial_year is None or job.financial_year == financial_year]
+    return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+
+# ==========================================
+# Job runner
+# ==========================================
+
+def run_recompute_job(job_id: str, page_size: int = RECOMPUTE_PAGE_SIZE) -> None:
+    """
+    Recompute every TaxComputation of the job's FY with the current rules.
+    Safe to run as a background task (opens its own session).
+    """
+    job = _jobs[job_id]
+    job.status = "running"
+    job.started_at = datetime.utcnow()
+    print(f"🔁 Recomputing tax for FY {job.financial_year} (job {job_id})...")
+
+    db = SessionLocal()
+    try:
+        rules_service = RulesService(db, job.financial_year)
+        engine = BatchTaxEngine(rules_service)
+        job.total = db.query(TaxComputation).filter(
+            TaxComputation.financial_year == job.financial_year
+        ).count()
+
+        last_id = 0
+        while True:
+            page = (
+                db.query(TaxComputation.id, TaxComputation.user_id, User.date_of_birth)
+                .join(User, User.id == TaxComputation.user_id)
+                .filter(TaxComputation.financial_year == job.financial_year, TaxComputation.id > last_id)
+                .order_by(TaxComputation.id)
+                .limit(page_size)
+                .all()
+            )
+            if not page:
+                break
+            last_id = page[-1].id
+
+            mappings = _recompute_page(db, page, job, rules_service, engine)
+            if mappings:
+                db.bulk_update_mappings(TaxComputation, mappings)
+                db.commit()
+            # Drop the page's documents from the session before the next one
+            db.expunge_all()
+
+            job.processed += len(page)
+            job.updated += len(mappings)
+            print(f"   {job.processed}/{job.total} computations processed")
+
+        job.status = "completed"
+        print(f"✅ FY {job.financial_year} recompute done: {job.updated} updated, "
+              f"{job.skipped} skipped, {job.failed} failed")
+    except Exception as e:
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+        print(f"❌ FY {job.financial_year} recompute failed: {e}")
+    finally:
+        job.finished_at = datetime.utcnow()
+        db.close()
+
+
+def _recompute_page(db, page, job: RecomputeJob, rules_service: RulesService,
+                    engine: BatchTaxEngine) -> List[Dict[str, Any]]:
+    """Bulk-update mappings for one page of (computation id, user id, DOB) rows"""
+    documents_by_user = defaultdict(list)
+    documents = db.query(Document).filter(
+        Document.user_id.in_([row.user_id for row in page]),
+        Document.financial_year == job.financial_year,
+        Document.verification_status == VerificationStatus.VERIFIED
+    ).all()
+    for doc in documents:
+        documents_by_user[doc.user_id].append(doc)
+
+    rows, records = [], []
+    for row in page:
+        if not documents_by_user[row.user_id]:
+            job.skipped += 1
+            continue
+        try:
+            aggregated = aggregate_document_data(documents_by_user[row.user_id])
+            gross_income, _, claims, _ = prepare_regime_inputs(aggregated, rules_service, verbose=False)
+        except Exception as e:
+            job.failed += 1
+            print(f"⚠️ Could not aggregate documents for computation {row.id}: {e}")
+            continue
+        rows.append((row, aggregated, input_fingerprint(
+            documents_by_user[row.user_id], row.date_of_birth, rules_service.rules_fingerprint
+        )))
+        records.append({
+            "gross_income": gross_income,
+            "age": calculate_age(row.date_of_birth, job.financial_year) if row.date_of_birth else 30,
+            "deductions": claims,
+            "taxes_paid": total_taxes_paid_from(aggregated),
+        })
+
+    if not records:
+        return []
+    results = engine.compute(TaxpayerBatch.from_records(records))
+
+    computed_at = datetime.utcnow()
+    mappings = []
+    for index, ((row, aggregated, fingerprint), record) in enumerate(zip(rows, records)):
+        figures = result_row(results, index)
+        old, new = figures["old_regime"], figures["new_regime"]
+        regime, reason, savings = recommend_regime(old, new)
+        mapping = {
+            "id": row.id,
+            "gross_total_income": record["gross_income"],
+            "salary_income": aggregated.get("salary_income", 0),
+            "house_property_income": aggregated.get("house_property_income", 0),
+            "capital_gains": aggregated.get("capital_gains", 0),
+            "other_income": aggregated.get("other_income", 0),
+            "old_regime_deductions": record["deductions"],
+            "new_regime_deductions": {
+                "Standard Deduction": engine.new_standard_deduction,
+                "80CCD(2)": record["deductions"].get("80CCD_2", 0),
+            },
+            "recommended_regime": regime,
+            "recommendation_reason": reason,
+            "tax_savings": savings,
+            "total_tds": aggregated.get("total_tds", 0),
+            "tax_payable": figures["tax_payable"],
+            "refund_amount": figures["refund_amount"],
+            "computed_at": computed_at,
+            "input_fingerprint": fingerprint,
+        }
+        for field in REGIME_FIELDS:
+            mapping[f"old_regime_{field}"] = old[field]
+            mapping[f"new_regime_{field}"] = new[field]
+        mappings.append(mapping)
+    return mappings
@@ -0,0 +1,84 @@
+"""
+Background Re-extraction of Stale Documents
+Older uploads can hold mostly-zero extracted_data (from the previous OCR parser).
+They used to be re-extracted inline by /api/tax/calculate, which ran PDF text
+extraction (OCR included) inside the request and held a threadpool worker for
+30+ seconds. Re-extraction now runs on a dedicated single-worker executor:
+the request schedules it and returns straight away, and at most one OCR job
+runs at a time, outside the server's request threadpool.
+
+A document is re-extracted at most once per process; if that does not recover
+any figures, the tax calculation proceeds with the data it has (as before).
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List, Set
+
+from database import SessionLocal
+from models import Document
+from utils.amount_parser import parse_indian_amount
+
+# Any of these > 0 means the extraction found the key figures
+KEY_FINANCIAL_FIELDS = ("gross_total_income", "gross_salary", "salary_income", "total_income", "total_tds")
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reextract")
+_pending: Set[int] = set()
+_attempted: Set[int] = set()
+_state_lock = threading.Lock()
+
+
+def needs_reextraction(doc: Any) -> bool:
+    """Stale data, file still on disk, and not already tried"""
+    data = doc.extracted_data or {}
+    if data.get("_recovered_during_tax_calc") or doc.id in _attempted:
+        return False
+    if any((parse_indian_amount(data.get(key, 0)) or 0) > 0 for key in KEY_FINANCIAL_FIELDS):
+        return False
+    return bool(doc.file_path) and os.path.exists(doc.file_path)
+
+
+def schedule_reextraction(documents: Iterable[Any], user_name: str, user_pan: str,
+                          financial_year: str) -> List[int]:
+    """Queue the documents not already queued; returns the ids now pending"""
+    with _state_lock:
+        new_ids = [doc.id for doc in documents if doc.id not in _pending]
+        _pending.update(new_ids)
+    if new_ids:
+        _executor.submit(_reextract_documents, new_ids, user_name, user_pan, financial_year)
+    return new_ids
+
+
+def _reextract_documents(document_ids: List[int], user_name: str, user_pan: str, financial_year: str):
+    # Deferred: PDF / OCR stack is only needed once a job actually runs
+    from utils.pdf_processor import extract_text_from_pdf_advanced
+    from utils.smart_extractor import extract_with_smart_extractor
+
+    db = SessionLocal()
+    try:
+        for document_id in document_ids:
+            try:
+                doc = db.query(Document).filter(Document.id == document_id).first()
+                if not doc:
+                    continue
+                print(f"🔄 Re-extracting stale data for {doc.doc_type.value} (document_id={doc.id})...")
+                text = extract_text_from_pdf_advanced(doc.file_path)
+                recovered = extract_with_smart_extractor(
+                    text=text,
+                    user_name=user_name,
+                    user_pan=user_pan,
+                    expected_fy=financial_year,
+                )
+                recovered["_recovered_during_tax_calc"] = True
+                doc.extracted_data = recovered
+                db.commit()
+                print(f"✅ Re-extracted document {document_id}")
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Failed to re-extract stale document {document_id}: {e}")
+            finally:
+                with _state_lock:
+                    _attempted.add(document_id)
+                    _pending.discard(document_id)
+    finally:
+        db.close()
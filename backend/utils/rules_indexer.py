@@ -0,0 +1,226 @@
+"""
+Tax Rules Knowledge Base Indexer
+Turns the active TaxRule.rules_json of each financial year into semantic passages
+and keeps the RAG rules collection in sync with the admin Tax Rules panel.
+"""
+import re
+from typing import Dict, Any, List
+
+from database import SessionLocal
+from models import TaxRule
+from utils.rag_engine import get_rag_engine
+
+
+# Top-level keys that describe the rules document itself, not a tax rule
+_SKIPPED_KEYS = {"schema_version", "financial_year", "assessment_year", "source"}
+
+
+def _humanize_key(key: str) -> str:
+    """section_80D_health_insurance -> Section 80D Health Insurance"""
+    words = [w for w in re.split(r"[_\s]+", str(key)) if w]
+    return " ".join(w if any(ch.isdigit() for ch in w) or w.isupper() else w.capitalize() for w in words)
+
+
+def _format_value(value: Any) -> str:
+    """Render a rule value as readable text (amounts in rupees)"""
+    if value is None:
+        return "no limit"
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, (int, float)):
+        return f"₹{value:,.0f}" if abs(value) >= 1000 else f"{value:g}"
+    if isinstance(value, list):
+        if all(not isinstance(v, (dict, list)) for v in value):
+            return ", ".join(_format_value(v) for v in value)
+        return "; ".join(_format_value(v) for v in value)
+    if isinstance(value, dict):
+        parts = [f"{_humanize_key(k)}: {_format_value(v)}" for k, v in value.items()]
+        return "(" + ", ".join(parts) + ")"
+    return str(value)
+
+
+def _describe_slab(slab: Dict[str, Any]) -> str:
+    """Describe one slab in any of the supported formats (min/max, upto, over/up_to)"""
+    lower = slab.get("min", slab.get("over", 0)) or 0
+    upper = slab.get("max", slab.get("up_to", slab.get("upto")))
+    rate = slab.get("rate_percent")
+    rate_text = f"{rate}%" if rate is not None else slab.get("formula", "")
+
+    if upper is None:
+        return f"above ₹{lower:,.0f}: {rate_text}"
+    return f"₹{lower:,.0f} to ₹{upper:,.0f}: {rate_text}"
+
+
+def _describe_slab_list(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "; ".join(_describe_slab(s) for s in value if isinstance(s, dict))
+    return _format_value(value)
+
+
+def build_rule_passages(rules: Dict[str, Any], financial_year: str) -> List[Dict[str, str]]:
+    """
+    Chunk a rules JSON into self-contained passages, one per rule topic
+    (slabs per age category and regime, rebate, surcharge, cess, each deduction section).
+
+    Returns: list of {"section": slug, "text": passage}; slugs are unique (a repeated
+    one, e.g. the same slabs in both formats, gets a _2, _3 ... suffix)
+    """
+    rules = rules or {}
+    assessment_year = rules.get("assessment_year")
+    prefix = f"Tax rules FY {financial_year}" + (f" (AY {assessment_year})" if assessment_year else "")
+    passages: List[Dict[str, str]] = []
+    seen: Dict[str, int] = {}
+
+    def add(section: str, body: str):
+        if body:
+            seen[section] = seen.get(section, 0) + 1
+            if seen[section] > 1:
+                section = f"{section}_{seen[section]}"
+            passages.append({"section": section, "text": f"{prefix} - {body}"})
+
+    # Cess
+    cess = rules.get("cess")
+    if isinstance(cess, dict) and "health_and_education_cess_percent" in cess:
+        add("cess", f"Health and Education Cess: {cess['health_and_education_cess_percent']}% "
+                    f"of income tax plus surcharge.")
+
+    # Rebate u/s 87A
+    for regime, config in (rules.get("rebate_87A") or {}).items():
+        if not isinstance(config, dict):
+            continue
+        text = f"Rebate u/s 87A ({_humanize_key(regime)})"
+        if "max_total_income" in config:
+            text += f": available when total income does not exceed ₹{config['max_total_income']:,.0f}"
+        if "rebate_cap" in config:
+            text += f"; maximum rebate ₹{config['rebate_cap']:,.0f}"
+        if config.get("resident_only"):
+            text += "; resident individuals only"
+        add(f"rebate_87a_{regime}", text + ".")
+
+    # Surcharge and marginal relief
+    surcharge = rules.get("surcharge_and_marginal_relief") or {}
+    for key, thresholds in surcharge.items():
+        if not isinstance(thresholds, list):
+            continue
+        steps = "; ".join(
+            f"{t.get('rate_percent')}% when income exceeds ₹{t.get('min_exclusive', 0):,.0f}"
+            for t in thresholds if isinstance(t, dict)
+        )
+        text = f"{_humanize_key(key)}: {steps}."
+        if surcharge.get("marginal_relief_applicable"):
+            text += " Marginal relief applies at each threshold."
+        add(key, text)
+
+    # Slabs (FY 2024-25 format: slabs -> age category -> regime)
+    for age_category, regimes in (rules.get("slabs") or {}).items():
+        if not isinstance(regimes, dict):
+            continue
+        for regime, slabs in regimes.items():
+            add(f"slabs_{age_category}_{regime}",
+                f"Income tax slabs, {_humanize_key(regime)}, {_humanize_key(age_category)}: "
+                f"{_describe_slab_list(slabs)}.")
+
+    # Slabs (FY 2023-24 format: income_tax_slabs -> regime -> category -> slabs)
+    for regime, categories in (rules.get("income_tax_slabs") or {}).items():
+        if not isinstance(categories, dict):
+            continue
+        for category, data in categories.items():
+            slabs = data.get("slabs") if isinstance(data, dict) else data
+            add(f"slabs_{category}_{regime}",
+                f"Income tax slabs, {_humanize_key(regime)}, {_humanize_key(category)}: "
+                f"{_describe_slab_list(slabs)}.")
+
+    # Deductions (FY 2024-25 format: deductions -> regime group -> section)
+    for group, sections in (rules.get("deductions") or {}).items():
+        if not isinstance(sections, dict):
+            continue
+        for section, details in sections.items():
+            add(f"{group}_{section}",
+                f"{_humanize_key(section)} ({_humanize_key(group)}): {_format_value(details)}.")
+
+    # Deductions (FY 2023-24 format: common_deductions_exemptions -> section)
+    for section, details in (rules.get("common_deductions_exemptions") or {}).items():
+        add(f"common_{section}", f"{_humanize_key(section)}: {_format_value(details)}.")
+
+    # Any other rule topics an admin may have added
+    handled = {"cess", "rebate_87A", "surcharge_and_marginal_relief", "slabs",
+               "income_tax_slabs", "deductions", "common_deductions_exemptions"}
+    for key, value in rules.items():
+        if key in handled or key in _SKIPPED_KEYS:
+            continue
+        add(key, f"{_humanize_key(key)}: {_format_value(value)}.")
+
+    return passages
+
+
+def rules_version(rule: TaxRule) -> str:
+    """Version tag of a stored rule set (changes on every admin edit)"""
+    stamp = rule.updated_at or rule.created_at
+    return f"{rule.id}:{stamp.isoformat() if stamp else ''}"
+
+
+def index_rule(rule: TaxRule) -> int:
+    """Index one TaxRule row into the rules collection. Returns number of passages indexed."""
+    rag = get_rag_engine()
+    if not rule.is_active:
+        rag.delete_tax_rules(rule.financial_year)
+        return 0
+
+    passages = build_rule_passages(rule.rules_json, rule.financial_year)
+    indexed = rag.index_tax_rules(rule.financial_year, passages, rules_version(rule))
+    if indexed < len(passages):
+        print(f"Warning: FY {rule.financial_year} has {indexed} of {len(passages)} rule passages indexed")
+    return indexed
+
+
+def reindex_tax_rules(financial_year: str) -> int:
+    """
+    Rebuild the rule passages for one financial year from the database.
+    Safe to run as a background task (opens its own session).
+    Returns the number of passages indexed (0 if indexing failed).
+    """
+    db = SessionLocal()
+    try:
+        rule = db.query(TaxRule).filter(TaxRule.financial_year == financial_year).first()
+        if not rule:
+            get_rag_engine().delete_tax_rules(financial_year)
+            return 0
+        return index_rule(rule)
+    except Exception as e:
+        print(f"Error re-indexing tax rules for FY {financial_year}: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+def sync_rules_index(db_session=None) -> Dict[str, int]:
+    """
+    Seed the rules collection: index every active FY whose indexed version is
+    missing or stale, and drop FYs that are no longer active.
+    """
+    db = db_session or SessionLocal()
+    indexed: Dict[str, int] = {}
+    try:
+        rag = get_rag_engine()
+        active_rules = db.query(TaxRule).filter(TaxRule.is_active == True).all()
+        active_years = {rule.financial_year for rule in active_rules}
+
+        for rule in active_rules:
+            if rag.get_rules_version(rule.financial_year) == rules_version(rule):
+                continue
+            indexed[rule.financial_year] = index_rule(rule)
+
+        for financial_year in rag.get_indexed_rule_years():
+            if financial_year not in active_years:
+                rag.delete_tax_rules(financial_year)
+
+        if indexed:
+            print(f"Tax rules index refreshed: {indexed}")
+    except Exception as e:
+        print(f"Error syncing tax rules index: {e}")
+    finally:
+        if db_session is None:
+            db.close()
+    return indexed
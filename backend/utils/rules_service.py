@@ -3,10 +3,16 @@ Centralized Tax Rules Service
 All tax figures MUST come from this service - no hardcoded values anywhere in the codebase.
 Rules are loaded from the official government tax website and stored in the database.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+from types import MappingProxyType
 from sqlalchemy.orm import Session
 from models import TaxRule
+from utils.slab_table import CompiledSlabs
+import hashlib
 import json
+import os
+import threading
+import time
 
 
 class TaxRulesNotFoundError(Exception):
@@ -14,6 +20,116 @@ class TaxRulesNotFoundError(Exception):
     pass
 
 
+# ==========================================
+# PROCESS-WIDE RULES CACHE
+# ==========================================
+# Parsed rules per FY are shared by every RulesService in the process, so the
+# tax calculation, investment suggestions and ITR-1 report don't each re-query
+# and re-parse the same rules_json. Admin edits bump the FY's version
+# (invalidate_rules_cache); the TTL bounds staleness when several worker
+# processes each hold their own cache. TTL 0 disables time-based expiry.
+RULES_CACHE_TTL_SECONDS = float(os.getenv("TAX_RULES_CACHE_TTL", "300"))
+
+_rules_cache: Dict[str, "CompiledRules"] = {}
+_rules_versions: Dict[str, int] = {}
+_rules_cache_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only deep copy of a JSON value (dicts -> mappingproxy, lists -> tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain (mutable, JSON-serialisable) copy of a frozen value"""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _age_band(age: int) -> int:
+    """Lower bound of the slab age band: below 60, 60-79, 80 and above"""
+    return 80 if age >= 80 else 60 if age >= 60 else 0
+
+
+class CompiledRules:
+    """
+    Immutable parsed rules for one FY, plus memoised derived views
+    (normalised slabs, surcharge tables, deduction limits).
+    """
+
+    def __init__(self, financial_year: str, rules_json: Dict[str, Any], version: int):
+        self.financial_year = financial_year
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.rules = _freeze(rules_json)
+        self._memo: Dict[Hashable, Any] = {}
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Frozen result of compute(), computed once per key (errors are not cached)"""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = _freeze(compute())
+            self._memo[key] = value
+            return value
+
+    @property
+    def expired(self) -> bool:
+        return RULES_CACHE_TTL_SECONDS > 0 and time.monotonic() - self.loaded_at > RULES_CACHE_TTL_SECONDS
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the rules (same in every process, changes with any edit)"""
+        return self.memo("fingerprint", lambda: hashlib.sha256(
+            json.dumps(_thaw(self.rules), sort_keys=True, default=str).encode()
+        ).hexdigest())
+
+
+def get_compiled_rules(db: Session, financial_year: str) -> CompiledRules:
+    """Cached rules for the FY; queries the database only on a miss or after invalidation"""
+    with _rules_cache_lock:
+        compiled = _rules_cache.get(financial_year)
+        version = _rules_versions.get(financial_year, 0)
+    if compiled is not None and compiled.version == version and not compiled.expired:
+        return compiled
+
+    tax_rule = db.query(TaxRule).filter(
+        TaxRule.financial_year == financial_year,
+        TaxRule.is_active == True
+    ).first()
+
+    if not tax_rule:
+        raise TaxRulesNotFoundError(
+            f"Tax rules not found for FY {financial_year}. "
+            "Please create and activate rules from the admin Tax Rules panel."
+        )
+
+    compiled = CompiledRules(financial_year, tax_rule.rules_json, version)
+    with _rules_cache_lock:
+        # An admin edit during the query bumped the version: don't cache stale rules
+        if _rules_versions.get(financial_year, 0) == version:
+            _rules_cache[financial_year] = compiled
+    print(f"✅ Loaded tax rules for FY {financial_year}")
+    return compiled
+
+
+def invalidate_rules_cache(financial_year: Optional[str] = None):
+    """Drop cached rules after an admin create/update/delete/duplicate (all FYs if None)"""
+    with _rules_cache_lock:
+        years = [financial_year] if financial_year else list(_rules_cache)
+        for year in years:
+            _rules_versions[year] = _rules_versions.get(year, 0) + 1
+            _rules_cache.pop(year, None)
+    print(f"🔄 Tax rules cache invalidated for FY {financial_year or 'ALL'}")
+
+
 class RulesService:
     """
     Centralized service to fetch and parse tax rules from the database.
@@ -24,27 +140,36 @@ class RulesService:
         self.db = db
         self.financial_year = financial_year
         self._rules: Optional[Dict[str, Any]] = None
+        self._compiled: Optional[CompiledRules] = None
         self._load_rules()
     
+    @classmethod
+    def from_rules_json(cls, rules_json: Dict[str, Any], financial_year: Optional[str] = None) -> "RulesService":
+        """Service over an in-memory rules dict (no database, not cached) - batch jobs and fixtures"""
+        service = cls.__new__(cls)
+        service.db = None
+        service.financial_year = financial_year or rules_json.get("financial_year")
+        service._compiled = CompiledRules(service.financial_year, rules_json, version=-1)
+        service._rules = service._compiled.rules
+        return service
+    
     def _load_rules(self):
-        """Load rules from database for the specified financial year"""
-        tax_rule = self.db.query(TaxRule).filter(
-            TaxRule.financial_year == self.financial_year,
-            TaxRule.is_active == True
-        ).first()
-        
-        if not tax_rule:
-            raise TaxRulesNotFoundError(
-                f"Tax rules not found for FY {self.financial_year}. "
-                "Please create and activate rules from the admin Tax Rules panel."
-            )
-        
-        self._rules = tax_rule.rules_json
-        print(f"✅ Loaded tax rules for FY {self.financial_year}")
+        """Load rules for the specified financial year (process-wide cache, DB on a miss)"""
+        self._compiled = get_compiled_rules(self.db, self.financial_year)
+        self._rules = self._compiled.rules
+    
+    @property
+    def rules_fingerprint(self) -> str:
+        """Content hash of the loaded rules (for keying results computed from them)"""
+        return self._compiled.fingerprint
+    
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Value derived from these rules, computed once per loaded rules version"""
+        return self._compiled.memo(key, compute)
     
     @property
     def rules(self) -> Dict[str, Any]:
-        """Get the raw rules JSON"""
+        """Get the raw rules JSON (read-only view)"""
         if self._rules is None:
             raise TaxRulesNotFoundError("Rules not loaded")
         return self._rules
@@ -305,7 +430,7 @@ class RulesService:
         old_regime = deductions.get("old_regime_chapter_VIA_and_others", {})
         
         if "section_80GG_rent_no_hra" in old_regime:
-            return old_regime["section_80GG_rent_no_hra"]
+            return _thaw(old_regime["section_80GG_rent_no_hra"])
         
         return {
             "least_of": [
@@ -320,6 +445,19 @@ class RulesService:
     # ==========================================
     def get_slabs(self, regime: str, age: int = 30) -> List[Dict[str, Any]]:
         """Get tax slabs based on regime and age"""
+        regime_kind = "new" if regime.lower() in ["new", "new_regime"] else "old"
+        slabs = self._compiled.memo(("slabs", regime_kind, _age_band(age)), lambda: self._find_slabs(regime, age))
+        return _thaw(slabs)
+    
+    def get_compiled_slabs(self, regime: str, age: int = 30) -> CompiledSlabs:
+        """Slabs for a regime and age as a CompiledSlabs table (built once per FY / age band)"""
+        regime_kind = "new" if regime.lower() in ["new", "new_regime"] else "old"
+        return self._compiled.memo(
+            ("compiled_slabs", regime_kind, _age_band(age)), lambda: CompiledSlabs(self.get_slabs(regime, age))
+        )
+    
+    def _find_slabs(self, regime: str, age: int) -> List[Dict[str, Any]]:
+        """Locate and normalise the slabs for a regime / age in either rules format"""
         # Determine age category
         if age >= 80:
             age_category = "individual_80_and_above"
@@ -431,7 +569,7 @@ class RulesService:
         regime_key = "new_regime" if regime.lower() in ["new", "new_regime"] else "old_regime"
         
         if regime_key in rebate:
-            return rebate[regime_key]
+            return _thaw(rebate[regime_key])
         
         raise TaxRulesNotFoundError(f"Rebate 87A not found for {regime} regime in FY {self.financial_year}")
     
@@ -452,7 +590,7 @@ class RulesService:
         
         key = "surcharge_new_regime_thresholds" if regime.lower() in ["new", "new_regime"] else "surcharge_old_regime_thresholds"
         
-        return surcharge.get(key, [])
+        return _thaw(self._compiled.memo(("surcharge", key), lambda: surcharge.get(key, [])))
     
     # ==========================================
     # ALL DEDUCTION LIMITS
@@ -460,7 +598,11 @@ class RulesService:
     def get_all_deduction_limits(self, age: int = 30) -> Dict[str, Any]:
         """Get all deduction limits in one call (for investment suggestions etc.)"""
         is_senior = age >= 60
-        
+        return _thaw(self._compiled.memo(
+            ("deduction_limits", is_senior), lambda: self._collect_deduction_limits(is_senior)
+        ))
+    
+    def _collect_deduction_limits(self, is_senior: bool) -> Dict[str, Any]:
         d80_limits = self.get_80d_limits()
         disability = self.get_disability_limits()
         ddb = self.get_80ddb_limits()
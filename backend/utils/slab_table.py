@@ -0,0 +1,92 @@
+"""
+Compiled Tax Slab Tables
+Slabs are parsed once into sorted breakpoints with the tax accumulated up to each
+breakpoint, so tax on any income is a bisect plus one multiply instead of a walk
+over the slab list (and re-parsing its format) on every call.
+
+Supported slab formats (same as calculate_tax_by_slab_accurate has always read):
+- {"min": 0, "max": 250000, "rate_percent": 0}      (max None = no upper limit)
+- {"upto": 250000, "rate_percent": 0}
+- {"over": 1000000, "up_to": None, "rate_percent": 30}
+Slabs in any other shape are ignored.
+
+Each slab taxes min(income, upper) - lower at its rate once income exceeds lower,
+exactly as before; overlapping slabs add up. The slab-wise breakdown is only built
+when breakdown() is called.
+"""
+from bisect import bisect_right
+from typing import Any, Dict, List, Sequence, Tuple
+
+INF = float('inf')
+
+# (lower, upper, rate_percent)
+Band = Tuple[float, float, float]
+
+
+def parse_slab(slab: Dict[str, Any]):
+    """(lower, upper, rate_percent) of one slab, or None if the format is unknown"""
+    if "min" in slab and "max" in slab:
+        upper = slab["max"] if slab["max"] is not None else INF
+        return slab["min"], upper, slab.get("rate_percent", 0)
+    if "upto" in slab:
+        return 0, slab["upto"], slab.get("rate_percent", 0)
+    if "over" in slab:
+        upper = slab.get("up_to", INF)
+        return slab["over"], INF if upper is None else upper, slab.get("rate_percent", 0)
+    return None
+
+
+class CompiledSlabs:
+    """Immutable slab table: tax(income) in O(log n), breakdown(income) on demand"""
+    __slots__ = ("bands", "breakpoints", "rates", "prefix_tax")
+
+    def __init__(self, slabs: Sequence[Dict[str, Any]]):
+        bands: List[Band] = []
+        for slab in slabs:
+            band = parse_slab(slab)
+            if band is not None:
+                bands.append(band)
+        self.bands: Tuple[Band, ...] = tuple(bands)
+
+        # Only bands that can tax anything contribute to the piecewise-linear curve
+        active = [(lower, upper, rate) for lower, upper, rate in bands if upper > lower]
+        points = sorted({lower for lower, _, _ in active} | {upper for _, upper, _ in active if upper != INF})
+        # rates[j]: combined rate (percent) on (points[j], points[j + 1])
+        rates = []
+        for j, start in enumerate(points):
+            end = points[j + 1] if j + 1 < len(points) else INF
+            rates.append(sum(rate for lower, upper, rate in active if lower <= start and end <= upper))
+        prefix = [0.0]
+        for j in range(len(points) - 1):
+            prefix.append(prefix[j] + (points[j + 1] - points[j]) * rates[j] / 100)
+
+        self.breakpoints: Tuple[float, ...] = tuple(points)
+        self.rates: Tuple[float, ...] = tuple(rates)
+        self.prefix_tax: Tuple[float, ...] = tuple(prefix)
+
+    def __len__(self) -> int:
+        return len(self.bands)
+
+    def tax(self, income: float) -> float:
+        """Tax on income before rebate, surcharge and cess"""
+        j = bisect_right(self.breakpoints, income) - 1
+        if j < 0:
+            return 0.0
+        return self.prefix_tax[j] + (income - self.breakpoints[j]) * self.rates[j] / 100
+
+    def breakdown(self, income: float) -> List[Dict[str, Any]]:
+        """Per-slab taxable amount and tax (slabs in rules order, untaxed slabs omitted)"""
+        rows = []
+        for lower, upper, rate in self.bands:
+            if income <= lower:
+                continue
+            taxable_in_slab = min(income, upper) - lower
+            if taxable_in_slab <= 0:
+                continue
+            rows.append({
+                "slab": f"₹{lower:,.0f} - ₹{upper:,.0f}" if upper != INF else f"Above ₹{lower:,.0f}",
+                "taxable_amount": taxable_in_slab,
+                "rate": f"{rate}%",
+                "tax": taxable_in_slab * rate / 100
+            })
+        return rows
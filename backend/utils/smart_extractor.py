@@ -12,16 +12,43 @@ EXTRACTS ALL TAX-RELEVANT DATA:
 - Net Taxable Income
 """
 
+import os
 import re
-from typing import Dict, Any, Optional, List, Tuple
+import time
+from typing import Dict, Any, Optional, List, Tuple, Sequence, Union, Pattern
 from utils.text_cleaner import (
     extract_first_pan,
     extract_all_pans,
     pick_fy,
     extract_document_type,
-    normalize_spaces,
-    names_match
+    names_match,
+    TextViews,
 )
+from utils.extraction_records import ExtractionResult
+from utils.amount_parser import parse_indian_amount, parse_amount_column
+from utils.extraction_patterns import (
+    get_compiled_patterns,
+    get_scanner,
+    FORM16_GROUP_TARGETS,
+    AY_PATTERNS,
+    FY_PATTERNS,
+    NAME_PATTERNS,
+    NAME_NEAR_PAN_PATTERNS,
+    EMPLOYER_PATTERNS,
+    TAN_PATTERN,
+    CONTEXT_NUMBER_PATTERN,
+    LINE_TAN_PATTERN,
+    LINE_AMOUNT_PATTERN,
+    LINE_LARGE_AMOUNT_4_PATTERN,
+    LINE_LARGE_AMOUNT_5_PATTERN,
+    LINE_LARGE_AMOUNT_6_PATTERN,
+)
+from utils.pattern_scanner import AnchorIndex, PageIndex, Span
+
+# Wall-clock budget (ms) for the regex field lookups of one document. Once it is
+# spent the remaining patterns are skipped, so a malformed PDF cannot pin a worker.
+# 0 disables the budget.
+REGEX_TIME_BUDGET_MS = float(os.getenv("REGEX_TIME_BUDGET_MS", "2000"))
 
 
 class SmartExtractor:
@@ -32,161 +59,38 @@ class SmartExtractor:
     
     def __init__(self, text: str, user_name: str = None, user_pan: str = None, expected_fy: str = None):
         self.original_text = text
-        self.text = normalize_spaces(text.upper())
+        # Upper-cased / normalised / line and page splits, each computed once
+        self.views = TextViews(text)
+        self.text = self.views.normalized
         self.user_name = user_name
         self.user_pan = user_pan
         self.expected_fy = expected_fy
-        self.lines = [line.strip() for line in self.text.split('\n') if line.strip()]
+        self.lines = self.views.lines
+        self.regex_budget_ms = REGEX_TIME_BUDGET_MS
+        self.budget_exhausted = False
+        self._deadline: Optional[float] = None
+        self._page_index: Optional[PageIndex] = None
         
-    def extract_all_data(self) -> Dict[str, Any]:
+    def extract_all_data(self) -> ExtractionResult:
         """
         Master extraction function - extracts ALL tax-relevant data
         """
-        result = {
-            # Basic identification
-            'pan': None,
-            'name': None,
-            'financial_year': None,
-            'assessment_year': None,
-            'document_type': None,
-            'employer_name': None,
-            'employer_tan': None,
-            'all_pans_found': [],
-            'all_names_found': [],
-            
-            # Salary Income Breakdown (Form 16 Part B)
-            'gross_salary': 0.0,
-            'basic_salary': 0.0,
-            'hra_received': 0.0,
-            'special_allowance': 0.0,
-            'lta': 0.0,
-            'bonus': 0.0,
-            'perquisites': 0.0,
-            'profits_in_lieu_of_salary': 0.0,
-            
-            # Exemptions under Section 10
-            'exemptions': {
-                'hra_exemption': 0.0,
-                'lta_exemption': 0.0,
-                'standard_deduction': 0.0,
-                'professional_tax': 0.0,
-                'entertainment_allowance': 0.0,
-                'other_exemptions': 0.0,
-                'total_exemptions': 0.0
-            },
-            
-            # Net Salary after exemptions
-            'net_salary': 0.0,
-            
-            # Other Income Sources
-            'income_from_house_property': 0.0,
-            'income_from_other_sources': 0.0,
-            'interest_income': 0.0,
-            'dividend_income': 0.0,
-            'capital_gains_short_term': 0.0,
-            'capital_gains_long_term': 0.0,
-            'business_income': 0.0,
-            
-            # Gross Total Income
-            'gross_total_income': 0.0,
-            
-            # Chapter VI-A Deductions
-            'deductions': {
-                # Section 80C (Max ₹1,50,000)
-                '80C': 0.0,
-                '80C_details': {
-                    'ppf': 0.0,
-                    'epf': 0.0,
-                    'elss': 0.0,
-                    'life_insurance': 0.0,
-                    'nsc': 0.0,
-                    'tuition_fees': 0.0,
-                    'home_loan_principal': 0.0,
-                    'sukanya_samriddhi': 0.0,
-                    'tax_saving_fd': 0.0,
-                    'other_80c': 0.0
-                },
-                # Section 80CCC - Pension Fund
-                '80CCC': 0.0,
-                # Section 80CCD - NPS
-                '80CCD_1': 0.0,      # Employee contribution (part of 80C limit)
-                '80CCD_1B': 0.0,    # Additional NPS (₹50,000 extra)
-                '80CCD_2': 0.0,      # Employer NPS contribution (10% of salary)
-                # Section 80D - Health Insurance (Max ₹25,000 + ₹25,000 parents + ₹50,000 senior)
-                '80D': 0.0,
-                '80D_details': {
-                    'self_family': 0.0,
-                    'parents': 0.0,
-                    'preventive_health_checkup': 0.0
-                },
-                # Section 80DD - Disabled Dependent
-                '80DD': 0.0,
-                # Section 80DDB - Medical Treatment
-                '80DDB': 0.0,
-                # Section 80E - Education Loan Interest
-                '80E': 0.0,
-                # Section 80EE/80EEA - Home Loan Interest (First Time Buyers)
-                '80EE': 0.0,
-                '80EEA': 0.0,
-                # Section 80G - Donations
-                '80G': 0.0,
-                # Section 80GG - Rent Paid (no HRA)
-                '80GG': 0.0,
-                # Section 80GGA - Donations for Scientific Research
-                '80GGA': 0.0,
-                # Section 80GGC - Political Party Donations
-                '80GGC': 0.0,
-                # Section 80TTA - Savings Interest (Max ₹10,000)
-                '80TTA': 0.0,
-                # Section 80TTB - Senior Citizen Interest (Max ₹50,000)
-                '80TTB': 0.0,
-                # Section 80U - Disability
-                '80U': 0.0,
-                # Section 24(b) - Home Loan Interest
-                '24b_home_loan_interest': 0.0,
-                # Total Deductions
-                'total_deductions': 0.0
-            },
-            
-            # Net Taxable Income
-            'total_income': 0.0,  # After all deductions
-            'net_taxable_income': 0.0,
-            
-            # Tax Computation
-            'tax_on_total_income': 0.0,
-            'rebate_87a': 0.0,
-            'surcharge': 0.0,
-            'cess': 0.0,
-            'total_tax_liability': 0.0,
-            
-            # TDS Details
-            'total_tds': 0.0,
-            'tds_on_salary': 0.0,
-            'tds_on_other_income': 0.0,
-            'advance_tax_paid': 0.0,
-            'self_assessment_tax': 0.0,
-            
-            # Relief
-            'relief_89': 0.0,
-            
-            # Final
-            'tax_payable': 0.0,
-            'refund_due': 0.0,
-            
-            # Metadata
-            'extraction_confidence': 0.0,
-            'extraction_method': []
-        }
+        # Fixed-layout record (identification, salary, exemptions, other income,
+        # Chapter VI-A deductions, tax computation, TDS) - see utils/extraction_records.py
+        result = ExtractionResult()
         
+        if self.regex_budget_ms > 0:
+            self._deadline = time.perf_counter() + self.regex_budget_ms / 1000
+
         # Extract PANs
-        result['all_pans_found'] = extract_all_pans(self.text)
+        result['all_pans_found'] = extract_all_pans(self.text, text_upper=self.text)
         result['pan'] = self._extract_pan_smart()
         
         # Extract Names
         result['name'], result['all_names_found'] = self._extract_name_smart()
         
         # Extract Document Type FIRST (needed for document-specific extraction)
-        result['document_type'] = extract_document_type(self.text)
+        result['document_type'] = extract_document_type(self.text, text_upper=self.text)
         
         # Extract Financial Year
         result['financial_year'] = self._extract_fy_smart(result['document_type'])
@@ -213,6 +117,9 @@ class SmartExtractor:
         
         # Calculate confidence
         result['extraction_confidence'] = self._calculate_confidence(result)
+
+        if self.budget_exhausted:
+            result['extraction_method'].append('regex_budget_exhausted')
         
         return result
     
@@ -223,261 +130,35 @@ class SmartExtractor:
         """
         print("   📊 Extracting Form 16 data (comprehensive)...")
         
-        # === SALARY INCOME EXTRACTION ===
-        salary_patterns = {
-            'gross_salary': [
-                r'GROSS\s+SALARY\s*[\(\[]?.*?[\)\]]?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'SALARY\s+AS\s+PER\s+.*?SECTION\s+17\s*\(?\s*1\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'1\.\s*GROSS\s+SALARY\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'basic_salary': [
-                r'BASIC\s+(?:SALARY|PAY)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'BASIC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'hra_received': [
-                r'HOUSE\s+RENT\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'HRA\s+RECEIVED\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'HRA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'special_allowance': [
-                r'SPECIAL\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'OTHER\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'lta': [
-                r'LEAVE\s+TRAVEL\s+(?:ALLOWANCE|CONCESSION)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'LTA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'LTC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'bonus': [
-                r'BONUS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'PERFORMANCE\s+BONUS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'perquisites': [
-                r'PERQUISITES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'VALUE\s+OF\s+PERQUISITES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'17\s*\(?\s*2\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'profits_in_lieu_of_salary': [
-                r'PROFITS\s+IN\s+LIEU\s+OF\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'17\s*\(?\s*3\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in salary_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result[field] = value
-        
-        # === EXEMPTIONS EXTRACTION ===
-        exemption_patterns = {
-            'hra_exemption': [
-                r'(?:ALLOWANCE|HRA)\s+(?:EXEMPT|EXEMPTION)\s*(?:U/?S\s*10)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'10\s*\(?\s*13A\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'HRA\s+EXEMPTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'lta_exemption': [
-                r'(?:LTA|LTC)\s+EXEMPTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'10\s*\(?\s*5\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'standard_deduction': [
-                r'STANDARD\s+DEDUCTION\s*(?:U/?S\s*16\s*\(?\s*IA?\s*\)?)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'DEDUCTION\s+U/?S\s+16\s*\(?\s*IA?\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'16\s*\(?\s*IA?\s*\)?\s*STANDARD\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'professional_tax': [
-                r'PROFESSIONAL\s+TAX\s*(?:U/?S\s*16\s*\(?\s*III?\s*\)?)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TAX\s+ON\s+EMPLOYMENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'16\s*\(?\s*III?\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'entertainment_allowance': [
-                r'ENTERTAINMENT\s+ALLOWANCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'16\s*\(?\s*II\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'total_exemptions': [
-                r'TOTAL\s+(?:EXEMPTIONS?|DEDUCTIONS?\s+UNDER\s+16)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s*\(?\s*B\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in exemption_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result['exemptions'][field] = value
-        
-        # === CHAPTER VI-A DEDUCTIONS ===
-        deduction_patterns = {
-            '80C': [
-                r'(?:DEDUCTION|DEDN)\s+(?:U/?S|UNDER\s+SECTION)\s*80\s*C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'80\s*C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'SECTION\s+80C\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80CCC': [
-                r'80\s*CCC\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'PENSION\s+FUND\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80CCD_1': [
-                r'80\s*CCD\s*\(?\s*1\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'EMPLOYEE\s+(?:NPS|PENSION)\s+CONTRIBUTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80CCD_1B': [
-                r'80\s*CCD\s*\(?\s*1B\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'ADDITIONAL\s+NPS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80CCD_2': [
-                r'80\s*CCD\s*\(?\s*2\s*\)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'EMPLOYER\s+(?:NPS|PENSION)\s+CONTRIBUTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80D': [
-                r'80\s*D\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'(?:MEDICAL|HEALTH)\s+INSURANCE\s+PREMIUM\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80DD': [
-                r'80\s*DD\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'DISABLED\s+DEPENDENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80DDB': [
-                r'80\s*DDB\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'MEDICAL\s+TREATMENT\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80E': [
-                r'80\s*E\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'EDUCATION\s+LOAN\s+INTEREST\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80EE': [
-                r'80\s*EE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80EEA': [
-                r'80\s*EEA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80G': [
-                r'80\s*G\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'DONATIONS?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80GG': [
-                r'80\s*GG\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'RENT\s+PAID\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80TTA': [
-                r'80\s*TTA\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'SAVINGS\s+(?:ACCOUNT\s+)?INTEREST\s+DEDUCTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80TTB': [
-                r'80\s*TTB\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '80U': [
-                r'80\s*U\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'DISABILITY\s+DEDUCTION\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            '24b_home_loan_interest': [
-                r'(?:SECTION\s+)?24\s*\(?\s*B?\s*\)?\s*(?:HOME\s+LOAN\s+)?INTEREST\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'INTEREST\s+ON\s+(?:HOUSING|HOME)\s+LOAN\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'HOUSE\s+PROPERTY\s+LOSS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'total_deductions': [
-                r'TOTAL\s+DEDUCTION\s+UNDER\s+CHAPTER\s+VI[\-\s]?A\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'AGGREGATE\s+OF\s+DEDUCTIONS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s+DEDUCTIONS?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in deduction_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result['deductions'][field] = value
-        
-        # === INCOME COMPUTATION ===
-        income_patterns = {
-            'gross_total_income': [
-                r'GROSS\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s+GROSS\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'total_income': [
-                r'TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'NET\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'net_taxable_income': [
-                r'NET\s+TAXABLE\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TAXABLE\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'income_from_house_property': [
-                r'INCOME\s+(?:FROM\s+)?HOUSE\s+PROPERTY\s*[:\-]?\s*(?:RS?\.?\s*)?\(?([0-9,]+(?:\.\d{2})?)\)?',
-                r'LOSS\s+FROM\s+HOUSE\s+PROPERTY\s*[:\-]?\s*(?:RS?\.?\s*)?\(?([0-9,]+(?:\.\d{2})?)\)?',
-            ],
-            'income_from_other_sources': [
-                r'INCOME\s+FROM\s+OTHER\s+SOURCES\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in income_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result[field] = value
-        
-        # === TAX COMPUTATION ===
-        tax_patterns = {
-            'tax_on_total_income': [
-                r'TAX\s+ON\s+TOTAL\s+INCOME\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'INCOME\s+TAX\s+COMPUTED\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'rebate_87a': [
-                r'REBATE\s+(?:U/?S|UNDER\s+SECTION)?\s*87\s*A?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'surcharge': [
-                r'SURCHARGE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'cess': [
-                r'(?:HEALTH\s+(?:AND|&)\s+EDUCATION\s+)?CESS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'H\s*&?\s*E\s*CESS\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'total_tax_liability': [
-                r'TOTAL\s+TAX\s+(?:LIABILITY|PAYABLE)\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TAX\s+PAYABLE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'relief_89': [
-                r'RELIEF\s+(?:U/?S|UNDER\s+SECTION)?\s*89\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in tax_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result[field] = value
-        
-        # === TDS EXTRACTION ===
-        tds_patterns = {
-            'total_tds': [
-                r'TOTAL\s+(?:TAX\s+)?(?:TDS\s+)?DEDUCTED\s*(?:AT\s+SOURCE)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TDS\s+(?:ON\s+SALARY)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-                r'TAX\s+DEDUCTED\s+AT\s+SOURCE\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'tds_on_salary': [
-                r'TDS\s+ON\s+SALARY\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'advance_tax_paid': [
-                r'ADVANCE\s+TAX\s+(?:PAID)?\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'self_assessment_tax': [
-                r'SELF\s+ASSESSMENT\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in tds_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
-            if value:
-                result[field] = value
+        # Salary, exemptions, Chapter VI-A, income, tax and TDS fields
+        # (precompiled patterns from utils.extraction_patterns, in priority order).
+        # One scan locates every field label; patterns are then only tried there.
+        # Patterns without a literal anchor and the contextual OCR fallbacks below
+        # are limited to the pages where the group's labels occur (Part A identity
+        # pages, the Part B salary breakup page, ...); anchored patterns are already
+        # tried only at their labels, so the page limit does not narrow them.
+        anchor_index = get_scanner('form16').index(self.text)
+        group_spans = {}
+        for group, fields in get_compiled_patterns('form16').items():
+            target = FORM16_GROUP_TARGETS[group]
+            spans = group_spans[group] = self._group_spans(fields, anchor_index)
+            for field, patterns in fields.items():
+                value = self._extract_amount_multi_pattern(patterns, anchor_index, spans)
+                if value:
+                    if target:
+                        result[target][field] = value
+                    else:
+                        result[field] = value
 
         # === OCR FALLBACKS FOR NOISY FORM 16 TEXT ===
         # OCR output often inserts symbols/noise between labels and amounts.
         # Use contextual window extraction so key values are not missed.
+        context_labels = get_compiled_patterns('form16_context')['labels']
         if result.get('gross_total_income', 0) == 0:
             gross_total_income = self._extract_contextual_amount(
-                label_patterns=[
-                    r'GROSS\s+TOTAL\s+INCOME',
-                    r'TOTAL\s+INCOME\s*\(\s*6\s*\+\s*8\s*\)',
-                    r'NET\s+TAXABLE\s+INCOME',
-                ],
+                label_patterns=context_labels['gross_total_income'],
                 search_window=260,
+                spans=group_spans['income'],
                 min_value=50000,
             )
             if gross_total_income:
@@ -485,12 +166,9 @@ class SmartExtractor:
 
         if result.get('gross_salary', 0) == 0:
             gross_salary = self._extract_contextual_amount(
-                label_patterns=[
-                    r'GROSS\s+SALARY',
-                    r'SALARY\s+AS\s+PER',
-                    r'TOTAL\s+SALARY',
-                ],
+                label_patterns=context_labels['gross_salary'],
                 search_window=260,
+                spans=group_spans['salary'],
                 min_value=50000,
             )
             if gross_salary:
@@ -498,11 +176,9 @@ class SmartExtractor:
 
         if result.get('total_income', 0) == 0:
             total_income = self._extract_contextual_amount(
-                label_patterns=[
-                    r'TOTAL\s+INCOME',
-                    r'INCOME\s+CHARGEABLE\s+UNDER\s+THE\s+HEAD\s+SALARIES',
-                ],
+                label_patterns=context_labels['total_income'],
                 search_window=260,
+                spans=group_spans['income'],
                 min_value=50000,
             )
             if total_income:
@@ -512,13 +188,9 @@ class SmartExtractor:
             gross_reference = result.get('gross_total_income', 0) or result.get('gross_salary', 0)
             tds_upper_limit = gross_reference * 0.35 if gross_reference else None
             total_tds = self._extract_contextual_amount(
-                label_patterns=[
-                    r'LESS\s*[:\-]?\s*TAX\s+DEDUCTED\s+AT\s+SOURCE',
-                    r'NET\s+TAX\s+PAYABLE',
-                    r'TOTAL\s+AMOUNT\s+OF\s+TAX\s+DEDUCTED',
-                    r'TOTAL\s+TAX\s+LIABILITY',
-                ],
+                label_patterns=context_labels['total_tds'],
                 search_window=180,
+                spans=group_spans['tds'],
                 min_value=5000,
                 max_value=tds_upper_limit,
             )
@@ -547,26 +219,23 @@ class SmartExtractor:
         # Next Line: 1069432.00 (Gross Amount)
         # Next Line: 88824.00 (Total TDS)
         
-        lines = self.original_text.split('\n')  # Use original text to preserve case
-        lines = [line.strip() for line in lines]
+        lines = self.views.raw_lines  # Original text to preserve case
+        upper_lines = self.views.upper_lines
         
         gross_salary = 0.0
         total_tds = 0.0
         tds_amounts = []
         salary_amounts = []
         
-        # Look for TAN pattern followed by amounts
-        tan_pattern = r'^[A-Z]{4}\d{5}[A-Z]$'  # e.g., PNEF01495E
-        amount_pattern = r'^(\d+(?:\.\d{2})?)$'  # e.g., 1069432.00
-        
+        # Look for TAN pattern followed by amounts (LINE_TAN_PATTERN / LINE_AMOUNT_PATTERN)
         for i, line in enumerate(lines):
             # Check if this line is a TAN
-            if re.match(tan_pattern, line):
+            if LINE_TAN_PATTERN.match(line):
                 # Look at next 3 lines for amounts
                 for j in range(1, 4):
                     if i + j < len(lines):
                         next_line = lines[i + j].strip()
-                        amt_match = re.match(amount_pattern, next_line)
+                        amt_match = LINE_AMOUNT_PATTERN.match(next_line)
                         if amt_match:
                             amt = float(amt_match.group(1))
                             if amt > 50000:  # Likely salary amount
@@ -581,7 +250,7 @@ class SmartExtractor:
                 for j in range(1, 8):
                     if i + j < len(lines):
                         next_line = lines[i + j].strip()
-                        amt_match = re.match(amount_pattern, next_line)
+                        amt_match = LINE_AMOUNT_PATTERN.match(next_line)
                         if amt_match:
                             amt = float(amt_match.group(1))
                             if amt > 10000:  # Monthly salary
@@ -591,13 +260,13 @@ class SmartExtractor:
                             break  # Found first amount after 192
             
             # Direct amount extraction for standalone amounts after Part-I header
-            if 'PART-I' in line.upper() or 'TAX DEDUCTED AT SOURCE' in line.upper():
+            if 'PART-I' in upper_lines[i] or 'TAX DEDUCTED AT SOURCE' in upper_lines[i]:
                 # Scan next 20 lines for amount patterns
                 for j in range(1, 20):
                     if i + j < len(lines):
                         next_line = lines[i + j].strip()
                         # Look for large standalone numbers (company total amounts)
-                        amt_match = re.match(r'^(\d{5,}(?:\.\d{2})?)$', next_line)
+                        amt_match = LINE_LARGE_AMOUNT_5_PATTERN.match(next_line)
                         if amt_match:
                             amt = float(amt_match.group(1))
                             if gross_salary == 0 and amt > 100000:
@@ -616,7 +285,7 @@ class SmartExtractor:
         if gross_salary == 0:
             # Look for numbers > 100000 that could be salary
             for line in lines:
-                amt_match = re.match(r'^(\d{6,}(?:\.\d{2})?)$', line.strip())
+                amt_match = LINE_LARGE_AMOUNT_6_PATTERN.match(line.strip())
                 if amt_match:
                     amt = float(amt_match.group(1))
                     if 100000 < amt < 50000000:
@@ -626,7 +295,7 @@ class SmartExtractor:
         if total_tds == 0 and gross_salary > 0:
             # Look for TDS amount (typically 5-30% of salary)
             for line in lines:
-                amt_match = re.match(r'^(\d{4,}(?:\.\d{2})?)$', line.strip())
+                amt_match = LINE_LARGE_AMOUNT_4_PATTERN.match(line.strip())
                 if amt_match:
                     amt = float(amt_match.group(1))
                     if 5000 < amt < gross_salary * 0.35:
@@ -645,17 +314,9 @@ class SmartExtractor:
             print(f"   Found TDS: ₹{total_tds:,.0f}")
         
         # Legacy patterns as fallback
-        tds_patterns = {
-            'advance_tax_paid': [
-                r'ADVANCE\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-            'self_assessment_tax': [
-                r'SELF\s+ASSESSMENT\s+TAX\s*[:\-]?\s*(?:RS?\.?\s*)?([0-9,]+(?:\.\d{2})?)',
-            ],
-        }
-        
-        for field, patterns in tds_patterns.items():
-            value = self._extract_amount_multi_pattern(patterns)
+        anchor_index = get_scanner('form26as').index(self.text)
+        for field, patterns in get_compiled_patterns('form26as')['tds'].items():
+            value = self._extract_amount_multi_pattern(patterns, anchor_index)
             if value:
                 result[field] = value
         
@@ -668,8 +329,8 @@ class SmartExtractor:
         """
         print("   📊 Extracting AIS data...")
         
-        lines = self.original_text.split('\n')
-        lines = [line.strip() for line in lines]
+        lines = self.views.raw_lines
+        upper_lines = self.views.upper_lines
         
         gross_salary = 0.0
         total_tds = 0.0
@@ -682,32 +343,25 @@ class SmartExtractor:
         # Line: COUNT (e.g., 12)  
         # Line: AMOUNT (e.g., 10,69,432)
         
-        # Parse Indian number format (10,69,432 = 1069432)
-        def parse_indian_amount(amt_str):
-            """Parse Indian number format like 10,69,432"""
-            if not amt_str:
-                return 0.0
-            # Remove commas and convert
-            cleaned = amt_str.replace(',', '').replace(' ', '').strip()
-            try:
-                return float(cleaned)
-            except ValueError:
-                return 0.0
+        # Every line parsed as an amount once, up front (10,69,432 = 1069432);
+        # the look-aheads below index into these instead of re-parsing lines
+        column, valid = parse_amount_column(lines)
+        line_amounts = column.tolist()
+        is_amount = valid.tolist()
         
         i = 0
         while i < len(lines):
             line = lines[i]
-            line_upper = line.upper()
+            line_upper = upper_lines[i]
             
             # Look for Salary section (TDS-192)
             if 'TDS-192' in line_upper or ('SECTION 192' in line_upper and 'SALARY' in line_upper):
                 # Look ahead for amount - it's usually within next 5 lines
                 for j in range(1, 8):
                     if i + j < len(lines):
-                        next_line = lines[i + j].strip()
                         # Check if line looks like a formatted amount (e.g., 10,69,432)
-                        if re.match(r'^[\d,]+$', next_line) and len(next_line) > 4:
-                            amt = parse_indian_amount(next_line)
+                        if is_amount[i + j] and len(lines[i + j]) > 4:
+                            amt = line_amounts[i + j]
                             if amt > 50000:  # Reasonable salary
                                 gross_salary = max(gross_salary, amt)
                                 break
@@ -717,9 +371,8 @@ class SmartExtractor:
             if 'TDS-194A' in line_upper:
                 for j in range(1, 8):
                     if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if re.match(r'^[\d,]+$', next_line) and len(next_line) > 2:
-                            amt = parse_indian_amount(next_line)
+                        if is_amount[i + j] and len(lines[i + j]) > 2:
+                            amt = line_amounts[i + j]
                             # Reasonable interest income: 100 < amt < 1 crore
                             if 100 < amt < 10000000:
                                 interest_income = max(interest_income, amt)
@@ -729,9 +382,8 @@ class SmartExtractor:
             if 'TDS-194' in line_upper and 'TDS-194A' not in line_upper:
                 for j in range(1, 8):
                     if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if re.match(r'^[\d,]+$', next_line) and len(next_line) > 2:
-                            amt = parse_indian_amount(next_line)
+                        if is_amount[i + j] and len(lines[i + j]) > 2:
+                            amt = line_amounts[i + j]
                             # Reasonable dividend: 100 < amt < 1 crore
                             if 100 < amt < 10000000:
                                 dividend_income = max(dividend_income, amt)
@@ -742,9 +394,8 @@ class SmartExtractor:
                 # Scan following lines for amounts
                 for j in range(1, 20):
                     if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if re.match(r'^[\d,]+$', next_line):
-                            amt = parse_indian_amount(next_line)
+                        if is_amount[i + j]:
+                            amt = line_amounts[i + j]
                             if 1000 < amt < 1000000:  # TDS range
                                 total_tds += amt
             
@@ -753,13 +404,12 @@ class SmartExtractor:
         # Fallback: scan for AMOUNT header and get the value after it
         if gross_salary == 0:
             for i, line in enumerate(lines):
-                if line.upper() == 'AMOUNT':
+                if upper_lines[i] == 'AMOUNT':
                     # Look at next few lines for a large number
                     for j in range(1, 5):
                         if i + j < len(lines):
-                            next_line = lines[i + j].strip()
-                            if re.match(r'^[\d,]+$', next_line):
-                                amt = parse_indian_amount(next_line)
+                            if is_amount[i + j]:
+                                amt = line_amounts[i + j]
                                 if amt > 100000:
                                     gross_salary = amt
                                     break
@@ -769,12 +419,12 @@ class SmartExtractor:
         if total_tds == 0:
             # Look for TDS in quarterly entries
             for i, line in enumerate(lines):
-                if re.match(r'^[\d,]+$', line.strip()) and len(line.strip()) >= 4:
+                if is_amount[i] and len(line) >= 4:
                     # Check context - is this a TDS amount?
                     if i > 2:
-                        prev_lines = ' '.join(lines[max(0,i-5):i]).upper()
+                        prev_lines = ' '.join(upper_lines[max(0,i-5):i])
                         if 'TDS' in prev_lines or 'DEDUCTED' in prev_lines or 'Q1' in prev_lines or 'Q2' in prev_lines or 'Q3' in prev_lines or 'Q4' in prev_lines:
-                            amt = parse_indian_amount(line.strip())
+                            amt = line_amounts[i]
                             if 1000 < amt < 100000:  # Monthly TDS range
                                 total_tds += amt
         
@@ -810,12 +460,28 @@ class SmartExtractor:
         result['total_tds'] = self._extract_amount('tax_deducted')
         result['total_tax_deducted'] = result.get('total_tds', 0)
     
-    def _extract_amount_multi_pattern(self, patterns: List[str]) -> Optional[float]:
+    def _extract_amount_multi_pattern(
+        self,
+        patterns: Sequence[Union[str, Pattern]],
+        anchor_index: Optional[AnchorIndex] = None,
+        spans: Optional[List[Span]] = None,
+    ) -> Optional[float]:
         """
         Extract amount using multiple patterns, return first match
+        Accepts precompiled patterns (from the registry) or raw pattern strings.
+        With an anchor_index (see utils.pattern_scanner) patterns are only tried
+        at positions where their label occurs, and only within spans if given.
+        Returns None without trying further patterns once the regex budget is spent.
         """
         for pattern in patterns:
-            match = re.search(pattern, self.text, re.IGNORECASE)
+            if self._budget_spent():
+                return None
+            if isinstance(pattern, str):
+                pattern = re.compile(pattern, re.IGNORECASE)
+            if anchor_index:
+                match = anchor_index.search(pattern, self._deadline, spans)
+            else:
+                match = pattern.search(self.text)
             if match:
                 amount = self._parse_amount(match.group(1))
                 if amount is not None:
@@ -828,21 +494,31 @@ class SmartExtractor:
         search_window: int = 220,
         min_value: float = 0.0,
         max_value: Optional[float] = None,
+        spans: Optional[List[Span]] = None,
     ) -> Optional[float]:
         """
         Extract first reliable amount that appears near semantic labels.
         Useful for OCR text where symbols/noise appear between label and value.
+        With spans, labels are only looked for inside those (start, end) ranges.
         """
-        normalized_text = re.sub(r'\s+', ' ', self.text)
-        number_pattern = r'(?<![A-Z0-9])(?:\d{1,3}(?:,\d{2,3})+|\d{4,})(?:\.\d{2})?'
+        # self.text is already whitespace-normalised (TextViews.normalized)
+        normalized_text = self.text
 
         for label_pattern in label_patterns:
-            for label_match in re.finditer(label_pattern, normalized_text, re.IGNORECASE):
+            if isinstance(label_pattern, str):
+                label_pattern = re.compile(label_pattern, re.IGNORECASE)
+            label_matches = (
+                label_pattern.finditer(normalized_text) if spans is None
+                else (m for start, end in spans for m in label_pattern.finditer(normalized_text, start, end))
+            )
+            for label_match in label_matches:
+                if self._budget_spent():
+                    return None
                 start = label_match.end()
                 window_text = normalized_text[start:start + search_window]
 
                 candidates = []
-                for raw in re.findall(number_pattern, window_text):
+                for raw in CONTEXT_NUMBER_PATTERN.findall(window_text):
                     amount = self._parse_amount(raw)
                     if amount is None:
                         continue
@@ -857,30 +533,37 @@ class SmartExtractor:
 
         return None
 
+    def _group_spans(self, fields: Dict[str, Sequence[Pattern]], anchor_index: AnchorIndex) -> Optional[List[Span]]:
+        """
+        Text ranges of the pages on which a field group's labels occur.
+        These pages are the union over the group's own anchors, so they only limit
+        searches that don't start at an anchor: patterns without a literal anchor
+        and the contextual fallbacks. Anchored patterns are unaffected.
+        None (search everywhere) for single-page text or when no label of the group was found.
+        """
+        if self._page_index is None:
+            self._page_index = PageIndex(self.text)
+        if self._page_index.page_count < 2:
+            return None
+        patterns = [pattern for group_patterns in fields.values() for pattern in group_patterns]
+        pages = anchor_index.pages_for(patterns, self._page_index)
+        return self._page_index.spans(pages) if pages else None
+
+    def _budget_spent(self) -> bool:
+        """True once this document's regex time budget has run out"""
+        if not self.budget_exhausted and self._deadline is not None and time.perf_counter() > self._deadline:
+            self.budget_exhausted = True
+            print(f"   ⚠️ Regex time budget ({self.regex_budget_ms:.0f} ms) exhausted - skipping remaining patterns")
+        return self.budget_exhausted
+
     def _parse_amount(self, raw_value: Any) -> Optional[float]:
         """Parse a numeric string/number into float."""
-        if raw_value is None:
-            return None
-        if isinstance(raw_value, (int, float)):
-            return float(raw_value)
-        if isinstance(raw_value, str):
-            cleaned = raw_value.replace(',', '').replace(' ', '').replace('₹', '').replace('RS.', '').replace('RS', '')
-            try:
-                return float(cleaned)
-            except ValueError:
-                return None
-        return None
+        return parse_indian_amount(raw_value)
     
     def _extract_assessment_year(self) -> Optional[str]:
         """Extract Assessment Year from document"""
-        ay_patterns = [
-            r'ASSESSMENT\s+YEAR\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
-            r'A\.?Y\.?\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
-            r'AY\s*(\d{4})\s*-\s*(\d{2})',
-        ]
-        
-        for pattern in ay_patterns:
-            match = re.search(pattern, self.text)
+        for pattern in AY_PATTERNS:
+            match = pattern.search(self.text)
             if match:
                 return f"{match.group(1)}-{match.group(2)}"
         return None
@@ -939,7 +622,7 @@ class SmartExtractor:
         if self.user_pan:
             user_pan_clean = self.user_pan.upper().replace(' ', '')
             # Check exact match
-            if user_pan_clean in self.text.replace(' ', ''):
+            if user_pan_clean in self.views.compact:
                 return user_pan_clean
             
             # Check with spaces/separators
@@ -948,7 +631,7 @@ class SmartExtractor:
                 return user_pan_clean
         
         # Strategy 2: Extract all PANs and prioritize
-        all_pans = extract_all_pans(self.text)
+        all_pans = extract_all_pans(self.text, text_upper=self.text)
         
         if not all_pans:
             return None
@@ -988,18 +671,8 @@ class SmartExtractor:
                 all_names.append(name_from_pan)
         
         # Strategy 2: Look for common name patterns
-        name_patterns = [
-            r'NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-            r'EMPLOYEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-            r'ASSESSEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-            r'DEDUCTEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-            r'MR\.\s+([A-Z][A-Z\s\.]{2,50})',
-            r'MRS\.\s+([A-Z][A-Z\s\.]{2,50})',
-            r'MS\.\s+([A-Z][A-Z\s\.]{2,50})',
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.findall(pattern, self.text)
+        for pattern in NAME_PATTERNS:
+            matches = pattern.findall(self.text)
             for match in matches:
                 name = match.strip()
                 if self._is_valid_name(name):
@@ -1033,13 +706,8 @@ class SmartExtractor:
         context = self.text[start:end]
         
         # Look for name patterns
-        name_patterns = [
-            r'NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-            r'EMPLOYEE\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.]{2,50})',
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, context)
+        for pattern in NAME_NEAR_PAN_PATTERNS:
+            match = pattern.search(context)
             if match:
                 name = match.group(1).strip()
                 if self._is_valid_name(name):
@@ -1083,19 +751,14 @@ class SmartExtractor:
     
     def _extract_fy_smart(self, doc_type: str = None) -> Optional[str]:
         """Smart financial year extraction with document type awareness"""
-        fy = pick_fy(self.text, self.expected_fy, doc_type)
+        fy = pick_fy(self.text, self.expected_fy, doc_type, lines=self.views.lines)
         if fy:
             return fy
         
         # Additional patterns for edge cases
-        fy_patterns = [
-            r'F\.?Y\.?\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',  # F.Y. 2024-25
-            r'FINANCIAL\s+YEAR\s*[:\-]?\s*(\d{4})\s*-\s*(\d{2})',
-            # REMOVED generic pattern to avoid confusing Assessment Year with Financial Year
-        ]
-        
-        for pattern in fy_patterns:
-            match = re.search(pattern, self.text)
+        # (no generic pattern, to avoid confusing Assessment Year with Financial Year)
+        for pattern in FY_PATTERNS:
+            match = pattern.search(self.text)
             if match:
                 if len(match.groups()) == 2:
                     year1 = match.group(1)
@@ -1106,14 +769,8 @@ class SmartExtractor:
     
     def _extract_employer_name(self) -> Optional[str]:
         """Extract employer/deductor name"""
-        patterns = [
-            r'EMPLOYER\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
-            r'DEDUCTOR\s+NAME\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
-            r'NAME\s+OF\s+EMPLOYER\s*[:\-]?\s*([A-Z][A-Z\s\.,&]{5,100})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, self.text)
+        for pattern in EMPLOYER_PATTERNS:
+            match = pattern.search(self.text)
             if match:
                 name = match.group(1).strip()
                 # Clean up
@@ -1125,8 +782,7 @@ class SmartExtractor:
     def _extract_tan(self) -> Optional[str]:
         """Extract TAN (Tax Deduction Account Number)"""
         # TAN format: 4 letters + 5 digits + 1 letter (e.g., ABCD12345E)
-        tan_pattern = r'\b[A-Z]{4}\d{5}[A-Z]\b'
-        match = re.search(tan_pattern, self.text)
+        match = TAN_PATTERN.search(self.text)
         if match:
             return match.group(0)
         return None
@@ -1136,20 +792,10 @@ class SmartExtractor:
         Extract monetary amounts
         amount_type: 'gross_salary', 'tax_deducted', etc.
         """
-        patterns = {
-            'gross_salary': [
-                r'GROSS\s+SALARY\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s+GROSS\s+SALARY\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
-            ],
-            'tax_deducted': [
-                r'TAX\s+DEDUCTED\s+AT\s+SOURCE\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
-                r'TOTAL\s+TAX\s+DEDUCTED\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
-                r'TDS\s*[:\-]?\s*RS?\.?\s*([0-9,]+(?:\.\d{2})?)',
-            ]
-        }
+        patterns = get_compiled_patterns('generic')['amounts']
         
-        for pattern in patterns.get(amount_type, []):
-            match = re.search(pattern, self.text, re.IGNORECASE)
+        for pattern in patterns.get(amount_type, ()):
+            match = pattern.search(self.text)
             if match:
                 amount_str = match.group(1).replace(',', '')
                 try:
@@ -1233,9 +879,10 @@ def extract_with_smart_extractor(text: str, user_name: str = None, user_pan: str
     """
     Main function to extract data using smart extractor
     Returns comprehensive tax data for accurate calculations
+    (sparse dict: fields that were not found are omitted, read them with .get(key, 0))
     """
     extractor = SmartExtractor(text, user_name, user_pan, expected_fy)
-    return extractor.extract_all_data()
+    return extractor.extract_all_data().to_dict()
 
 
 def flatten_extracted_data(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,358 @@
+"""
+Layout-Aware Table Extraction (Form 26AS / AIS)
+Rebuilds table rows and cells from PyMuPDF word coordinates (page.get_text("words"))
+instead of running regexes over the flattened page text, and parses the TDS /
+information tables into typed transaction records in a single pass over the rows.
+
+Rows are recognised by their cell contents, not by header positions, so the parser
+copes with tables that continue across pages without repeating their headers:
+- Form 26AS Part-I deductor row:  Sr | Name of Deductor | TAN | Paid | Deducted | Deposited
+- Form 26AS Part-I transaction:   Sr | Section | Date | Status | Booking Date | ... | Paid | Deducted | Deposited
+- AIS TDS/TCS and SFT rows:       Sr | Code (TDS-192) | Description | Source | Count | Amount
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import fitz  # PyMuPDF
+
+from utils.amount_parser import parse_indian_amount
+
+# Words whose vertical centres are closer than this (points) belong to the same row
+ROW_TOLERANCE = 3.0
+# Horizontal gap (points) above which two words of a row are in different cells
+CELL_GAP = 6.0
+
+TAN_PATTERN = re.compile(r'^[A-Z]{4}\d{5}[A-Z]$')
+AMOUNT_PATTERN = re.compile(r'^-?(?:\d{1,3}(?:,\d{2,3})+|\d+)(?:\.\d{1,2})?$')
+SECTION_PATTERN = re.compile(r'^(19[2-6][A-Z]{0,3})$')
+DATE_PATTERN = re.compile(r'^\d{1,2}[-/](?:[A-Z]{3}|\d{2})[-/]\d{4}$', re.IGNORECASE)
+INFO_CODE_PATTERN = re.compile(r'^(TDS|TCS|SFT)-([0-9A-Z()]+)$', re.IGNORECASE)
+TAN_IN_TEXT_PATTERN = re.compile(r'\b([A-Z]{4}\d{5}[A-Z])\b')
+
+# (x0, x1, text) of one cell
+Cell = Tuple[float, float, str]
+
+
+# ==========================================
+# Typed records
+# ==========================================
+
+@dataclass
+class DeductorSummary:
+    """Form 26AS Part-I: one row per deductor"""
+    page: int
+    deductor_name: str
+    deductor_tan: str
+    amount_paid: float
+    tds_deducted: float
+    tds_deposited: float
+
+
+@dataclass
+class TdsTransaction:
+    """Form 26AS Part-I: one credit under a deductor"""
+    page: int
+    deductor_tan: Optional[str]
+    section: str
+    transaction_date: str
+    booking_status: Optional[str]
+    amount_paid: float
+    tds_deducted: float
+    tds_deposited: float
+
+
+@dataclass
+class AisTransaction:
+    """AIS TDS/TCS or SFT information row"""
+    page: int
+    information_code: str
+    description: str
+    source: str
+    source_tan: Optional[str]
+    count: Optional[int]
+    amount: float
+
+
+TableRecord = Union[DeductorSummary, TdsTransaction, AisTransaction]
+
+
+# ==========================================
+# Row / cell reconstruction
+# ==========================================
+
+def _parse_amount(token: str) -> float:
+    return parse_indian_amount(token) or 0.0
+
+
+def group_rows(words: Iterable[Sequence]) -> List[List[Cell]]:
+    """
+    Group PyMuPDF words (x0, y0, x1, y1, text, ...) into rows of cells.
+    Words are ordered by vertical centre, then split into rows wherever the
+    centre moves by more than ROW_TOLERANCE; within a row, words closer than
+    CELL_GAP are joined into one cell.
+    """
+    ordered = sorted(((w[1] + w[3]) / 2, w[0], w[2], w[4]) for w in words if str(w[4]).strip())
+    rows: List[List[Cell]] = []
+    current: List[Tuple[float, float, str]] = []
+    row_y = None
+
+    def flush():
+        if not current:
+            return
+        current.sort()
+        cells: List[Cell] = []
+        for x0, x1, text in current:
+            if cells and x0 - cells[-1][1] <= CELL_GAP:
+                prev_x0, _, prev_text = cells[-1]
+                cells[-1] = (prev_x0, x1, f"{prev_text} {text}")
+            else:
+                cells.append((x0, x1, text))
+        rows.append(cells)
+
+    for y, x0, x1, text in ordered:
+        if row_y is not None and y - row_y > ROW_TOLERANCE:
+            flush()
+            current = []
+            row_y = None
+        if row_y is None:
+            row_y = y
+        current.append((x0, x1, text))
+    flush()
+    return rows
+
+
+def _trailing_amounts(texts: List[str]) -> List[float]:
+    """Amount cells at the end of a row (right-most columns), left to right"""
+    amounts: List[float] = []
+    for text in reversed(texts):
+        if not AMOUNT_PATTERN.match(text):
+            break
+        amounts.append(_parse_amount(text))
+    return amounts[::-1]
+
+
+# ==========================================
+# Row classification (single pass)
+# ==========================================
+
+class TableParser:
+    """Feeds rows in reading order and collects typed records"""
+
+    def __init__(self):
+        self.records: List[TableRecord] = []
+        self._current_tan: Optional[str] = None
+        # Name / source column of the last record, for cells wrapped onto the next line
+        self._wrap_target: Optional[Tuple[TableRecord, str, float, float]] = None
+
+    def feed(self, cells: List[Cell], page: int):
+        texts = [c[2].strip() for c in cells]
+        record = (
+            self._deductor_row(cells, texts, page)
+            or self._transaction_row(texts, page)
+            or self._ais_row(cells, texts, page)
+        )
+        if record is not None:
+            self.records.append(record)
+            return
+        self._continuation(cells, texts)
+
+    def _deductor_row(self, cells: List[Cell], texts: List[str], page: int) -> Optional[DeductorSummary]:
+        tan_index = next((i for i, t in enumerate(texts) if TAN_PATTERN.match(t)), None)
+        if tan_index is None or tan_index == 0:
+            return None
+        amounts = _trailing_amounts(texts[tan_index + 1:])
+        if len(amounts) < 2 or len(amounts) != len(texts) - tan_index - 1:
+            return None
+        name_cells = [cell for cell, text in zip(cells[:tan_index], texts) if not text.isdigit()]
+        if not name_cells:
+            return None
+        amounts += [amounts[-1]] * (3 - len(amounts))
+        record = DeductorSummary(
+            page=page,
+            deductor_name=" ".join(c[2].strip() for c in name_cells),
+            deductor_tan=texts[tan_index],
+            amount_paid=amounts[0],
+            tds_deducted=amounts[1],
+            tds_deposited=amounts[2],
+        )
+        self._current_tan = record.deductor_tan
+        self._wrap_target = (record, "deductor_name", name_cells[0][0], name_cells[-1][1])
+        return record
+
+    def _transaction_row(self, texts: List[str], page: int) -> Optional[TdsTransaction]:
+        date_index = next((i for i, t in enumerate(texts) if DATE_PATTERN.match(t)), None)
+        if date_index is None or date_index == 0:
+            return None
+        # The section is the last section-like cell before the transaction date: a leading
+        # Sr. No. of 192-196 matches SECTION_PATTERN too, but comes before the section column
+        section_index = next(
+            (i for i in range(min(date_index, 3) - 1, -1, -1) if SECTION_PATTERN.match(texts[i])), None
+        )
+        if section_index is None:
+            return None
+        amounts = _trailing_amounts(texts[date_index + 1:])
+        if len(amounts) < 2:
+            return None
+        amounts += [amounts[-1]] * (3 - len(amounts))
+        status = texts[date_index + 1] if date_index + 1 < len(texts) - 3 else None
+        self._wrap_target = None
+        return TdsTransaction(
+            page=page,
+            deductor_tan=self._current_tan,
+            section=texts[section_index],
+            transaction_date=texts[date_index],
+            booking_status=status if status and len(status) == 1 else None,
+            amount_paid=amounts[-3],
+            tds_deducted=amounts[-2],
+            tds_deposited=amounts[-1],
+        )
+
+    def _ais_row(self, cells: List[Cell], texts: List[str], page: int) -> Optional[AisTransaction]:
+        code_index = next((i for i, t in enumerate(texts[:3]) if INFO_CODE_PATTERN.match(t)), None)
+        if code_index is None or not AMOUNT_PATTERN.match(texts[-1]):
+            return None
+        middle = texts[code_index + 1:-1]
+        count = None
+        if middle and middle[-1].isdigit():
+            count = int(middle[-1])
+            middle = middle[:-1]
+        description = middle[0] if middle else ""
+        source = " ".join(middle[1:])
+        tan_match = TAN_IN_TEXT_PATTERN.search(source.upper())
+        record = AisTransaction(
+            page=page,
+            information_code=texts[code_index].upper(),
+            description=description,
+            source=source,
+            source_tan=tan_match.group(1) if tan_match else None,
+            count=count,
+            amount=_parse_amount(texts[-1]),
+        )
+        if source:
+            source_cells = cells[code_index + 2:code_index + 1 + len(middle)]
+            if source_cells:
+                self._wrap_target = (record, "source", source_cells[0][0], source_cells[-1][1])
+        return record
+
+    def _continuation(self, cells: List[Cell], texts: List[str]):
+        """Append a wrapped name/source line to the record above it"""
+        if not self._wrap_target or not texts:
+            self._wrap_target = None
+            return
+        record, attribute, x0, x1 = self._wrap_target
+        inside = all(c[0] >= x0 - CELL_GAP and c[1] <= x1 + 4 * CELL_GAP for c in cells)
+        if inside and not any(AMOUNT_PATTERN.match(t) for t in texts):
+            setattr(record, attribute, f"{getattr(record, attribute)} {' '.join(texts)}".strip())
+            if isinstance(record, AisTransaction) and not record.source_tan:
+                tan_match = TAN_IN_TEXT_PATTERN.search(record.source.upper())
+                record.source_tan = tan_match.group(1) if tan_match else None
+        else:
+            self._wrap_target = None
+
+
+def parse_table_rows(pages: Iterable[Tuple[int, Iterable[Sequence]]]) -> List[TableRecord]:
+    """Parse (page number, PyMuPDF words) pairs into typed records"""
+    parser = TableParser()
+    for page_number, words in pages:
+        for cells in group_rows(words):
+            parser.feed(cells, page_number)
+    return parser.records
+
+
+# ==========================================
+# Summaries in the extracted-data format
+# ==========================================
+
+def summarize_form26as(records: List[TableRecord]) -> Dict[str, Any]:
+    """Fields in the shape the AI/pattern extraction uses (tds_details, tds_by_deductor ...)"""
+    deductors = [r for r in records if isinstance(r, DeductorSummary)]
+    transactions = [r for r in records if isinstance(r, TdsTransaction)]
+    if not deductors and not transactions:
+        return {}
+
+    tds_details: Dict[str, float] = {}
+    for t in transactions:
+        tds_details[t.section] = tds_details.get(t.section, 0.0) + t.tds_deducted
+
+    total_tds = sum(d.tds_deducted for d in deductors) or sum(t.tds_deducted for t in transactions)
+    salary_rows = [t for t in transactions if t.section == "192"]
+    salary_tans = {t.deductor_tan for t in salary_rows}
+    gross_salary = (
+        sum(t.amount_paid for t in salary_rows)
+        or sum(d.amount_paid for d in deductors if d.deductor_tan in salary_tans)
+    )
+
+    fields: Dict[str, Any] = {
+        "tds_by_deductor": [
+            {
+                "deductor_name": d.deductor_name,
+                "deductor_tan": d.deductor_tan,
+                "amount_paid": d.amount_paid,
+                "tds_deducted": d.tds_deducted,
+            }
+            for d in deductors
+        ],
+        "tds_details": {section: round(amount, 2) for section, amount in tds_details.items()},
+        "tds_sections": sorted(tds_details),
+        # Rows themselves are not stored: thousands of them would bloat extracted_data
+        "_table_rows_count": len(transactions),
+    }
+    if total_tds:
+        fields["total_tds"] = round(total_tds, 2)
+        fields["total_tax_deducted"] = fields["total_tds"]
+    if gross_salary:
+        fields["gross_salary"] = round(gross_salary, 2)
+    if tds_details.get("192"):
+        fields["tds_on_salary"] = round(tds_details["192"], 2)
+    return fields
+
+
+def summarize_ais(records: List[TableRecord]) -> Dict[str, Any]:
+    """Income totals per information code from the AIS TDS/TCS rows"""
+    rows = [r for r in records if isinstance(r, AisTransaction)]
+    if not rows:
+        return {}
+
+    by_code: Dict[str, float] = {}
+    for r in rows:
+        by_code[r.information_code] = by_code.get(r.information_code, 0.0) + r.amount
+
+    fields: Dict[str, Any] = {
+        "_table_rows_count": len(rows),
+        "tds_sections": sorted({code.split("-", 1)[1] for code in by_code if code.startswith("TDS-")}),
+    }
+    salary = by_code.get("TDS-192", 0.0)
+    interest = by_code.get("TDS-194A", 0.0)
+    dividend = by_code.get("TDS-194", 0.0)
+    if salary:
+        fields["salary_income"] = salary
+        fields["gross_salary"] = salary
+    if interest:
+        fields["interest_income"] = interest
+    if dividend:
+        fields["dividend_income"] = dividend
+    return fields
+
+
+def extract_transaction_tables(file_path: str, doc_type: str) -> Dict[str, Any]:
+    """
+    Table-based extraction for Form 26AS / AIS PDFs.
+    Returns extracted fields (empty dict if no transaction rows were recognised).
+    """
+    doc = fitz.open(file_path)
+    try:
+        records = parse_table_rows((i + 1, page.get_text("words")) for i, page in enumerate(doc))
+    finally:
+        doc.close()
+
+    if doc_type == "Form 26AS":
+        fields = summarize_form26as(records)
+    elif doc_type == "AIS":
+        fields = summarize_ais(records)
+    else:
+        fields = {}
+
+    if fields:
+        print(f"   📋 Table extraction: {len(records)} rows parsed from {doc_type}")
+    return fields
@@ -3,11 +3,12 @@ Tax Calculator Module
 All tax figures are loaded from the database rules - NO HARDCODED VALUES.
 Rules are based on official government tax website.
 """
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from sqlalchemy.orm import Session
 from models import TaxRule
 from utils.rules_service import RulesService, TaxRulesNotFoundError
+from utils.slab_table import CompiledSlabs
 from utils.itr_form_detector import detect_itr_form, ITRFormDetector
 import json
 
@@ -32,12 +33,19 @@ def get_tax_rules(db: Session, financial_year: str) -> Dict[str, Any]:
     
     return tax_rule.rules_json
 
-def calculate_age(date_of_birth: datetime) -> int:
-    """Calculate age from date of birth as of end of financial year"""
-    # Age is typically calculated as on March 31 of the assessment year
-    today = datetime.now()
-    age = today.year - date_of_birth.year
-    if (today.month, today.day) < (date_of_birth.month, date_of_birth.day):
+def financial_year_end(financial_year: str) -> datetime:
+    """31 March closing the financial year, e.g. "2024-25" -> 2025-03-31"""
+    return datetime(int(financial_year.split("-")[0]) + 1, 3, 31)
+
+def calculate_age(date_of_birth: datetime, financial_year: Optional[str] = None) -> int:
+    """
+    Calculate age from date of birth as on 31 March of the financial year, so the
+    same inputs always give the same age (and age band). Without a financial year
+    the current date is used.
+    """
+    as_of = financial_year_end(financial_year) if financial_year else datetime.now()
+    age = as_of.year - date_of_birth.year
+    if (as_of.month, as_of.day) < (date_of_birth.month, date_of_birth.day):
         age -= 1
     return age
 
@@ -50,62 +58,19 @@ def get_age_category(age: int) -> str:
     else:
         return "individual_80_and_above"
 
-def calculate_tax_by_slab_accurate(income: float, slabs: List[Dict[str, Any]]) -> Tuple[float, List[Dict]]:
+def calculate_tax_by_slab_accurate(income: float, slabs: Union[List[Dict[str, Any]], CompiledSlabs]) -> Tuple[float, List[Dict]]:
     """
     Calculate tax based on slab rates with detailed breakdown
+    Accepts raw slabs or a CompiledSlabs table (RulesService.get_compiled_slabs)
     Returns: (total_tax, slab_breakdown)
     """
-    tax = 0.0
-    breakdown = []
-    remaining_income = income
-    
-    # Handle different slab formats
-    for i, slab in enumerate(slabs):
-        # Determine slab boundaries
-        lower = 0
-        upper = float('inf')
-        rate = 0
-        
-        # Parse slab format
-        if "min" in slab and "max" in slab:
-            # Format: {"min": 0, "max": 250000, "rate_percent": 0}
-            lower = slab["min"]
-            upper = slab["max"] if slab["max"] is not None else float('inf')
-            rate = slab.get("rate_percent", 0)
-        elif "upto" in slab:
-            # Format: {"upto": 250000, "rate_percent": 0}
-            lower = 0
-            upper = slab["upto"]
-            rate = slab.get("rate_percent", 0)
-        elif "over" in slab:
-            lower = slab["over"]
-            upper = slab.get("up_to", float('inf'))
-            if upper is None:
-                upper = float('inf')
-            rate = slab.get("rate_percent", 0)
-        else:
-            continue
-        
-        # Calculate tax for this slab
-        if income > lower:
-            taxable_in_slab = min(income, upper) - lower
-            if taxable_in_slab > 0:
-                slab_tax = taxable_in_slab * rate / 100
-                tax += slab_tax
-                
-                breakdown.append({
-                    "slab": f"₹{lower:,.0f} - ₹{upper:,.0f}" if upper != float('inf') else f"Above ₹{lower:,.0f}",
-                    "taxable_amount": taxable_in_slab,
-                    "rate": f"{rate}%",
-                    "tax": slab_tax
-                })
-    
-    return tax, breakdown
+    table = slabs if isinstance(slabs, CompiledSlabs) else CompiledSlabs(slabs)
+    return table.tax(income), table.breakdown(income)
 
-def calculate_tax_by_slab(income: float, slabs: List[Dict[str, Any]]) -> float:
-    """Calculate tax based on slab rates (backward compatible)"""
-    tax, _ = calculate_tax_by_slab_accurate(income, slabs)
-    return tax
+def calculate_tax_by_slab(income: float, slabs: Union[List[Dict[str, Any]], CompiledSlabs]) -> float:
+    """Calculate tax based on slab rates (backward compatible, no breakdown)"""
+    table = slabs if isinstance(slabs, CompiledSlabs) else CompiledSlabs(slabs)
+    return table.tax(income)
 
 def apply_deduction_limits(deductions: Dict[str, float], age: int, gross_salary: float, rules_service: RulesService) -> Dict[str, float]:
     """
@@ -209,11 +174,11 @@ def calculate_old_regime_tax(
     
     print(f"   Taxable Income: ₹{taxable_income:,.0f}")
     
-    # Get tax slabs from rules service
-    slabs = rules_service.get_slabs("old_regime", age)
+    # Get tax slabs from rules service (compiled once per FY / age band)
+    slabs = rules_service.get_compiled_slabs("old_regime", age)
     
-    # Calculate tax before rebate
-    tax_before_rebate, breakdown = calculate_tax_by_slab_accurate(taxable_income, slabs)
+    # Calculate tax before rebate (the old regime result carries no slab breakdown)
+    tax_before_rebate = slabs.tax(taxable_income)
     
     # Calculate rebate under section 87A from rules
     rebate = 0.0
@@ -281,11 +246,11 @@ def calculate_new_regime_tax(
     
     print(f"   Taxable Income: ₹{taxable_income:,.0f}")
     
-    # Get new regime slabs from rules service
-    slabs = rules_service.get_slabs("new_regime", age)
+    # Get new regime slabs from rules service (compiled once per FY / age band)
+    slabs = rules_service.get_compiled_slabs("new_regime", age)
     
     # Calculate tax before rebate
-    tax_before_rebate, breakdown = calculate_tax_by_slab_accurate(taxable_income, slabs)
+    tax_before_rebate = slabs.tax(taxable_income)
     
     # Calculate rebate under section 87A from rules
     rebate = 0.0
@@ -322,7 +287,7 @@ def calculate_new_regime_tax(
         "surcharge": surcharge,
         "cess": cess,
         "total_tax": total_tax,
-        "slab_breakdown": breakdown
+        "slab_breakdown": slabs.breakdown(taxable_income)
     }
 
 
@@ -416,43 +381,17 @@ def recommend_itr_form(
         detection_result
     )
 
-def calculate_comprehensive_tax(
-    user_data: Dict[str, Any],
+def prepare_regime_inputs(
     extracted_data: Dict[str, Any],
-    db: Session
-) -> Dict[str, Any]:
+    rules_service: RulesService,
+    verbose: bool = True
+) -> Tuple[float, float, Dict[str, float], Dict[str, float]]:
     """
-    Comprehensive tax calculation combining data from all documents.
-    All tax figures loaded from RulesService - NO hardcoded values.
+    Gross income and the old / new regime deduction claims for one taxpayer
+    (shared by calculate_comprehensive_tax and the batch engine).
+    Returns: (gross_income, salary_income, old_regime_deductions, new_regime_deductions)
+    Note: old_regime_deductions is extracted_data["old_regime_deductions"] itself, updated in place.
     """
-    
-    print(f"\n{'='*60}")
-    print(f"🧮 COMPREHENSIVE TAX CALCULATION")
-    print(f"{'='*60}")
-    
-    financial_year = user_data.get("financial_year", "2024-25")
-    dob = user_data.get("date_of_birth")
-    age = calculate_age(dob) if dob else 30  # Default age if not provided
-    
-    print(f"Financial Year: {financial_year}")
-    print(f"User Age: {age}")
-    
-    # Create RulesService for the financial year
-    rules_service = RulesService(db, financial_year)
-    rules = rules_service.rules  # Get raw rules for assessment year lookup
-    
-    # Determine assessment year
-    assessment_year = rules.get("assessment_year")
-    if not assessment_year and financial_year:
-        # Calculate AY from FY
-        try:
-            fy_parts = financial_year.split("-")
-            ay_start = int(fy_parts[0]) + 1
-            ay_end = int(fy_parts[1]) + 1
-            assessment_year = f"{ay_start}-{ay_end:02d}"
-        except:
-            assessment_year = financial_year
-    
     # Aggregate income from all sources
     gross_income = extracted_data.get("gross_total_income", 0)
     salary_income = extracted_data.get("salary_income", 0)
@@ -461,7 +400,8 @@ def calculate_comprehensive_tax(
     if gross_income == 0 and salary_income > 0:
         gross_income = salary_income
     
-    print(f"Gross Total Income: ₹{gross_income:,.0f}")
+    if verbose:
+        print(f"Gross Total Income: ₹{gross_income:,.0f}")
     
     # === OLD REGIME DEDUCTIONS ===
     old_regime_deductions = extracted_data.get("old_regime_deductions", {})
@@ -484,9 +424,11 @@ def calculate_comprehensive_tax(
     if salary_income > 0 and old_regime_deductions.get("Standard Deduction", 0) == 0:
         std_ded = rules_service.get_standard_deduction("old_regime")
         old_regime_deductions["Standard Deduction"] = std_ded
-        print(f"   Applied Standard Deduction from rules: ₹{std_ded:,}")
+        if verbose:
+            print(f"   Applied Standard Deduction from rules: ₹{std_ded:,}")
     
-    print(f"Old Regime Deductions: {sum(v for v in old_regime_deductions.values() if isinstance(v, (int, float)))}")
+    if verbose:
+        print(f"Old Regime Deductions: {sum(v for v in old_regime_deductions.values() if isinstance(v, (int, float)))}")
     
     # === NEW REGIME DEDUCTIONS (Limited) ===
     # Standard Deduction amount from rules
@@ -498,6 +440,54 @@ def calculate_comprehensive_tax(
         "80CCH": old_regime_deductions.get("80CCH", 0),  # Agnipath
     }
     
+    return gross_income, salary_income, old_regime_deductions, new_regime_deductions
+
+def total_taxes_paid_from(extracted_data: Dict[str, Any]) -> float:
+    """TDS + advance tax + self-assessment tax of aggregated document data"""
+    return (extracted_data.get("total_tds", 0) + extracted_data.get("advance_tax_paid", 0)
+            + extracted_data.get("self_assessment_tax", 0))
+
+def calculate_comprehensive_tax(
+    user_data: Dict[str, Any],
+    extracted_data: Dict[str, Any],
+    db: Session
+) -> Dict[str, Any]:
+    """
+    Comprehensive tax calculation combining data from all documents.
+    All tax figures loaded from RulesService - NO hardcoded values.
+    """
+    
+    print(f"\n{'='*60}")
+    print(f"🧮 COMPREHENSIVE TAX CALCULATION")
+    print(f"{'='*60}")
+    
+    financial_year = user_data.get("financial_year", "2024-25")
+    dob = user_data.get("date_of_birth")
+    age = calculate_age(dob, financial_year) if dob else 30  # Default age if not provided
+    
+    print(f"Financial Year: {financial_year}")
+    print(f"User Age: {age}")
+    
+    # Create RulesService for the financial year
+    rules_service = RulesService(db, financial_year)
+    rules = rules_service.rules  # Get raw rules for assessment year lookup
+    
+    # Determine assessment year
+    assessment_year = rules.get("assessment_year")
+    if not assessment_year and financial_year:
+        # Calculate AY from FY
+        try:
+            fy_parts = financial_year.split("-")
+            ay_start = int(fy_parts[0]) + 1
+            ay_end = int(fy_parts[1]) + 1
+            assessment_year = f"{ay_start}-{ay_end:02d}"
+        except:
+            assessment_year = financial_year
+    
+    gross_income, salary_income, old_regime_deductions, new_regime_deductions = prepare_regime_inputs(
+        extracted_data, rules_service
+    )
+    
     # === CALCULATE TAX UNDER BOTH REGIMES using RulesService ===
     old_regime_result = calculate_old_regime_tax(
         gross_income, old_regime_deductions, age, rules_service
@@ -536,7 +526,7 @@ def calculate_comprehensive_tax(
     advance_tax = extracted_data.get("advance_tax_paid", 0)
     self_assessment_tax = extracted_data.get("self_assessment_tax", 0)
     
-    total_taxes_paid = total_tds + advance_tax + self_assessment_tax
+    total_taxes_paid = total_taxes_paid_from(extracted_data)
     
     # Use recommended regime's tax
     if recommended_regime == "New Regime":
@@ -0,0 +1,93 @@
+"""
+What-if Tax Simulator
+Answers "what if I invest another ₹50,000 in 80C / NPS / health insurance?" for
+many scenarios at once, without touching the database.
+
+The expensive part of a calculation - loading and aggregating the user's documents
+into gross income and deduction claims - is done once and cached per (user, FY),
+keyed by an input fingerprint (document extracted_data hashes + DOB + rules
+content). Every scenario then only adds its deduction deltas to the cached claims,
+and all scenarios are computed in one BatchTaxEngine pass.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.batch_tax_engine import DEDUCTION_KEYS, TaxpayerBatch, get_batch_engine, result_row
+from utils.document_aggregator import aggregate_document_data
+from utils.fingerprint import input_fingerprint
+from utils.rules_service import RulesService
+from utils.tax_calculator import calculate_age, prepare_regime_inputs, total_taxes_paid_from
+
+# Users whose aggregated base is kept in memory (least recently used dropped first)
+SIMULATION_CACHE_SIZE = 256
+
+_base_cache: "OrderedDict[Tuple[int, str], SimulationBase]" = OrderedDict()
+_base_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SimulationBase:
+    """One user's aggregated inputs for a FY, as calculate_comprehensive_tax sees them"""
+    fingerprint: str
+    gross_income: float
+    age: int
+    deductions: Mapping[str, float]
+    taxes_paid: float
+
+
+def get_simulation_base(user: Any, financial_year: str, documents: Sequence[Any],
+                        rules_service: RulesService) -> SimulationBase:
+    """Cached base for the user / FY; re-aggregated only when the fingerprint changes"""
+    fingerprint = input_fingerprint(documents, user.date_of_birth, rules_service.rules_fingerprint)
+    key = (user.id, financial_year)
+    with _base_cache_lock:
+        cached = _base_cache.get(key)
+        if cached is not None and cached.fingerprint == fingerprint:
+            _base_cache.move_to_end(key)
+            return cached
+
+    aggregated = aggregate_document_data(documents)
+    gross_income, _, claims, _ = prepare_regime_inputs(aggregated, rules_service, verbose=False)
+    base = SimulationBase(
+        fingerprint=fingerprint,
+        gross_income=gross_income,
+        age=calculate_age(user.date_of_birth, financial_year) if user.date_of_birth else 30,
+        deductions=MappingProxyType(dict(claims)),
+        taxes_paid=total_taxes_paid_from(aggregated),
+    )
+    with _base_cache_lock:
+        _base_cache[key] = base
+        _base_cache.move_to_end(key)
+        while len(_base_cache) > SIMULATION_CACHE_SIZE:
+            _base_cache.popitem(last=False)
+    return base
+
+
+def validate_deltas(deltas: Mapping[str, float]) -> Optional[str]:
+    """Error message for unknown deduction sections, None if all are known"""
+    unknown = sorted(set(deltas) - set(DEDUCTION_KEYS))
+    if unknown:
+        return f"Unknown deduction section(s): {', '.join(unknown)}. Allowed: {', '.join(DEDUCTION_KEYS)}"
+    return None
+
+
+def simulate(base: SimulationBase, scenarios: Sequence[Mapping[str, float]],
+             rules_service: RulesService) -> List[Dict[str, Any]]:
+    """
+    Results for the current claims (index 0) followed by one per scenario.
+    A scenario adds its amounts to the current claims (negative amounts reduce them,
+    never below 0); statutory caps are applied as in the real calculation.
+    """
+    records = []
+    for deltas in [{}, *scenarios]:
+        claims = dict(base.deductions)
+        for section, amount in deltas.items():
+            claims[section] = max(0, claims.get(section, 0) + amount)
+        records.append({"gross_income": base.gross_income, "age": base.age,
+                        "deductions": claims, "taxes_paid": base.taxes_paid})
+
+    results = get_batch_engine(rules_service).compute(TaxpayerBatch.from_records(records))
+    return [result_row(results, index) for index in range(len(records))]
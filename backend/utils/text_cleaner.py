@@ -5,6 +5,7 @@ Extracts PAN, Name, Financial Year using regex and heuristics
 """
 
 import re
+from functools import cached_property
 from typing import Optional, Tuple, List, Dict, Any
 
 
@@ -19,6 +20,46 @@ def normalize_spaces(text: str) -> str:
     return text
 
 
+class TextViews:
+    """
+    Derived views of one document's text, each computed once on first use.
+    SmartExtractor shares them with the helpers in this module, so no helper
+    has to upper-case, normalise or split the whole document again.
+    """
+
+    def __init__(self, text: str):
+        self.raw = text or ""
+
+    @cached_property
+    def upper(self) -> str:
+        return self.raw.upper()
+
+    @cached_property
+    def normalized(self) -> str:
+        """Upper-cased text with junk removed and all whitespace collapsed to single spaces"""
+        return normalize_spaces(self.upper)
+
+    @cached_property
+    def compact(self) -> str:
+        """Normalized text without spaces (for matching values OCR split up)"""
+        return self.normalized.replace(' ', '')
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """Non-empty lines of the normalized text"""
+        return [line.strip() for line in self.normalized.split('\n') if line.strip()]
+
+    @cached_property
+    def raw_lines(self) -> List[str]:
+        """Stripped lines of the original text (case and line layout preserved)"""
+        return [line.strip() for line in self.raw.split('\n')]
+
+    @cached_property
+    def upper_lines(self) -> List[str]:
+        """raw_lines, upper-cased"""
+        return [line.upper() for line in self.raw_lines]
+
+
 def extract_first_pan(text: str) -> Optional[str]:
     """
     Extract first valid PAN using regex
@@ -42,14 +83,15 @@ def extract_first_pan(text: str) -> Optional[str]:
     return None
 
 
-def extract_all_pans(text: str) -> List[str]:
-    """Extract all PAN numbers from text"""
+def extract_all_pans(text: str, text_upper: Optional[str] = None) -> List[str]:
+    """Extract all PAN numbers from text (pass text_upper if already computed)"""
     pan_pattern = r'\b[A-Z]{5}\d{4}[A-Z]\b'
-    matches = re.findall(pan_pattern, text.upper())
+    matches = re.findall(pan_pattern, text_upper if text_upper is not None else text.upper())
     return list(set(matches))  # Remove duplicates
 
 
-def pick_fy(text: str, expected_fy: str = None, doc_type: str = None) -> Optional[str]:
+def pick_fy(text: str, expected_fy: str = None, doc_type: str = None,
+            lines: Optional[List[str]] = None) -> Optional[str]:
     """
     Extract Financial Year or Assessment Year
     Formats: 2024-25, 2024-2025, FY 2024-25, AY 2025-26
@@ -61,6 +103,7 @@ def pick_fy(text: str, expected_fy: str = None, doc_type: str = None) -> Optiona
         text: Document text to extract from
         expected_fy: Expected financial year (optional, helps prioritize correct year)
         doc_type: Document type (optional, helps with AIS-specific extraction)
+        lines: text.split('\n') if the caller already has it (optional)
     """
     # Special handling for AIS documents (they have a specific format)
     if doc_type and 'AIS' in doc_type.upper():
@@ -82,7 +125,8 @@ def pick_fy(text: str, expected_fy: str = None, doc_type: str = None) -> Optiona
         
         # Alternative AIS pattern: "Financial Year" on one line, year on next line (even if Assessment Year is in between)
         # Look for pattern: Financial Year\n...\n2024-25 (where 2024-25 is the first year after Financial Year)
-        lines = text.split('\n')
+        if lines is None:
+            lines = text.split('\n')
         for i, line in enumerate(lines):
             if re.search(r'Financial\s+Year', line, re.IGNORECASE):
                 # Look at next few lines for the year
@@ -506,14 +550,16 @@ def normalize_name(name: str) -> str:
     return name
 
 
-def extract_document_type(text: str) -> Optional[str]:
+def extract_document_type(text: str, text_upper: Optional[str] = None) -> Optional[str]:
     """
     Detect document type from text with high precision.
     Uses scoring to resolve ambiguities (e.g. AIS mentioning Form 26AS).
+    Pass text_upper if the upper-cased text is already available.
     
     Returns: "Form 16", "Form 26AS", or "AIS"
     """
-    text_upper = text.upper()
+    if text_upper is None:
+        text_upper = text.upper()
     
     # Initialize scores
     scores = {
@@ -0,0 +1,439 @@
+"""
+Lightweight NumPy Vector Index
+In-process alternative to Chroma for small deployments (a few thousand vectors per user).
+Each collection is stored as one generation of append-only files:
+  <name>.<gen>.f32    raw float32 rows of L2-normalised embeddings (memory-mapped)
+  <name>.<gen>.jsonl  one [id, document, metadata] record per row
+  <name>.json         header {generation, rows, dim, log_bytes}
+Adding new ids appends to both files and then atomically replaces the header, which
+is the commit point: bytes past the committed sizes are ignored on load and truncated
+on the next append. Deletes and replacements write the next generation.
+Collections in the older single-file format (<name>.npy plus a sidecar with the id
+lists) are still loaded and are converted on their first write.
+Exposes the subset of the Chroma collection API used by RAGEngine.
+"""
+import os
+import re
+import json
+import threading
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise rows (zero vectors stay zero)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class NumpyCollection:
+    """Chroma-compatible collection backed by a memory-mapped float32 matrix"""
+
+    def __init__(self, name: str, directory: str, embedding_function: Optional[Callable] = None):
+        self.name = name
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self._meta_path = os.path.join(directory, f"{name}.json")
+        self._legacy_matrix_path = os.path.join(directory, f"{name}.npy")
+        self._lock = threading.Lock()
+
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._generation = 0
+        self._dim = 0
+        self._log_bytes = 0
+        self._legacy = False
+        self._loaded = False
+        with self._lock:
+            self._ensure_loaded()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _ensure_loaded(self):
+        """(Re)load from disk after construction or close(); caller holds the lock"""
+        if not self._loaded:
+            self._load()
+            self._loaded = True
+
+    def close(self):
+        """Drop the in-memory records and memory map; the next call reloads from disk"""
+        with self._lock:
+            self._ids, self._documents, self._metadatas = [], [], []
+            self._release_matrix()
+            self._columns = {}
+            self._loaded = False
+
+    def clear(self):
+        """Delete every record and the files on disk"""
+        with self._lock:
+            self._rewrite([], [], [], None)
+            self._loaded = True
+
+    def _path(self, generation: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.name}.{generation}{suffix}")
+
+    def _release_matrix(self):
+        """Close the memory map so its file can be appended to, replaced or removed
+        (Windows refuses while a view is open); caller holds the lock"""
+        matrix, self._matrix = self._matrix, None
+        mmap = getattr(matrix, "_mmap", None)
+        del matrix
+        if mmap is not None:
+            mmap.close()
+
+    def _map_matrix(self, rows: int):
+        self._matrix = (
+            np.memmap(self._path(self._generation, ".f32"), dtype=np.float32, mode="r", shape=(rows, self._dim))
+            if rows else None
+        )
+        self._columns = {}
+
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if "ids" in meta:
+            self._load_legacy(meta)
+            return
+
+        generation, rows, dim = meta["generation"], meta["rows"], meta["dim"]
+        matrix_path, log_path = self._path(generation, ".f32"), self._path(generation, ".jsonl")
+        if (not os.path.exists(matrix_path) or not os.path.exists(log_path)
+                or os.path.getsize(matrix_path) < rows * dim * 4
+                or os.path.getsize(log_path) < meta["log_bytes"]):
+            print(f"⚠️ Vector collection {self.name}: generation {generation} files are incomplete, starting empty")
+            return
+        with open(log_path, "rb") as f:
+            records = [json.loads(line) for line in f.read(meta["log_bytes"]).splitlines()]
+        if len(records) != rows:
+            print(f"⚠️ Vector collection {self.name}: header says {rows} rows, log has {len(records)}, starting empty")
+            return
+
+        self._ids = [r[0] for r in records]
+        self._documents = [r[1] for r in records]
+        self._metadatas = [r[2] for r in records]
+        self._generation, self._dim, self._log_bytes = generation, dim, meta["log_bytes"]
+        self._map_matrix(rows)
+
+    def _load_legacy(self, meta: Dict[str, Any]):
+        """Older layout: <name>.npy plus a sidecar holding the id/document/metadata lists"""
+        if not os.path.exists(self._legacy_matrix_path):
+            return
+        matrix = np.load(self._legacy_matrix_path, mmap_mode="r")
+        ids = meta.get("ids", [])
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            print(f"⚠️ Vector collection {self.name}: matrix has {matrix.shape[0]} rows for {len(ids)} ids, starting empty")
+            return
+        self._ids = ids
+        self._documents = meta.get("documents", [])
+        self._metadatas = meta.get("metadatas", [])
+        self._matrix = matrix
+        self._dim = matrix.shape[1]
+        self._legacy = True
+        self._columns = {}
+
+    def _write_header(self, rows: int):
+        """Atomically replace the header: the commit point for every write"""
+        tmp_meta = self._meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"generation": self._generation, "rows": rows, "dim": self._dim,
+                       "log_bytes": self._log_bytes}, f)
+        os.replace(tmp_meta, self._meta_path)
+
+    @staticmethod
+    def _encode_records(ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps([i, d, m], ensure_ascii=False) + "\n" for i, d, m in zip(ids, documents, metadatas)
+        ).encode("utf-8")
+
+    def _append(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]], vectors: np.ndarray):
+        """Append new rows to the current generation: O(rows added); caller holds the lock"""
+        rows = len(self._ids)
+        if rows == 0:
+            self._dim = vectors.shape[1]
+        self._release_matrix()
+
+        records = self._encode_records(ids, documents, metadatas)
+        # Drop anything an interrupted write left past the committed sizes before appending
+        for path, size, data in ((self._path(self._generation, ".f32"), rows * self._dim * 4, vectors.tobytes()),
+                                 (self._path(self._generation, ".jsonl"), self._log_bytes, records)):
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.truncate(size)
+                f.seek(size)
+                f.write(data)
+        self._log_bytes += len(records)
+
+        self._ids += ids
+        self._documents += documents
+        self._metadatas += metadatas
+        self._write_header(len(self._ids))
+        self._map_matrix(len(self._ids))
+
+    def _rewrite(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]],
+                 matrix: Optional[np.ndarray]):
+        """Write the records as the next generation, commit it, then remove the previous
+        one (or every file when empty); caller holds the lock"""
+        previous, was_legacy = self._generation, self._legacy
+        self._ids, self._documents, self._metadatas = ids, documents, metadatas
+        self._release_matrix()
+        self._legacy = False
+        self._columns = {}
+
+        if matrix is None or not ids:
+            self._remove_files(self.directory, self.name)
+            self._generation, self._dim, self._log_bytes = 0, 0, 0
+            return
+
+        self._generation = previous + 1
+        self._dim = matrix.shape[1]
+        records = self._encode_records(ids, documents, metadatas)
+        with open(self._path(self._generation, ".f32"), "wb") as f:
+            f.write(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+        with open(self._path(self._generation, ".jsonl"), "wb") as f:
+            f.write(records)
+        self._log_bytes = len(records)
+        self._write_header(len(ids))
+
+        self._remove_files(self.directory, self.name, keep_generation=self._generation)
+        self._map_matrix(len(ids))
+
+    @staticmethod
+    def _remove_files(directory: str, name: str, keep_generation: Optional[int] = None):
+        """Remove a collection's files, optionally keeping one generation and its header"""
+        generation_file = re.compile(re.escape(name) + r"\.(\d+)\.(f32|jsonl)$")
+        for filename in os.listdir(directory):
+            match = generation_file.match(filename)
+            if match and int(match.group(1)) != keep_generation:
+                os.remove(os.path.join(directory, filename))
+        stale = [f"{name}.npy", f"{name}.json.tmp"] + ([f"{name}.json"] if keep_generation is None else [])
+        for filename in stale:
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ------------------------------------------------------------------
+    # Metadata filtering
+    # ------------------------------------------------------------------
+    def _column(self, key: str) -> np.ndarray:
+        """Metadata values for one key as an object array (cached until the next write)"""
+        column = self._columns.get(key)
+        if column is None:
+            column = np.empty(len(self._metadatas), dtype=object)
+            column[:] = [m.get(key) if m else None for m in self._metadatas]
+            self._columns[key] = column
+        return column
+
+    def _mask(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Boolean row mask for a Chroma-style where clause ($and, $or, $eq, $ne, $in, $nin)"""
+        count = len(self._ids)
+        if not where:
+            return np.ones(count, dtype=bool)
+
+        mask = np.ones(count, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(count, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._mask(clause)
+                mask &= any_mask
+            else:
+                column = self._column(key)
+                if isinstance(condition, dict):
+                    for op, value in condition.items():
+                        if op == "$eq":
+                            mask &= column == value
+                        elif op == "$ne":
+                            mask &= column != value
+                        elif op == "$in":
+                            mask &= np.isin(column, list(value))
+                        elif op == "$nin":
+                            mask &= ~np.isin(column, list(value))
+                        else:
+                            raise ValueError(f"Unsupported where operator: {op}")
+                else:
+                    mask &= column == condition
+        return mask
+
+    def _select(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> np.ndarray:
+        mask = self._mask(where)
+        if ids is not None:
+            wanted = set(ids)
+            mask &= np.fromiter((i in wanted for i in self._ids), dtype=bool, count=len(self._ids))
+        return mask
+
+    # ------------------------------------------------------------------
+    # Chroma collection API
+    # ------------------------------------------------------------------
+    def count(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._ids)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.embedding_function is None:
+            raise ValueError("No embedding function configured; pass embeddings explicitly")
+        return np.asarray(self.embedding_function(texts), dtype=np.float32)
+
+    def add(self, ids: List[str], documents: Optional[List[str]] = None,
+            metadatas: Optional[List[Dict[str, Any]]] = None, embeddings: Optional[List[List[float]]] = None):
+        """Add (or replace) records. Embeddings are computed from documents when not given."""
+        if not ids:
+            return
+        documents = documents or [""] * len(ids)
+        metadatas = metadatas or [{} for _ in ids]
+        vectors = np.asarray(embeddings, dtype=np.float32) if embeddings is not None else self._embed(documents)
+        vectors = _normalize_rows(vectors.reshape(len(ids), -1))
+
+        with self._lock:
+            self._ensure_loaded()
+            if self._matrix is not None and self._matrix.shape[1] != vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match collection "
+                    f"dimensionality {self._matrix.shape[1]}"
+                )
+
+            # Same id added again replaces the old record (like upsert)
+            new_ids = set(ids)
+            keep = np.fromiter((i not in new_ids for i in self._ids), dtype=bool, count=len(self._ids))
+            if keep.all() and not self._legacy:
+                self._append(list(ids), list(documents), list(metadatas), vectors)
+                return
+
+            existing = np.asarray(self._matrix[keep]) if self._matrix is not None else None
+            matrix = vectors if existing is None or len(existing) == 0 else np.vstack([existing, vectors])
+            self._rewrite(
+                [i for i, k in zip(self._ids, keep) if k] + list(ids),
+                [d for d, k in zip(self._documents, keep) if k] + list(documents),
+                [m for m, k in zip(self._metadatas, keep) if k] + list(metadatas),
+                matrix,
+            )
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._ensure_loaded()
+            if not self._ids or (ids is None and not where):
+                return
+            remove = self._select(ids, where)
+            if not remove.any():
+                return
+            keep = ~remove
+
+            self._rewrite(
+                [i for i, k in zip(self._ids, keep) if k],
+                [d for d, k in zip(self._documents, keep) if k],
+                [m for m, k in zip(self._metadatas, keep) if k],
+                np.asarray(self._matrix[keep]) if keep.any() else None,
+            )
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        include = include or ["documents", "metadatas"]
+        with self._lock:
+            self._ensure_loaded()
+            rows = np.flatnonzero(self._select(ids, where)) if self._ids else np.array([], dtype=int)
+            if limit is not None:
+                rows = rows[:limit]
+
+            result: Dict[str, Any] = {"ids": [self._ids[r] for r in rows]}
+            if "documents" in include:
+                result["documents"] = [self._documents[r] for r in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[r] for r in rows]
+            if "embeddings" in include:
+                result["embeddings"] = [self._matrix[r].tolist() for r in rows] if self._matrix is not None else []
+            return result
+
+    def query(self, query_texts: Optional[List[str]] = None, query_embeddings: Optional[List[List[float]]] = None,
+              n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+              include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Cosine top-k. Distances are 1 - cosine similarity (smaller is closer)."""
+        include = include or ["documents", "metadatas", "distances"]
+        if query_embeddings is None:
+            query_embeddings = self._embed(query_texts or [])
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = _normalize_rows(queries.reshape(len(queries), -1)) if len(queries) else queries
+
+        result: Dict[str, Any] = {"ids": []}
+        for key in ("documents", "metadatas", "distances"):
+            if key in include:
+                result[key] = []
+
+        # add / delete swap the arrays: search one consistent snapshot
+        with self._lock:
+            self._ensure_loaded()
+            matrix = self._matrix
+            candidates = np.flatnonzero(self._mask(where)) if matrix is not None else np.array([], dtype=int)
+
+            for query in queries:
+                if len(candidates) == 0:
+                    top = np.array([], dtype=int)
+                    distances = np.array([], dtype=np.float32)
+                else:
+                    if matrix.shape[1] != query.shape[0]:
+                        raise ValueError(
+                            f"Query dimension {query.shape[0]} does not match collection "
+                            f"dimensionality {matrix.shape[1]}"
+                        )
+                    scores = matrix[candidates] @ query if len(candidates) < len(self._ids) else matrix @ query
+                    k = min(n_results, len(candidates))
+                    best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+                    best = best[np.argsort(-scores[best], kind="stable")]
+                    top = candidates[best]
+                    distances = 1.0 - scores[best]
+
+                result["ids"].append([self._ids[r] for r in top])
+                if "documents" in include:
+                    result["documents"].append([self._documents[r] for r in top])
+                if "metadatas" in include:
+                    result["metadatas"].append([self._metadatas[r] for r in top])
+                if "distances" in include:
+                    result["distances"].append([float(d) for d in distances])
+        return result
+
+
+class NumpyVectorClient:
+    """Minimal client mirroring chromadb.PersistentClient.get_or_create_collection"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        # Exactly one instance per name, so concurrent writers share one lock and one view.
+        # release_collection() frees a collection's memory without replacing the instance.
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, embedding_function: Optional[Callable] = None, **kwargs) -> NumpyCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = NumpyCollection(name, self.path, embedding_function)
+                self._collections[name] = collection
+            elif embedding_function is not None:
+                collection.embedding_function = embedding_function
+            return collection
+
+    def release_collection(self, name: str):
+        """Unload a collection's records and memory map (reloaded from disk on next use)"""
+        with self._lock:
+            collection = self._collections.get(name)
+        if collection is not None:
+            collection.close()
+
+    def delete_collection(self, name: str):
+        """Remove a collection's files; an instance already handed out is left empty"""
+        with self._lock:
+            collection = self._collections.get(name)
+        if collection is not None:
+            collection.clear()
+            return
+        NumpyCollection._remove_files(self.path, name)
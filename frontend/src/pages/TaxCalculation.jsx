@@ -6,6 +6,9 @@ import toast from 'react-hot-toast'
 import { Calculator, TrendingUp, Download, FileText, Info } from 'lucide-react'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 
+const RECOMPUTE_POLL_INTERVAL_MS = 3000
+const RECOMPUTE_POLL_ATTEMPTS = 40
+
 function TaxCalculation() {
   const { currentFY } = useAuth()
   const [computation, setComputation] = useState(null)
@@ -33,7 +36,19 @@ function TaxCalculation() {
   const handleCalculate = async () => {
     setCalculating(true)
     try {
-      const response = await api.post(`/tax/calculate/${currentFY}`)
+      let response = await api.post(`/tax/calculate/${currentFY}`)
+      // 202: older documents are being re-read in the background - poll until done
+      for (let attempt = 0; response.status === 202 && attempt < RECOMPUTE_POLL_ATTEMPTS; attempt++) {
+        if (attempt === 0) {
+          toast(response.data?.message || 'Re-reading documents, please wait...')
+        }
+        await new Promise((resolve) => setTimeout(resolve, RECOMPUTE_POLL_INTERVAL_MS))
+        response = await api.post(`/tax/calculate/${currentFY}`)
+      }
+      if (response.status === 202) {
+        toast.error('Documents are still being processed. Please try again shortly.')
+        return
+      }
       setComputation(response.data)
       toast.success('Tax calculated successfully!')
     } catch (error) {